@@ -1,6 +1,7 @@
 import cv2 # import open CV
 import mediapipe as mp # import media pipe
 import time # import time to check frame rate
+from console_log import console # background console writer (set LOG_LEVEL = "DEBUG" in config.py to see landmarks)
 
 cap = cv2.VideoCapture(0); # use webcam from laptop. if you want external camera, use 1
 
@@ -15,7 +16,7 @@ cTime = 0 # current time = 0
 while True: # runs webcame
     success, img = cap.read()
     if not success or img is None:
-        print("Frame not captured, skipping...")
+        console.warning("Frame not captured, skipping...", key="no_frame")
         continue
     
     imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB) # covert image to RGB since mp only takes RGB
@@ -23,15 +24,18 @@ while True: # runs webcame
 
     if results.multi_hand_landmarks: # draws the dots on the hands using the bult in mpDraw
         for handLms in results.multi_hand_landmarks:
+            lmList = []
             for id, lm in enumerate(handLms.landmark):
                 #print(id, lm) # each ID has a corresponding x,y landmark
                 h, w, c = img.shape # height width and channel
                 cx, cy = int(lm.x *w), int(lm.y*h)
 
-                print(id,cx,cy)
+                lmList.append((id, cx, cy))
                 if id == 0:
                     cv2.circle(img, (cx,cy), 10, (255,0,255), cv2.FILLED) # helps detect the bottom of the palm
             mpDraw.draw_landmarks(img, handLms, mpHands.HAND_CONNECTIONS) # draws the line connection
+            # one queued message per hand instead of 21 prints, formatted off the frame thread
+            console.debug(lambda pts: "\n".join(f"{i} {x} {y}" for i, x, y in pts), lmList)
 
     cTime = time.time()
     fps = 1 / (cTime-pTime)
@@ -1,6 +1,13 @@
 import cv2
 import mediapipe as mp
-import time
+
+import config
+from clock import FpsCounter
+from console_log import console
+from capture_supervisor import supervised_source
+from landmarks import landmarks_to_array
+from renderer import draw_hand
+from hand_tracker import HandTracker
 
 class handDetector():
     def __init__(self, mode=False, maxHands=2, detectionCon=0.5, trackCon=0.5):
@@ -20,19 +27,34 @@ class handDetector():
         self.mpDraw = mp.solutions.drawing_utils
         self.results = None
 
+        # Persistent hand IDs; self.tracks[i] is the track of multi_hand_landmarks[i]
+        self.tracker = HandTracker()
+        self.tracks = []
+
     def findHands(self, img, draw=True):
         imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
         self.results = self.hands.process(imgRGB)
 
-        if self.results.multi_hand_landmarks:
-            for handLms in self.results.multi_hand_landmarks:
-                if draw:
-                    self.mpDraw.draw_landmarks(
-                        img, handLms, self.mpHands.HAND_CONNECTIONS)
+        h, w, c = img.shape
+        points = [landmarks_to_array(handLms, w, h)
+                  for handLms in self.results.multi_hand_landmarks or []]
+        self.tracks = self.tracker.update(points, (w, h))
+        if draw:
+            for pts in points:
+                draw_hand(img, pts)
         return img
 
-    def findPosition(self, img, handNo=0, draw=True):
+    def findPosition(self, img, handNo=0, draw=True, trackId=None):
+        """
+        handNo indexes this frame's detections, which MediaPipe may reorder;
+        pass trackId (see self.tracks) to follow the same hand across frames
+        """
         lmList = []
+        if trackId is not None:
+            ids = [t.id for t in self.tracks]
+            if trackId not in ids:
+                return lmList
+            handNo = ids.index(trackId)
         if self.results and self.results.multi_hand_landmarks:
             myHand = self.results.multi_hand_landmarks[handNo]
             for id, lm in enumerate(myHand.landmark):
@@ -47,21 +69,23 @@ class handDetector():
 
 
 def main():
-    pTime = 0
-    cap = cv2.VideoCapture(0)
+    cap = supervised_source(config.FRAME_SOURCE)
+    fps_counter = FpsCounter(cap.clock)
     detector = handDetector()
 
     while True:
         success, img = cap.read()
+        if not success:
+            if cap.finished:
+                break
+            continue
         img = detector.findHands(img)
 
         lmList = detector.findPosition(img)
         if len(lmList) != 0:
-            print(lmList[4])  # Example: print thumb tip coords
+            console.info("%s", lmList[4], key="thumb_tip", every=0.5)  # Example: print thumb tip coords
 
-        cTime = time.time()
-        fps = 1 / (cTime - pTime)
-        pTime = cTime
+        fps = fps_counter.tick()
 
         cv2.putText(img, f'FPS: {int(fps)}', (10, 70),
                     cv2.FONT_HERSHEY_PLAIN, 2, (255, 0, 255), 2)
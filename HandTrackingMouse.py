@@ -1,18 +1,25 @@
 # AirMouse.py
-import pyautogui
-import numpy as np
 import math
 import time
 
+from input_backend import default_backend
+from screen_mapping import Monitor, ScreenMapping
+
 # AirMouse Controller Class
 class AirMouse:
-    def __init__(self, screen_smooth=5, move_threshold=5):
-        self.screen_w, self.screen_h = pyautogui.size()
+    def __init__(self, screen_smooth=5, move_threshold=5, clock=time.time, backend=None,
+                 mapping=None):
+        self.backend = backend or default_backend()  # pointer events (see input_backend.py)
+        self.screen_w, self.screen_h = self.backend.size()
+        self.mapping = mapping  # ScreenMapping; None = built per camera size below
+        self._default_mapping = None
+        self._mapping_for = None
         self.plocX, self.plocY = 0, 0  # previous cursor location
         self.smoothening = screen_smooth
         self.move_threshold = move_threshold
         self.last_click_time = 0
         self.click_cooldown = 0.5  # seconds
+        self.clock = clock  # time source for the click cooldown
 
     def controlMouse(self, lmList, wCam, hCam):
         """
@@ -28,8 +35,7 @@ class AirMouse:
         distance = math.hypot(x2 - x1, y2 - y1)
 
         # Map hand coordinates to screen coordinates (inverted horizontally)
-        screenX = np.interp(wCam - x1, (100, wCam - 100), (0, self.screen_w))
-        screenY = np.interp(y1, (100, hCam - 100), (0, self.screen_h))
+        screenX, screenY = self._screen_mapping(wCam, hCam).map_point(x1, y1, wCam, hCam)
 
         # --- Movement smoothing ---
         clocX = self.plocX + (screenX - self.plocX) / self.smoothening
@@ -37,11 +43,24 @@ class AirMouse:
 
         # --- Apply deadzone to prevent micro-movements ---
         if abs(clocX - self.plocX) > self.move_threshold or abs(clocY - self.plocY) > self.move_threshold:
-            pyautogui.moveTo(clocX, clocY)
+            self.backend.move_to(clocX, clocY)
+            self.backend.flush()
             self.plocX, self.plocY = clocX, clocY
 
         # --- Click gesture (pinch) ---
-        current_time = time.time()
+        current_time = self.clock()
         if distance < 40 and (current_time - self.last_click_time) > self.click_cooldown:
-            pyautogui.click()
+            self.backend.click()
             self.last_click_time = current_time
+
+    def _screen_mapping(self, wCam, hCam):
+        """The given mapping, or a 100px-margin, mirrored one for this camera size"""
+        if self.mapping is not None:
+            return self.mapping
+        if self._mapping_for != (wCam, hCam):
+            region = (100 / wCam, 100 / hCam, 1 - 100 / wCam, 1 - 100 / hCam)
+            self._default_mapping = ScreenMapping(
+                region, monitors=[Monitor(0, 0, self.screen_w, self.screen_h)],
+                edge_margin=0, mirror=True)
+            self._mapping_for = (wCam, hCam)
+        return self._default_mapping
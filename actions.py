@@ -7,6 +7,8 @@ import platform
 import os
 import pyautogui
 
+from console_log import console
+
 
 def open_myutep():
     """Open my.utep.edu in default browser"""
@@ -19,18 +21,18 @@ def open_myutep():
             subprocess.Popen(['open', url])
         else:
             subprocess.Popen(['xdg-open', url])
-        print("Opened my UTEP")
+        console.info("Opened my UTEP")
     except Exception as e:
-        print("Error opening UTEP:", e)
+        console.error("Error opening UTEP: %s", e, key="myutep_error")
 
 
 def open_spotify():
     """Open Spotify application"""
-    print("Opening Spotify")
+    console.info("Opening Spotify")
     try:
         os.system("start spotify")
     except Exception as e:
-        print("Error opening Spotify:", e)
+        console.error("Error opening Spotify: %s", e, key="spotify_error")
 
 
 def change_volume(direction):
@@ -47,4 +49,4 @@ def change_volume(direction):
             step = "5%+" if direction == "UP" else "5%-"
             subprocess.run(["pactl", "set-sink-volume", "@DEFAULT_SINK@", step])
     except Exception as e:
-        print("Volume error:", e)
\ No newline at end of file
+        console.error("Volume error: %s", e, key="volume_error")
\ No newline at end of file
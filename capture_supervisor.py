@@ -0,0 +1,171 @@
+# capture_supervisor.py
+"""
+Camera supervision: back off and reconnect instead of spinning on failures
+
+CaptureSupervisor wraps anything that opens a capture (a cv2.VideoCapture
+or a FrameSource) and keeps the same read() interface. A few failed reads in
+a row are tolerated with a short sleep; a longer streak marks the camera as
+lost, releases it and retries opening it with exponential backoff. While it
+is lost, read() sleeps in short slices and returns (False, None), so the
+loop stays responsive, uses almost no CPU, and keeps its MediaPipe graph and
+tracking state.
+
+    cap = CaptureSupervisor(lambda: cv2.VideoCapture(0))
+    cap = supervised_source(config.FRAME_SOURCE)        # any frame_source spec
+"""
+import time
+
+from console_log import console
+
+
+class CaptureSupervisor:
+    """Reopens a capture with exponential backoff after a failure streak"""
+
+    def __init__(self, open_capture, failure_threshold=10, backoff_initial=0.5,
+                 backoff_max=4.0, retry_sleep=0.005, idle_slice=0.1, clock=None,
+                 now=time.monotonic, sleep=time.sleep):
+        """
+        Args:
+            open_capture: Callable returning a new capture (cv2.VideoCapture-like)
+            failure_threshold: Consecutive failed reads before the camera counts as lost
+            backoff_initial: First reconnect delay in seconds (doubles up to backoff_max)
+            retry_sleep: Sleep after a single failed read
+            idle_slice: Longest single sleep inside read() while the camera is lost
+            clock: Time source exposed to the app (defaults to the capture's own clock)
+        """
+        self.open_capture = open_capture
+        self.failure_threshold = failure_threshold
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.retry_sleep = retry_sleep
+        self.idle_slice = idle_slice
+        self.now = now
+        self.sleep = sleep
+        self.cap = None
+        self.finished = False
+        self.streak = 0
+        self.failures = 0
+        self.reconnects = 0
+        self.frames = 0
+        self._downtime = 0.0
+        self.down_since = None
+        self.backoff = backoff_initial
+        self.next_retry = 0.0
+        if not self._open():
+            self._lost("camera not available")
+        self.clock = clock or getattr(self.cap, "clock", time.time)
+
+    def _open(self):
+        try:
+            cap = self.open_capture()
+        except Exception as e:
+            console.warning("Camera open failed: %s", e, key="camera_open")
+            return False
+        if cap is not None and cap.isOpened():
+            self.cap = cap
+            return True
+        if cap is not None:
+            cap.release()
+        return False
+
+    def _lost(self, reason):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+        t = self.now()
+        self.down_since = t
+        self.backoff = self.backoff_initial
+        self.next_retry = t + self.backoff
+        console.warning("Camera lost (%s), retrying in %.1fs", reason, self.backoff)
+
+    def _reconnected(self):
+        outage = self.now() - self.down_since
+        self._downtime += outage
+        self.down_since = None
+        self.streak = 0
+        self.reconnects += 1
+        console.info("Camera reconnected after %.1fs (%d reconnects, %.1fs total downtime)",
+                     outage, self.reconnects, self._downtime)
+
+    @property
+    def down(self):
+        return self.cap is None and not self.finished
+
+    @property
+    def downtime(self):
+        """Seconds without a camera, including the current outage"""
+        current = self.now() - self.down_since if self.down_since is not None else 0.0
+        return self._downtime + current
+
+    @property
+    def timestamp(self):
+        return getattr(self.cap, "timestamp", None)
+
+    def read(self):
+        if self.finished:
+            return False, None
+
+        if self.cap is None:
+            t = self.now()
+            if t < self.next_retry:
+                self.sleep(min(self.next_retry - t, self.idle_slice))
+                return False, None
+            if self._open():
+                self._reconnected()
+            else:
+                self.backoff = min(self.backoff * 2, self.backoff_max)
+                self.next_retry = self.now() + self.backoff
+                return False, None
+
+        success, img = self.cap.read()
+        if success and img is not None:
+            self.streak = 0
+            self.frames += 1
+            return True, img
+
+        if getattr(self.cap, "finished", False):
+            # A replayed file or image folder ran out: that is not an outage
+            self.finished = True
+            return False, None
+        self.failures += 1
+        self.streak += 1
+        if self.streak >= self.failure_threshold:
+            self._lost(f"{self.streak} failed reads")
+        else:
+            self.sleep(self.retry_sleep)
+        return False, None
+
+    def isOpened(self):
+        return not self.finished
+
+    def set(self, prop, value):
+        return self.cap.set(prop, value) if self.cap is not None else False
+
+    def get(self, prop):
+        return self.cap.get(prop) if self.cap is not None else 0
+
+    def stats(self):
+        """Capture health metrics"""
+        return {"frames": self.frames, "failures": self.failures,
+                "reconnects": self.reconnects, "downtime": self.downtime,
+                "down": self.down}
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+        if self.down_since is not None:
+            self._downtime += self.now() - self.down_since
+            self.down_since = None
+        self.finished = True
+
+
+def supervised_source(spec, clock=None, **kwargs):
+    """A supervised frame_source.open_source(spec, ...), reopened from the spec on failure"""
+    from frame_source import open_source
+    # The first open happens here so a bad file name or spec fails immediately
+    first = [open_source(spec, clock=clock, **kwargs)]
+
+    def reopen():
+        return first.pop() if first else open_source(spec, clock=clock, **kwargs)
+    return CaptureSupervisor(reopen, clock=clock)
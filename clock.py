@@ -0,0 +1,60 @@
+# clock.py
+"""
+Time sources for cooldowns, FPS counters and frame timestamps
+
+A clock is any callable returning seconds. SystemClock is wall time;
+SimulatedClock only moves when told to, so replayed sources can drive it
+frame by frame and cooldowns behave exactly as they would live, just
+faster (or slower) than real time.
+"""
+import time
+
+
+class SystemClock:
+    """Wall-clock time"""
+
+    def __call__(self):
+        return time.time()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def wait_until(self, t):
+        self.sleep(t - time.time())
+
+
+class SimulatedClock:
+    """Time that only advances when asked to (deterministic runs)"""
+
+    def __init__(self, start=1000.0):
+        self.t = start
+
+    def __call__(self):
+        return self.t
+
+    def advance(self, dt):
+        self.t += dt
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            self.t += seconds
+
+    def wait_until(self, t):
+        self.t = max(self.t, t)
+
+
+class FpsCounter:
+    """Frames per second from the time between consecutive ticks"""
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.pTime = 0
+        self.fps = 0
+
+    def tick(self):
+        """Call once per frame; returns the current FPS (0 on the first frame)"""
+        cTime = self.clock()
+        self.fps = 1 / (cTime - self.pTime) if self.pTime and cTime > self.pTime else 0
+        self.pTime = cTime
+        return self.fps
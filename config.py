@@ -5,6 +5,14 @@ Configuration settings for gesture control
 
 # Camera settings
 CAMERA_INDEX = 0
+# Multi-camera mode (python multi_camera.py): list of camera indices or
+# frame source specs, fused into one hand stream; None = single camera
+CAMERA_INDICES = None
+CAMERA_IDLE_AFTER = 1.0     # seconds without a hand before a camera goes idle
+CAMERA_IDLE_INTERVAL = 0.25 # seconds between detections on an idle camera
+# Frame source: camera index, video file, image directory, "synthetic"
+# or "shm:<name>:<w>x<h>" (see frame_source.open_source)
+FRAME_SOURCE = CAMERA_INDEX
 
 # MediaPipe settings
 MAX_HANDS = 2
@@ -12,20 +20,119 @@ MODEL_COMPLEXITY = 1
 MIN_DETECTION_CONFIDENCE = 0.8
 MIN_TRACKING_CONFIDENCE = 0.8
 
+# Hand tracking (persistent IDs across frames)
+TRACK_GATE = 0.25      # max match distance, fraction of frame diagonal
+TRACK_MAX_AGE = 5      # frames a hand may vanish before its state is dropped
+TRACK_MAX_TRACKS = 8   # live tracks kept; the longest-missing go first beyond this
+
 # Gesture cooldowns (seconds)
 HANG_COOLDOWN = 10.0
 ROCK_COOLDOWN = 10.0
 VOLUME_COOLDOWN = 0.1
 PINCH_COOLDOWN = 0.15
 
-# Pinch detection thresholds (pixels)
-PINCH_THRESHOLD = 55
-RELEASE_THRESHOLD = 80
+# Gesture voting (gesture_stabilizer.py): a gesture must win a vote over the last
+# GESTURE_VOTE_WINDOW frames with its enter frames before its action fires,
+# and ends after its exit frames of something else
+GESTURE_VOTE_WINDOW = 8
+GESTURE_VOTE_MODE = "majority"   # or "confidence" (votes weighted by detection score)
+GESTURE_DEFAULT_ENTER = 3
+GESTURE_DEFAULT_EXIT = 3
+GESTURE_ENTER_FRAMES = {"PICKS UP!": 5, "ROCK ON": 5}  # app launches need a steadier gesture
+GESTURE_EXIT_FRAMES = {}
+
+# Pinch detection thresholds, in palm sizes (wrist to middle knuckle),
+# so they hold at any camera distance (~55px / 80px at arm's length)
+PINCH_THRESHOLD = 0.55
+RELEASE_THRESHOLD = 0.8
+
+# Pointer input: "auto" (xtest -> uinput -> pyautogui), "xtest", "uinput",
+# "pyautogui" or "recording" (see input_backend.py)
+INPUT_BACKEND = "auto"
 
 # Mouse smoothing settings
 MOUSE_BUFFER_SIZE = 7
 MOUSE_EXPONENTIAL_WEIGHT = 0.25
 EDGE_DAMPENING_MARGIN = 0.15
+EDGE_DAMPENING_GAIN = 0.5   # cursor gain inside the edge margins (1 = no dampening)
+
+# Camera to screen mapping (screen_mapping.py; `--calibrate` saves the region)
+SCREEN_REGION = (0.0, 0.0, 1.0, 1.0)  # active camera region x0, y0, x1, y1 (0-1)
+SCREEN_TARGET = "all"                 # span all monitors, or a monitor index
+SCREEN_CALIBRATION_PATH = "screen_calibration.json"
+POINTER_ACCELERATION = 0.0            # extra gain for fast motion (0 = off)
+POINTER_ACCEL_THRESHOLD = 12.0        # pixels per frame where the gain is 1
+
+# Two-hand zoom (zoom.py, "zoom" plugin)
+ZOOM_MODE = "scroll"        # "scroll" (ctrl + wheel) or "keys" (ctrl + = / ctrl + -)
+ZOOM_STEP = 0.1             # hand spread change per zoom step (0.1 = 10% wider)
+ZOOM_REFRESH_HZ = 60        # at most one zoom event per display refresh
+ZOOM_SMOOTHING = 0.5        # EMA weight of the newest spread (1 = no smoothing)
+ZOOM_ENGAGE_FRAMES = 3      # frames with two hands before zooming (and without to stop)
+ZOOM_CLICKS_PER_STEP = 1.0  # wheel clicks per zoom step in scroll mode
+
+# Inertial scrolling (inertial_scroll.py, "scroll" plugin)
+SCROLL_FINGERS = [0, 1, 1, 0, 0]  # scroll pose: index and middle finger up
+SCROLL_GAIN = 6.0          # wheel clicks/s per palm size/s of vertical hand motion
+SCROLL_EVENT_HZ = 120      # timer rate: at most this many scroll events per second
+SCROLL_DECAY = 0.4         # momentum time constant (s) after the pose is released
+SCROLL_RESPONSE = 0.05     # time constant (s) of following the hand while held
+SCROLL_DEADZONE = 0.2      # hand speeds below this (palm sizes/s) don't scroll
+SCROLL_MIN_SPEED = 0.3     # momentum below this (clicks/s) stops
+SCROLL_HISTORY = 5         # frames in the hand velocity estimate
+
+# Event log (set to None to disable)
+EVENT_LOG_PATH = "gesture_events.bin"
+
+# Sampling profiler (toggle with SIGUSR1 or the 'p' key)
+PROFILE_DURATION = 10.0   # seconds per profile
+PROFILE_INTERVAL = 0.005  # seconds between samples
+PROFILE_DIR = "."
+
+# Memory monitor for long runs (SIGUSR2 or the 'm' key dumps a diff)
+MEMORY_MONITOR = False
+MEMORY_INTERVAL = 300.0   # seconds between samples
+
+# Console logging (console_log.py): "DEBUG" also prints per-frame landmark dumps
+LOG_LEVEL = "INFO"
+LOG_BATCH_INTERVAL = 0.05  # seconds between background writes
+LOG_RATE_LIMIT = 1.0       # default seconds between repeated keyed messages
+
+# Landmark service (python landmark_service.py)
+SERVICE_PORT = 8765
+SERVICE_GRAPHS = 2            # MediaPipe graphs serving requests
+SERVICE_MAX_QUEUE_MS = 100    # requests waiting longer get HTTP 503
+SERVICE_INFER_SIZE = (320, 240)  # frames are decoded/resized down to about this
+SERVICE_STREAM_IDLE = 60.0    # seconds without frames before a client stream is unpinned
+
+# Landmark cache for image-set runs (python landmark_cache.py)
+LANDMARK_CACHE_PATH = "landmark_cache.bin"
+LANDMARK_CACHE_MB = 256
+
+# Pipeline host (python pipeline.py): plugins run in this order on every frame
+# (available: gestures, mouse, volume, picks_up, zoom, scroll; see plugins/__init__.py)
+PLUGINS = ["gestures"]
+PLUGIN_BUDGETS = {}   # per-plugin budget in ms, e.g. {"volume": 1.0}; defaults to the plugin's own
+PLUGIN_MAX_SKIP = 4   # most frames a plugin skips after going over budget (0 = never)
+
+# CPU scheduling per stage (scheduling.py), applied where the OS and permissions allow:
+# {"cpus": [...], "nice": n, "realtime": SCHED_FIFO priority (falls back to nice)}
+SCHED_STAGES = {
+    # "main": {"cpus": [2, 3], "nice": -5},      # frame loop; MediaPipe threads inherit the CPUs
+    # "capture": {"cpus": [1], "realtime": 10},  # camera reader threads (multi_camera.py)
+    # "inference": {"cpus": [2, 3]},             # DetectorPool graph threads
+    # "cursor": {"cpus": [1], "realtime": 5},    # inertial scroll timer
+    # "recorder": {"cpus": [0], "nice": 10},     # encoder thread (default: off the main CPUs)
+}
+OPENCV_THREADS = None  # cv2.setNumThreads (None = OpenCV's default, 0 = single-threaded)
+
+# Session recorder (session_recorder.py; 'r' toggles it in main.py)
+RECORD_DIR = "recordings"
+RECORD_AT_START = False
+RECORD_ANNOTATED = True   # record the frame as displayed (False = as captured)
+RECORD_POOL = 8           # frame buffers waiting for the encoder before frames are dropped
+RECORD_DROP = "oldest"    # which frame is dropped when the pool is full: "oldest" or "newest"
+RECORD_CODEC = "mp4v"
 
 # Display settings
 DISPLAY_FPS = True
@@ -0,0 +1,178 @@
+# console_log.py
+"""
+Asynchronous, rate-limited console output for the frame loops
+
+Writing to a terminal (especially over SSH) can block the frame thread for
+milliseconds. Here a log call on the frame thread is a level check and a
+deque append; formatting and writing happen on a background thread that
+wakes every `batch_interval`, drains the queue and writes everything in one
+go. Messages below the configured level return immediately, so verbose
+landmark dumps cost nothing when disabled.
+
+Messages with a `key` are rate limited per key: at most one every `every`
+seconds, and the next one that gets through reports how many were dropped
+("... (+29 suppressed)").
+
+    from console_log import console, DEBUG
+    console.info("Distance: %.2f", distance, key="distance", every=0.5)
+    console.debug(format_landmarks, lmList)   # callables are formatted lazily
+"""
+import atexit
+import sys
+import threading
+import time
+from collections import deque
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVELS = {"DEBUG": DEBUG, "INFO": INFO, "WARNING": WARNING, "ERROR": ERROR}
+
+
+class ConsoleLog:
+    """Queue-backed console logger with per-key rate limits"""
+
+    def __init__(self, level=INFO, stream=None, batch_interval=0.05, max_queue=10000,
+                 default_every=1.0):
+        """
+        Args:
+            level: Minimum level written (DEBUG, INFO, WARNING, ERROR or its name)
+            stream: Where to write (defaults to sys.stdout at write time)
+            batch_interval: Seconds between writer wake-ups
+            max_queue: Messages kept when the writer falls behind (oldest dropped)
+            default_every: Rate limit for keyed messages that don't pass `every`
+        """
+        self.level = LEVELS.get(level, level)
+        self.stream = stream
+        self.batch_interval = batch_interval
+        self.max_queue = max_queue
+        self.default_every = default_every
+        self.dropped = 0
+        self._queue = deque()
+        self._last = {}         # key -> time the last message was written
+        self._suppressed = {}   # key -> messages dropped since then
+        self._wake = threading.Event()
+        self._stop = False
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def enabled_for(self, level):
+        return level >= self.level
+
+    def log(self, level, msg, *args, key=None, every=None):
+        """
+        Queue a message (cheap; formatting happens on the writer thread)
+        Args:
+            msg: %-format string, or a callable returning the text from args
+            key: Rate-limit group for repeated messages
+            every: Minimum seconds between messages with this key
+        """
+        if level < self.level:
+            return
+        if self._thread is None:
+            self._start()
+        if len(self._queue) >= self.max_queue:
+            self._queue.popleft()
+            self.dropped += 1
+        self._queue.append((time.monotonic(), level, key, every, msg, args))
+        if self._stop:  # writer already closed (e.g. during exit): write inline
+            self._write_batch()
+
+    def debug(self, msg, *args, **kwargs):
+        self.log(DEBUG, msg, *args, **kwargs)
+
+    def info(self, msg, *args, **kwargs):
+        self.log(INFO, msg, *args, **kwargs)
+
+    def warning(self, msg, *args, **kwargs):
+        self.log(WARNING, msg, *args, **kwargs)
+
+    def error(self, msg, *args, **kwargs):
+        self.log(ERROR, msg, *args, **kwargs)
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="console-log",
+                                                daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self):
+        while not self._stop:
+            self._wake.wait(self.batch_interval)
+            self._wake.clear()
+            self._write_batch()
+        self._write_batch()
+
+    def _format(self, level, msg, args):
+        try:
+            text = msg(*args) if callable(msg) else (msg % args if args else str(msg))
+        except Exception as e:
+            text = f"{msg!r} {args!r} (format error: {e})"
+        if level >= WARNING:
+            name = "ERROR" if level >= ERROR else "WARNING"
+            text = f"[{name}] {text}"
+        return text
+
+    def _write_batch(self):
+        lines = []
+        queue = self._queue
+        while queue:
+            t, level, key, every, msg, args = queue.popleft()
+            if key is not None:
+                every = self.default_every if every is None else every
+                last = self._last.get(key)
+                if last is not None and t - last < every:
+                    self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                    continue
+                self._last[key] = t
+            text = self._format(level, msg, args)
+            suppressed = self._suppressed.pop(key, 0) if key is not None else 0
+            if suppressed:
+                text += f" (+{suppressed} suppressed)"
+            lines.append(text)
+        if self.dropped:
+            lines.append(f"[WARNING] console log queue full, dropped {self.dropped} messages")
+            self.dropped = 0
+        if lines:
+            stream = self.stream or sys.stdout
+            try:
+                stream.write("\n".join(lines) + "\n")
+                stream.flush()
+            except (OSError, ValueError):
+                pass
+
+    def flush(self):
+        """Write everything queued so far (from any thread)"""
+        if self._thread is not None and self._thread.is_alive():
+            self._wake.set()
+            deadline = time.monotonic() + 1.0
+            while self._queue and time.monotonic() < deadline:
+                time.sleep(0.001)
+
+    def close(self):
+        """Stop the writer after it drains the queue and reports suppressed counts"""
+        if self._thread is None or self._stop:
+            return
+        self._stop = True
+        self._wake.set()
+        self._thread.join(timeout=2.0)
+        leftover = [f"{key}: {n} more suppressed" for key, n in self._suppressed.items() if n]
+        self._suppressed.clear()
+        if leftover:
+            stream = self.stream or sys.stdout
+            stream.write("\n".join(leftover) + "\n")
+            stream.flush()
+
+
+def _from_config():
+    import config
+    return ConsoleLog(level=config.LOG_LEVEL, batch_interval=config.LOG_BATCH_INTERVAL,
+                      default_every=config.LOG_RATE_LIMIT)
+
+
+# Shared logger for all scripts
+console = _from_config()
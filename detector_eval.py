@@ -0,0 +1,344 @@
+# detector_eval.py
+"""
+Accuracy versus speed of detector settings
+
+Runs recorded videos (tracking mode) and image sets (static mode) through
+every combination of model complexity, detection / tracking confidence,
+max hands and input resolution, one (settings, input) task at a time on a
+process pool. Each worker keeps one Hands graph per settings, and the
+per-frame latency and CPU time are measured around hands.process only.
+Workers compete for the cores, so keep --workers below the core count when
+the latency numbers should match a single live pipeline.
+
+Per settings:
+    p50 / p95 latency    wall time of hands.process per frame
+    cpu                  process CPU time per frame (MediaPipe's own threads included)
+    detected             frames with at least one hand
+    jitter               median frame-to-frame landmark acceleration of the
+                         first hand in videos, in % of its palm size
+    agree                frames whose gesture label matches the reference
+                         settings (config.py unless --reference is given)
+    accuracy             images whose gesture matches their directory name
+                         ("dataset/ROCK ON/1.jpg"), when the set is labelled
+
+The table marks the Pareto front: settings no other settings beat on every
+column at once. Production defaults should come from those rows.
+
+    python detector_eval.py clips/ dataset/ --complexity 0 1 --resolution 0 320
+    python detector_eval.py clips/ --detection 0.5 0.8 --csv eval.csv
+"""
+import argparse
+import csv
+import itertools
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+
+import config
+from detector_pool import to_hand_result
+from features import HandFeatures
+from gestures import GESTURE_LABELS, classify_gesture
+from landmark_cache import DetectorSettings, find_images
+from video_analysis import find_videos
+
+
+class EvalSettings(namedtuple("EvalSettings", "model_complexity min_detection_confidence "
+                                              "min_tracking_confidence max_hands resolution")):
+    """One point of the grid; resolution is the frame width fed to the graph (0 = native)"""
+    __slots__ = ()
+
+    @classmethod
+    def from_config(cls):
+        return cls(config.MODEL_COMPLEXITY, config.MIN_DETECTION_CONFIDENCE,
+                   config.MIN_TRACKING_CONFIDENCE, config.MAX_HANDS, 0)
+
+    def label(self):
+        return (f"c{self.model_complexity} d{self.min_detection_confidence:g} "
+                f"t{self.min_tracking_confidence:g} h{self.max_hands} "
+                f"{self.resolution or 'native'}")
+
+    def graph(self, static):
+        """Static-image graph for image sets, tracking graph for videos"""
+        if static:
+            return DetectorSettings(self.model_complexity, self.min_detection_confidence,
+                                    self.max_hands).graph()
+        import mediapipe as mp
+        return mp.solutions.hands.Hands(
+            static_image_mode=False,
+            max_num_hands=self.max_hands,
+            model_complexity=self.model_complexity,
+            min_detection_confidence=self.min_detection_confidence,
+            min_tracking_confidence=self.min_tracking_confidence
+        )
+
+
+def settings_grid(complexity, detection, tracking, max_hands, resolution):
+    """Every combination of the given values"""
+    return [EvalSettings(*values) for values in
+            itertools.product(complexity, detection, tracking, max_hands, resolution)]
+
+
+def image_label(path):
+    """Gesture label named by the image's directory, or None"""
+    name = os.path.basename(os.path.dirname(path)).upper().replace("_", " ")
+    for label in GESTURE_LABELS:
+        if name == label or name == label.rstrip("!"):
+            return label
+    return None
+
+
+def _resize(img, width):
+    h, w = img.shape[:2]
+    if not width or width >= w:
+        return img
+    return cv2.resize(img, (width, round(h * width / w)), interpolation=cv2.INTER_AREA)
+
+
+# Worker process state: static-image graphs by DetectorSettings, built on first use
+_graphs = {}
+_graph_factory = None
+
+
+def _init_worker(graph_factory):
+    global _graph_factory
+    _graph_factory = graph_factory
+
+
+def _new_graph(settings, static):
+    return _graph_factory(settings, static) if _graph_factory else settings.graph(static)
+
+
+def _graph(settings):
+    """
+    The worker's static-image graph for these settings
+    Resolution and tracking confidence don't change a static graph, so settings
+    that differ only in those share one.
+    """
+    key = DetectorSettings(settings.model_complexity, settings.min_detection_confidence,
+                           settings.max_hands)
+    if key not in _graphs:
+        _graphs[key] = _new_graph(settings, True)
+    return _graphs[key]
+
+
+def _frames(kind, target, max_frames):
+    """Yields BGR frames of a video, or of a list of image paths (None if unreadable)"""
+    if kind == "images":
+        for path in target:
+            yield cv2.imread(path)
+        return
+    cap = cv2.VideoCapture(target)
+    try:
+        n = 0
+        while not max_frames or n < max_frames:
+            success, img = cap.read()
+            if not success:
+                break
+            n += 1
+            yield img
+    finally:
+        cap.release()
+
+
+def _evaluate(settings, kind, target, max_frames):
+    """
+    Runs in a worker: one settings over one video or image batch
+    Returns: dict of per-frame columns
+    """
+    # Videos get a fresh tracking graph (no track carry-over), closed when done
+    hands = _graph(settings) if kind == "images" else _new_graph(settings, False)
+    try:
+        return _run_task(hands, settings, kind, target, max_frames)
+    finally:
+        if kind != "images" and hasattr(hands, "close"):
+            hands.close()
+
+
+def _run_task(hands, settings, kind, target, max_frames):
+    latency, cpu, count, gestures, jitter = [], [], [], [], []
+    prev = prev2 = None  # first-hand landmarks of the last two frames (videos)
+    for img in _frames(kind, target, max_frames):
+        if img is None:  # keeps the columns aligned with the image labels
+            count.append(0)
+            gestures.append("NONE")
+            continue
+        img = _resize(cv2.flip(img, 1), settings.resolution)
+        h, w = img.shape[:2]
+        rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        wall, proc = time.perf_counter(), time.process_time()
+        results = hands.process(rgb)
+        latency.append(time.perf_counter() - wall)
+        cpu.append(time.process_time() - proc)
+        result = to_hand_result(results, None, None, (w, h))
+        count.append(len(result.landmarks))
+        if result.landmarks:
+            features = HandFeatures(result.pixel_points()[0])
+            gestures.append(classify_gesture(features.fingers))
+            lm = result.landmarks[0] * (w, h)
+            if kind == "video" and prev is not None and prev2 is not None:
+                accel = np.linalg.norm(lm - 2 * prev + prev2, axis=1).mean()
+                jitter.append(float(accel) / features.palm_size)
+            prev2, prev = prev, lm
+        else:
+            gestures.append("NONE")
+            prev = prev2 = None
+    return {"latency": latency, "cpu": cpu, "hands": count, "gestures": gestures,
+            "jitter": jitter}
+
+
+def plan_tasks(videos, images, batch=64):
+    """(kind, target, labels) per video and per batch of images"""
+    tasks = [("video", path, None) for path in videos]
+    for i in range(0, len(images), batch):
+        chunk = images[i:i + batch]
+        tasks.append(("images", chunk, [image_label(p) for p in chunk]))
+    return tasks
+
+
+def run_grid(grid, tasks, reference, workers=None, max_frames=0, graph_factory=None):
+    """
+    Evaluate every settings on every task
+    Args:
+        grid: EvalSettings to compare (the reference is added if missing)
+        tasks: From plan_tasks()
+        reference: EvalSettings whose gesture labels the others are compared with
+        workers: Worker processes
+        max_frames: Frames per video (0 = all)
+        graph_factory: (settings, static) -> graph, for tests (defaults to MediaPipe)
+    Returns: {settings: metrics dict}
+    """
+    if reference not in grid:
+        grid = [reference] + list(grid)
+    columns = {}
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1,
+                             initializer=_init_worker, initargs=(graph_factory,)) as pool:
+        futures = {(s, i): pool.submit(_evaluate, s, kind, target, max_frames)
+                   for s in grid for i, (kind, target, _) in enumerate(tasks)}
+        for key, future in futures.items():
+            columns[key] = future.result()
+
+    report = {}
+    for s in grid:
+        latency, cpu, count, jitter = [], [], [], []
+        agree = frames = correct = labelled = 0
+        for i, (_, _, labels) in enumerate(tasks):
+            col, ref = columns[(s, i)], columns[(reference, i)]
+            latency += col["latency"]
+            cpu += col["cpu"]
+            count += col["hands"]
+            jitter += col["jitter"]
+            n = min(len(col["gestures"]), len(ref["gestures"]))
+            agree += sum(a == b for a, b in zip(col["gestures"][:n], ref["gestures"][:n]))
+            frames += n
+            for label, gesture in zip(labels or (), col["gestures"]):
+                if label is not None:
+                    labelled += 1
+                    correct += label == gesture
+        ms = np.array(latency) * 1000
+        report[s] = {
+            "frames": len(latency),
+            "p50_ms": float(np.percentile(ms, 50)) if len(ms) else float("nan"),
+            "p95_ms": float(np.percentile(ms, 95)) if len(ms) else float("nan"),
+            "cpu_ms": float(np.mean(cpu)) * 1000 if cpu else float("nan"),
+            "detected": float(np.mean(np.array(count) > 0)) if count else float("nan"),
+            "jitter": float(np.median(jitter)) * 100 if jitter else float("nan"),
+            "agree": agree / frames if frames else float("nan"),
+            "accuracy": correct / labelled if labelled else float("nan"),
+        }
+    return report
+
+
+# Pareto objectives: (metric, True if higher is better)
+OBJECTIVES = [("p95_ms", False), ("cpu_ms", False), ("detected", True), ("jitter", False),
+              ("agree", True), ("accuracy", True)]
+
+
+def pareto_front(report):
+    """Settings that no other settings match or beat on every objective (NaN columns ignored)"""
+    def scores(m):
+        return [(m[k] if higher else -m[k]) for k, higher in OBJECTIVES if not np.isnan(m[k])]
+
+    front = set()
+    for s, m in report.items():
+        a = scores(m)
+        dominated = False
+        for other, om in report.items():
+            b = scores(om)
+            if other != s and len(a) == len(b) and \
+                    all(y >= x for x, y in zip(a, b)) and any(y > x for x, y in zip(a, b)):
+                dominated = True
+                break
+        if not dominated:
+            front.add(s)
+    return front
+
+
+def print_report(report, reference):
+    front = pareto_front(report)
+    print(f"{'':2}{'settings':<30} {'frames':>7} {'p50 ms':>7} {'p95 ms':>7} {'cpu ms':>7} "
+          f"{'detect':>7} {'jitter':>7} {'agree':>7} {'acc':>6}")
+    for s, m in sorted(report.items(), key=lambda item: item[1]["p95_ms"]):
+        mark = "* " if s in front else "  "
+        name = s.label() + (" (ref)" if s == reference else "")
+        print(f"{mark}{name:<30} {m['frames']:>7} {m['p50_ms']:>7.2f} {m['p95_ms']:>7.2f} "
+              f"{m['cpu_ms']:>7.2f} {m['detected']:>7.1%} {m['jitter']:>6.2f}% "
+              f"{m['agree']:>7.1%} {m['accuracy']:>6.1%}")
+    print("* Pareto front: no other settings are at least as good on every column")
+
+
+def write_csv(report, path):
+    front = pareto_front(report)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(list(EvalSettings._fields) + list(next(iter(report.values())))
+                        + ["pareto"])
+        for s, m in report.items():
+            writer.writerow(list(s) + list(m.values()) + [int(s in front)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Accuracy vs speed of detector settings")
+    parser.add_argument("inputs", nargs="+", help="videos, images or directories of them")
+    parser.add_argument("--complexity", type=int, nargs="+", default=[0, 1])
+    parser.add_argument("--detection", type=float, nargs="+",
+                        default=[config.MIN_DETECTION_CONFIDENCE])
+    parser.add_argument("--tracking", type=float, nargs="+",
+                        default=[config.MIN_TRACKING_CONFIDENCE])
+    parser.add_argument("--max-hands", type=int, nargs="+", default=[config.MAX_HANDS])
+    parser.add_argument("--resolution", type=int, nargs="+", default=[0],
+                        help="frame widths to feed the graph (0 = native)")
+    parser.add_argument("--reference", nargs=5, metavar=("C", "D", "T", "H", "RES"),
+                        help="reference settings (defaults to config.py at native resolution)")
+    parser.add_argument("--max-frames", type=int, default=0, help="frames per video (0 = all)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--csv", help="also write the table to this file")
+    args = parser.parse_args()
+
+    videos, images = find_videos(args.inputs), find_images(args.inputs)
+    if not videos and not images:
+        print("No videos or images found")
+        return
+    grid = settings_grid(args.complexity, args.detection, args.tracking, args.max_hands,
+                         args.resolution)
+    reference = EvalSettings.from_config()
+    if args.reference:
+        c, d, t, h, res = args.reference
+        reference = EvalSettings(int(c), float(d), float(t), int(h), int(res))
+
+    start = time.perf_counter()
+    report = run_grid(grid, plan_tasks(videos, images), reference, args.workers,
+                      args.max_frames)
+    print(f"{len(report)} settings x {len(videos)} videos + {len(images)} images "
+          f"in {time.perf_counter() - start:.1f}s")
+    print_report(report, reference)
+    if args.csv:
+        write_csv(report, args.csv)
+        print(f"Wrote {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+# detector_pool.py
+"""
+Thread-safe pool of MediaPipe Hands graphs for many streams in one process
+
+handDetector keeps the last result in self.results, so one instance can't
+be shared between threads, and building a graph per stream is expensive.
+DetectorPool owns K graphs, each with its own worker thread:
+    - every stream is pinned to one graph (least-loaded first), and a graph
+      processes its frames in submission order, so a stream's frames reach
+      the same graph in sequence and MediaPipe's tracking carries over
+      between them (streams that share a graph fall back to palm detection
+      more often; use K >= streams when tracking quality matters)
+    - streams that stop sending frames are unpinned after idle_timeout, so
+      they don't pile up or count against their graph's load
+    - hands.process() releases the GIL, so the K workers run in parallel
+    - results are immutable HandResult tuples with read-only arrays; nothing
+      is stored on the pool
+
+    pool = DetectorPool(graphs=4)
+    future = pool.submit("cam0", img, frame_time)
+    result = future.result()            # HandResult
+    with pool.lease("cam1") as graph:   # synchronous use
+        result = graph.process(img)
+
+Benchmark:
+    python detector_pool.py --streams 8 --graphs 1 2 4 8 --size 320x240
+"""
+import argparse
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import cv2
+import numpy as np
+
+import config
+from scheduling import apply_stage
+
+
+class QueueTimeout(Exception):
+    """A frame waited longer than its deadline before a graph was free"""
+
+
+class HandResult(namedtuple("HandResult", "stream frame_time size landmarks labels scores inference",
+                            defaults=(0.0,))):
+    """
+    Immutable hands detected in one frame
+    landmarks: tuple of read-only normalized (21, 2) float32 arrays
+    labels / scores: handedness ("Left"/"Right") and its confidence per hand
+    size: (width, height) of the frame that was processed
+    inference: seconds spent in hands.process
+    """
+    __slots__ = ()
+
+    def pixel_points(self, size=None):
+        """Landmarks as (21, 2) int32 pixel arrays for `size` (defaults to the frame size)"""
+        size = size or self.size
+        return [(lm * size).astype(np.int32) for lm in self.landmarks]
+
+
+def to_hand_result(results, stream, frame_time, size, inference=0.0):
+    """Copy a MediaPipe Hands result into a HandResult"""
+    landmarks, labels, scores = [], [], []
+    handedness = results.multi_handedness or []
+    for i, handLms in enumerate(results.multi_hand_landmarks or []):
+        pts = np.array([(lm.x, lm.y) for lm in handLms.landmark], dtype=np.float32)
+        pts.flags.writeable = False
+        landmarks.append(pts)
+        cls = handedness[i].classification[0] if i < len(handedness) else None
+        labels.append(cls.label if cls else "")
+        scores.append(float(cls.score) if cls else 0.0)
+    return HandResult(stream, frame_time, size, tuple(landmarks), tuple(labels), tuple(scores),
+                      inference)
+
+
+def mediapipe_graph(static_image_mode=False):
+    """A Hands graph configured from config.py"""
+    import mediapipe as mp
+    return mp.solutions.hands.Hands(
+        static_image_mode=static_image_mode,
+        max_num_hands=config.MAX_HANDS,
+        model_complexity=config.MODEL_COMPLEXITY,
+        min_detection_confidence=config.MIN_DETECTION_CONFIDENCE,
+        min_tracking_confidence=config.MIN_TRACKING_CONFIDENCE
+    )
+
+
+class Graph:
+    """One Hands graph, its lock and its worker thread"""
+
+    def __init__(self, index, hands):
+        self.index = index
+        self.hands = hands
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"graph-{index}",
+                                           initializer=apply_stage, initargs=("inference",))
+        self.streams = set()
+        self.frames = 0
+        self.busy = 0.0  # seconds spent in hands.process
+
+    def process(self, img, stream=None, frame_time=None):
+        """Run the graph on a BGR frame (callers must hold self.lock)"""
+        h, w = img.shape[:2]
+        rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        start = time.perf_counter()
+        results = self.hands.process(rgb)
+        elapsed = time.perf_counter() - start
+        self.busy += elapsed
+        self.frames += 1
+        return to_hand_result(results, stream, frame_time, (w, h), elapsed)
+
+    def _run(self, img, stream, frame_time, deadline):
+        if deadline is not None and time.monotonic() > deadline:
+            raise QueueTimeout(f"frame for {stream} expired in the queue")
+        with self.lock:
+            return self.process(img, stream, frame_time)
+
+
+class DetectorPool:
+    """K Hands graphs shared by any number of streams"""
+
+    def __init__(self, graphs=2, graph_factory=mediapipe_graph, idle_timeout=None):
+        """
+        Args:
+            graphs: Number of Hands graphs (and worker threads)
+            graph_factory: Creates one graph (anything with MediaPipe's process())
+            idle_timeout: Seconds without frames after which a stream is unpinned
+                          (None keeps pins until unpin())
+        """
+        self.graphs = [Graph(i, graph_factory()) for i in range(graphs)]
+        self.pins = {}
+        self.idle_timeout = idle_timeout
+        self._last_seen = {}  # stream -> time.monotonic() of its last frame
+        self._next_sweep = 0.0
+        self._lock = threading.Lock()
+
+    def pin(self, stream):
+        """Graph serving `stream`; new streams go to the graph with the fewest streams"""
+        now = time.monotonic()
+        with self._lock:
+            if self.idle_timeout is not None and now >= self._next_sweep:
+                self._expire(now - self.idle_timeout)
+                self._next_sweep = now + self.idle_timeout / 4
+            graph = self.pins.get(stream)
+            if graph is None:
+                graph = min(self.graphs, key=lambda g: (len(g.streams), g.index))
+                graph.streams.add(stream)
+                self.pins[stream] = graph
+            self._last_seen[stream] = now
+            return graph
+
+    def _expire(self, before):
+        """Unpin streams last seen before `before` (callers hold self._lock)"""
+        for stream in [s for s, seen in self._last_seen.items() if seen < before]:
+            self._unpin(stream)
+
+    def _unpin(self, stream):
+        self._last_seen.pop(stream, None)
+        graph = self.pins.pop(stream, None)
+        if graph is not None:
+            graph.streams.discard(stream)
+
+    def unpin(self, stream):
+        """Forget a stream that has ended"""
+        with self._lock:
+            self._unpin(stream)
+
+    def submit(self, stream, img, frame_time=None, deadline=None):
+        """
+        Queue a frame on the stream's graph
+        Args:
+            deadline: time.monotonic() after which the frame is dropped unprocessed
+                      (its future raises QueueTimeout)
+        Returns: Future of HandResult
+        """
+        graph = self.pin(stream)
+        return graph.executor.submit(graph._run, img, stream, frame_time, deadline)
+
+    def process(self, stream, img, frame_time=None):
+        """Process a frame synchronously on the calling thread"""
+        with self.lease(stream) as graph:
+            return graph.process(img, stream, frame_time)
+
+    @contextmanager
+    def lease(self, stream):
+        """Exclusive use of the stream's graph for the duration of the block"""
+        graph = self.pin(stream)
+        with graph.lock:
+            yield graph
+
+    def stats(self):
+        """Per graph: pinned streams, frames processed and busy seconds"""
+        return [{"graph": g.index, "streams": sorted(map(str, g.streams)),
+                 "frames": g.frames, "busy": g.busy} for g in self.graphs]
+
+    def close(self):
+        for graph in self.graphs:
+            graph.executor.shutdown(wait=True)
+            if hasattr(graph.hands, "close"):
+                graph.hands.close()
+
+
+def benchmark(streams, graphs, size, frames):
+    """Frames per second for `streams` synthetic streams on `graphs` graphs"""
+    from frame_source import SyntheticSource
+    sources = [SyntheticSource(size=size, frames=frames, seed=i) for i in range(streams)]
+    clips = [[img for ok, img in iter(src.read, (False, None))] for src in sources]
+    pool = DetectorPool(graphs=graphs)
+    start = time.perf_counter()
+    pending = []
+    for i in range(frames):
+        # Each stream has at most one frame in flight, like a live camera
+        futures = [pool.submit(s, clips[s][i], i) for s in range(streams)]
+        for future in pending:
+            future.result()
+        pending = futures
+    for future in pending:
+        future.result()
+    elapsed = time.perf_counter() - start
+    pool.close()
+    return streams * frames / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detector pool throughput benchmark")
+    parser.add_argument("--streams", type=int, default=8)
+    parser.add_argument("--graphs", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--size", default="320x240")
+    parser.add_argument("--frames", type=int, default=100, help="frames per stream")
+    args = parser.parse_args()
+
+    size = tuple(int(v) for v in args.size.split("x"))
+    print(f"{args.streams} streams at {size[0]}x{size[1]}, {args.frames} frames each")
+    base = None
+    for graphs in args.graphs:
+        fps = benchmark(args.streams, graphs, size, args.frames)
+        base = base or fps
+        print(f"{graphs:>3} graphs: {fps:8.1f} frames/s  ({fps / base:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+# event_log.py
+"""
+Append-only gesture event log
+
+Events are written into a memory-mapped binary file made of fixed-size
+blocks. Each block starts with an index header (time range and per-gesture
+counts, duration sums and latency sums) that is updated on every append, so
+queries can aggregate whole blocks from their headers and only scan the
+records of blocks at the edges of the requested time range.
+
+Query usage:
+    python event_log.py gesture_events.bin
+    python event_log.py gesture_events.bin --per hour --since "2026-10-19 08:00"
+    python event_log.py gesture_events.bin --gesture "ROCK ON" --per 15m
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import time
+from datetime import datetime
+
+import numpy as np
+
+MAGIC = b"GESTLOG1"
+VERSION = 2  # 2: hand widened to a u4 (track ids keep growing)
+FILE_HEADER_SIZE = 4096
+RECORDS_PER_BLOCK = 256
+GROW_BLOCKS = 64
+MAX_CODES = 32
+
+# magic, version, records per block, total events
+_FILE_HEADER = struct.Struct("<8sIIQ")
+_NAMES_OFFSET = _FILE_HEADER.size
+
+# ts, latency, duration, gesture, action, hand
+_RECORD = struct.Struct("<dffBB2xI")
+RECORD_DTYPE = np.dtype([("ts", "<f8"), ("latency", "<f4"), ("duration", "<f4"),
+                         ("gesture", "u1"), ("action", "u1"), ("pad", "u2"), ("hand", "<u4")])
+
+# first ts, last ts, count, then per gesture: counts, duration sums, latency sums
+_BLOCK_HEAD = struct.Struct("<ddI4x")
+_BLOCK_COUNTS_OFFSET = _BLOCK_HEAD.size
+_BLOCK_DUR_OFFSET = _BLOCK_COUNTS_OFFSET + 4 * MAX_CODES
+_BLOCK_LAT_OFFSET = _BLOCK_DUR_OFFSET + 8 * MAX_CODES
+BLOCK_HEADER_SIZE = _BLOCK_LAT_OFFSET + 8 * MAX_CODES
+BLOCK_SIZE = BLOCK_HEADER_SIZE + RECORDS_PER_BLOCK * _RECORD.size
+
+BUCKETS = {"m": 60, "h": 3600, "d": 86400}
+
+
+class EventLog:
+    """Memory-mapped append-only event log"""
+
+    def __init__(self, path, readonly=False):
+        self.path = path
+        self.readonly = readonly
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if readonly and not exists:
+            raise FileNotFoundError(path)
+
+        self._fd = os.open(path, os.O_RDONLY if readonly else os.O_RDWR | os.O_CREAT, 0o644)
+        if not exists:
+            os.ftruncate(self._fd, FILE_HEADER_SIZE + GROW_BLOCKS * BLOCK_SIZE)
+        self._map()
+
+        if exists:
+            magic, version, per_block, self.count = _FILE_HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC or per_block != RECORDS_PER_BLOCK:
+                raise ValueError(f"{path} is not a gesture event log")
+            if version != VERSION:
+                raise ValueError(f"{path} is a version {version} event log, expected {VERSION}")
+            names = json.loads(bytes(self._mm[_NAMES_OFFSET:FILE_HEADER_SIZE]).rstrip(b"\0"))
+            self.gestures, self.actions = names["gestures"], names["actions"]
+        else:
+            self.count = 0
+            self.gestures, self.actions = [], ["NONE"]
+            _FILE_HEADER.pack_into(self._mm, 0, MAGIC, VERSION, RECORDS_PER_BLOCK, 0)
+            self._write_names()
+
+    def _map(self):
+        size = os.fstat(self._fd).st_size
+        access = mmap.ACCESS_READ if self.readonly else mmap.ACCESS_WRITE
+        self._mm = mmap.mmap(self._fd, size, access=access)
+        self.capacity = (size - FILE_HEADER_SIZE) // BLOCK_SIZE * RECORDS_PER_BLOCK
+
+    def _write_names(self):
+        data = json.dumps({"gestures": self.gestures, "actions": self.actions}).encode()
+        if len(data) > FILE_HEADER_SIZE - _NAMES_OFFSET:
+            raise ValueError("Too many gesture/action names for the log header")
+        self._mm[_NAMES_OFFSET:_NAMES_OFFSET + len(data)] = data
+        self._mm[_NAMES_OFFSET + len(data):FILE_HEADER_SIZE] = bytes(
+            FILE_HEADER_SIZE - _NAMES_OFFSET - len(data))
+
+    def _code(self, table, name):
+        try:
+            return table.index(name)
+        except ValueError:
+            if len(table) >= MAX_CODES:
+                raise ValueError(f"Event log supports at most {MAX_CODES} names")
+            table.append(name)
+            self._write_names()
+            return len(table) - 1
+
+    def _grow(self):
+        self._mm.close()
+        size = os.fstat(self._fd).st_size
+        os.ftruncate(self._fd, size + GROW_BLOCKS * BLOCK_SIZE)
+        self._map()
+
+    def append(self, gesture, hand=0, action=None, latency=0.0, duration=0.0, timestamp=None):
+        """
+        Append one event
+        Args:
+            gesture: Gesture label, e.g. "ROCK ON"
+            hand: Hand index or track id
+            action: Name of the action triggered, None if nothing fired
+            latency: Seconds from frame capture to the action call
+            duration: Seconds the gesture lasted (e.g. a drag), 0 if not applicable
+            timestamp: Event time, defaults to time.time()
+        """
+        if self.count >= self.capacity:
+            self._grow()
+        ts = time.time() if timestamp is None else timestamp
+        g = self._code(self.gestures, gesture)
+        a = self._code(self.actions, action or "NONE")
+
+        block, slot = divmod(self.count, RECORDS_PER_BLOCK)
+        base = FILE_HEADER_SIZE + block * BLOCK_SIZE
+        _RECORD.pack_into(self._mm, base + BLOCK_HEADER_SIZE + slot * _RECORD.size,
+                          ts, latency, duration, g, a, hand)
+
+        # Update the block's index header
+        first = ts if slot == 0 else _BLOCK_HEAD.unpack_from(self._mm, base)[0]
+        _BLOCK_HEAD.pack_into(self._mm, base, first, ts, slot + 1)
+        self._add(base + _BLOCK_COUNTS_OFFSET + 4 * g, "<I", 1)
+        self._add(base + _BLOCK_DUR_OFFSET + 8 * g, "<d", duration)
+        self._add(base + _BLOCK_LAT_OFFSET + 8 * g, "<d", latency)
+
+        self.count += 1
+        struct.pack_into("<Q", self._mm, 16, self.count)
+
+    def _add(self, offset, fmt, value):
+        struct.pack_into(fmt, self._mm, offset, struct.unpack_from(fmt, self._mm, offset)[0] + value)
+
+    def flush(self):
+        """Flush dirty pages to disk"""
+        if not self.readonly:
+            self._mm.flush()
+
+    def close(self):
+        """Flush and close the log"""
+        self.flush()
+        self._mm.close()
+        os.close(self._fd)
+
+    # ---- reading ----
+
+    @property
+    def num_blocks(self):
+        return (self.count + RECORDS_PER_BLOCK - 1) // RECORDS_PER_BLOCK
+
+    def block_header(self, block):
+        """Return (first_ts, last_ts, count, counts, duration_sums, latency_sums) of a block"""
+        base = FILE_HEADER_SIZE + block * BLOCK_SIZE
+        first, last, count = _BLOCK_HEAD.unpack_from(self._mm, base)
+        counts = np.frombuffer(self._mm, "<u4", MAX_CODES, base + _BLOCK_COUNTS_OFFSET)
+        durations = np.frombuffer(self._mm, "<f8", MAX_CODES, base + _BLOCK_DUR_OFFSET)
+        latencies = np.frombuffer(self._mm, "<f8", MAX_CODES, base + _BLOCK_LAT_OFFSET)
+        return first, last, count, counts.copy(), durations.copy(), latencies.copy()
+
+    def block_records(self, block):
+        """Structured array of the records stored in a block"""
+        count = _BLOCK_HEAD.unpack_from(self._mm, FILE_HEADER_SIZE + block * BLOCK_SIZE)[2]
+        offset = FILE_HEADER_SIZE + block * BLOCK_SIZE + BLOCK_HEADER_SIZE
+        return np.frombuffer(self._mm, RECORD_DTYPE, count, offset)
+
+    def _find_block(self, ts):
+        """First block whose last timestamp is >= ts (binary search on headers)"""
+        lo, hi = 0, self.num_blocks
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if _BLOCK_HEAD.unpack_from(self._mm, FILE_HEADER_SIZE + mid * BLOCK_SIZE)[1] < ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def summarize(self, since=None, until=None, bucket=None):
+        """
+        Aggregate events in [since, until) into time buckets
+        Whole blocks inside one bucket are taken from their index header;
+        only blocks crossing a boundary are scanned.
+
+        Returns: (stats, blocks_scanned) where stats maps
+                 (bucket_start, gesture_code) -> [count, duration_sum, latency_sum]
+        """
+        since = -np.inf if since is None else since
+        until = np.inf if until is None else until
+        stats = {}
+        scanned = 0
+
+        def bucket_of(ts):
+            return 0.0 if bucket is None else np.floor(ts / bucket) * bucket
+
+        for block in range(self._find_block(since), self.num_blocks):
+            first, last, count, counts, durations, latencies = self.block_header(block)
+            if first >= until:
+                break
+            if first >= since and last < until and bucket_of(first) == bucket_of(last):
+                key = bucket_of(first)
+                for g in np.nonzero(counts)[0]:
+                    entry = stats.setdefault((key, int(g)), [0, 0.0, 0.0])
+                    entry[0] += int(counts[g])
+                    entry[1] += float(durations[g])
+                    entry[2] += float(latencies[g])
+                continue
+
+            # Edge block: scan its records
+            scanned += 1
+            rec = self.block_records(block)
+            rec = rec[(rec["ts"] >= since) & (rec["ts"] < until)]
+            keys = (np.floor(rec["ts"] / bucket) * bucket) if bucket else np.zeros(len(rec))
+            for key, g in set(zip(keys.tolist(), rec["gesture"].tolist())):
+                sel = (keys == key) & (rec["gesture"] == g)
+                entry = stats.setdefault((key, g), [0, 0.0, 0.0])
+                entry[0] += int(sel.sum())
+                entry[1] += float(rec["duration"][sel].sum())
+                entry[2] += float(rec["latency"][sel].sum())
+        return stats, scanned
+
+
+def parse_time(text):
+    """Parse an ISO date/time or a unix timestamp"""
+    if text is None:
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return datetime.fromisoformat(text).timestamp()
+
+
+def parse_bucket(text):
+    """Parse a bucket size like 'hour', '15m', '1d' into seconds"""
+    if text is None:
+        return None
+    text = {"minute": "1m", "hour": "1h", "day": "1d"}.get(text, text)
+    return float(text[:-1] or 1) * BUCKETS[text[-1]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query a gesture event log")
+    parser.add_argument("path", help="event log file")
+    parser.add_argument("--since", help="start time (ISO format or unix time)")
+    parser.add_argument("--until", help="end time (ISO format or unix time)")
+    parser.add_argument("--per", help="bucket size: minute, hour, day, or e.g. 15m, 6h")
+    parser.add_argument("--gesture", help="only show this gesture")
+    args = parser.parse_args()
+
+    log = EventLog(args.path, readonly=True)
+    bucket = parse_bucket(args.per)
+    start = time.perf_counter()
+    stats, scanned = log.summarize(parse_time(args.since), parse_time(args.until), bucket)
+    elapsed = time.perf_counter() - start
+
+    print(f"{'bucket':<20} {'gesture':<16} {'count':>7} {'rate/h':>8} "
+          f"{'avg dur':>8} {'avg lat':>8}")
+    for (key, g), (count, dur, lat) in sorted(stats.items()):
+        name = log.gestures[g]
+        if args.gesture and name != args.gesture:
+            continue
+        when = datetime.fromtimestamp(key).strftime("%Y-%m-%d %H:%M") if bucket else "all"
+        rate = f"{count * 3600 / bucket:8.1f}" if bucket else f"{'-':>8}"
+        lat_text = f"{lat / count * 1000:6.1f}ms" if lat else f"{'-':>8}"
+        print(f"{when:<20} {name:<16} {count:>7} {rate} {dur / count:7.2f}s {lat_text}")
+    print(f"\n{log.count} events in {log.num_blocks} blocks, "
+          f"{scanned} blocks scanned, query took {elapsed * 1000:.1f} ms")
+    log.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# features.py
+"""
+Shared per-frame hand features
+
+HandFeatures wraps one hand's (21, 2) landmark array and computes the
+geometry the gesture code needs (fingertip distances, finger states, joint
+angles, palm size, scale-normalized coordinates) with NumPy, each at most
+once per frame and only when first requested.
+"""
+from functools import cached_property
+
+import numpy as np
+
+from landmarks import WRIST, TIP_IDS, HAND_CHAINS, array_to_lmlist
+
+MIDDLE_MCP = 9
+
+# Joint angle triplets (previous, joint, next) along each finger
+_FINGER_CHAINS = HAND_CHAINS[:2] + [[0] + chain for chain in HAND_CHAINS[2:4]] + [HAND_CHAINS[4]]
+_ANGLE_IDX = np.array([(c[i - 1], c[i], c[i + 1])
+                       for c in _FINGER_CHAINS for i in range(1, len(c) - 1)])
+
+_TIP_INDEX = {tip: i for i, tip in enumerate(TIP_IDS)}
+_UP_TIPS = np.array(TIP_IDS[1:])
+
+
+class HandFeatures:
+    """Lazily computed geometry for one hand in one frame"""
+
+    def __init__(self, points):
+        """
+        Args:
+            points: (21, 2) pixel landmark array (or [[id, x, y], ...] list)
+        """
+        pts = np.asarray(points, dtype=np.float32)
+        if pts.shape[-1] == 3:  # lmList format
+            pts = pts[:, 1:]
+        self.points = pts
+
+    @cached_property
+    def lmList(self):
+        """Landmarks in the [[id, x, y], ...] format used by the scripts"""
+        return array_to_lmlist(self.points)
+
+    @cached_property
+    def tip_distances(self):
+        """(5, 5) pixel distances between fingertips (thumb, index, middle, ring, pinky)"""
+        tips = self.points[TIP_IDS]
+        diff = tips[:, None] - tips[None, :]
+        return np.sqrt((diff * diff).sum(axis=-1))
+
+    def distance(self, a, b):
+        """Pixel distance between two landmarks, from the fingertip table when possible"""
+        if a in _TIP_INDEX and b in _TIP_INDEX:
+            return float(self.tip_distances[_TIP_INDEX[a], _TIP_INDEX[b]])
+        dx, dy = self.points[b] - self.points[a]
+        return float(np.hypot(dx, dy))
+
+    @property
+    def pinch_distance(self):
+        """Thumb tip to index tip distance in pixels"""
+        return float(self.tip_distances[0, 1])
+
+    @cached_property
+    def palm_size(self):
+        """Wrist to middle-finger knuckle distance in pixels: the hand's scale"""
+        dx, dy = self.points[MIDDLE_MCP] - self.points[WRIST]
+        return max(float(np.hypot(dx, dy)), 1.0)
+
+    def relative(self, pixels):
+        """Express a pixel length in palm sizes"""
+        return pixels / self.palm_size
+
+    def scaled(self, palm_fraction):
+        """Convert a length in palm sizes to pixels for this hand"""
+        return palm_fraction * self.palm_size
+
+    @cached_property
+    def normalized(self):
+        """Landmarks relative to the wrist, in palm sizes (scale invariant)"""
+        return (self.points - self.points[WRIST]) / self.palm_size
+
+    @cached_property
+    def joint_angles(self):
+        """(15,) bend angle in degrees at each finger joint, 0 = straight"""
+        p = self.points[_ANGLE_IDX]
+        v1 = p[:, 0] - p[:, 1]
+        v2 = p[:, 2] - p[:, 1]
+        cross = v1[:, 0] * v2[:, 1] - v1[:, 1] * v2[:, 0]
+        dot = (v1 * v2).sum(axis=1)
+        return 180.0 - np.degrees(np.abs(np.arctan2(cross, dot)))
+
+    @cached_property
+    def fingers(self):
+        """[thumb, index, middle, ring, pinky] with 1 = up (same rule as gestures.fingers_up)"""
+        pts = self.points
+        others = pts[_UP_TIPS, 1] < pts[_UP_TIPS - 2, 1]
+        return [int(pts[4, 0] > pts[3, 0])] + others.astype(int).tolist()
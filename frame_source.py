@@ -0,0 +1,323 @@
+# frame_source.py
+"""
+Pluggable frame sources
+
+Every source behaves like cv2.VideoCapture (read() -> (success, img),
+isOpened(), set(), release()) so the scripts can swap a camera for a file,
+a folder of images, a synthetic generator or a shared-memory feed without
+touching their loops. After each read() `source.timestamp` holds the
+frame's capture time on the source's clock.
+
+Replayed sources (file, images, synthetic) stamp frame n at start + n / fps.
+With a SimulatedClock they move the clock to that time, so a whole session
+replays deterministically and as fast as the CPU allows; with realtime=True
+they sleep on the system clock to play back at the recorded rate.
+
+    source = open_source(config.FRAME_SOURCE)   # 0, "clip.mp4", "frames/",
+                                                # "synthetic", "shm:cam0:640x480"
+"""
+import argparse
+import os
+import platform
+import time
+
+import cv2
+import numpy as np
+
+from clock import SystemClock, SimulatedClock
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+class FrameSource:
+    """Base class: a cv2.VideoCapture-like stream of timestamped frames"""
+
+    fps = 30.0
+
+    def __init__(self, clock=None, realtime=False):
+        """
+        Args:
+            clock: Time source for timestamps (defaults to SystemClock)
+            realtime: Pace replayed frames at their recorded rate
+        """
+        self.clock = clock or SystemClock()
+        self.realtime = realtime
+        self.timestamp = None
+        self.frame_index = 0
+        self.finished = False
+        self.start = self.clock()
+
+    def _grab(self):
+        """Return the next frame, or None when the source is exhausted"""
+        raise NotImplementedError
+
+    def _stamp(self):
+        """Timestamp for the frame just grabbed (replayed sources: media time)"""
+        t = self.start + self.frame_index / self.fps
+        if self.realtime or isinstance(self.clock, SimulatedClock):
+            self.clock.wait_until(t)
+        return t
+
+    def read(self):
+        if self.finished:
+            return False, None
+        img = self._grab()
+        if img is None:
+            self.finished = True
+            return False, None
+        self.timestamp = self._stamp()
+        self.frame_index += 1
+        return True, img
+
+    def isOpened(self):
+        return not self.finished
+
+    def set(self, prop, value):
+        return False
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        return 0
+
+    def release(self):
+        self.finished = True
+
+
+class CameraSource(FrameSource):
+    """A live camera (V4L2 on Linux); frames are stamped when read() returns"""
+
+    def __init__(self, index=0, width=None, height=None, clock=None):
+        super().__init__(clock)
+        if platform.system() == "Linux":
+            self.cap = cv2.VideoCapture(index, cv2.CAP_V4L2)
+            if not self.cap.isOpened():
+                self.cap = cv2.VideoCapture(index)
+        else:
+            self.cap = cv2.VideoCapture(index)
+        if width:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        if height:
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+    def read(self):
+        # A camera that drops a frame isn't finished, so the caller may retry
+        success, img = self.cap.read()
+        if success:
+            self.timestamp = self.clock()
+            self.frame_index += 1
+        return success, img
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def set(self, prop, value):
+        return self.cap.set(prop, value)
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def release(self):
+        self.cap.release()
+        self.finished = True
+
+
+class VideoFileSource(FrameSource):
+    """Frames from a video file, stamped with their media time"""
+
+    def __init__(self, path, clock=None, realtime=False, loop=False):
+        if not os.path.isfile(path):
+            raise FileNotFoundError(path)
+        super().__init__(clock, realtime)
+        self.path = path
+        self.loop = loop
+        self.cap = cv2.VideoCapture(path)
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+    def _grab(self):
+        success, img = self.cap.read()
+        if not success and self.loop and self.frame_index:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            success, img = self.cap.read()
+        return img if success else None
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def release(self):
+        self.cap.release()
+        self.finished = True
+
+
+class ImageDirSource(FrameSource):
+    """Frames from the images in a directory, in name order"""
+
+    def __init__(self, path, fps=30.0, clock=None, realtime=False, loop=False):
+        super().__init__(clock, realtime)
+        self.files = sorted(os.path.join(path, f) for f in os.listdir(path)
+                            if f.lower().endswith(IMAGE_EXTENSIONS))
+        if not self.files:
+            raise FileNotFoundError(f"no images in {path}")
+        self.fps = fps
+        self.loop = loop
+
+    def _grab(self):
+        i = self.frame_index
+        if i >= len(self.files):
+            if not self.loop:
+                return None
+            i %= len(self.files)
+        return cv2.imread(self.files[i])
+
+
+class SyntheticSource(FrameSource):
+    """
+    Generated frames with drawn hand skeletons
+    `source.hands` holds the ground-truth (21, 2) landmark arrays of the last
+    frame, so gesture logic can be exercised without a detector.
+    """
+
+    def __init__(self, size=(640, 480), fps=30.0, frames=None, hands=1, seed=0,
+                 clock=None, realtime=False):
+        super().__init__(clock, realtime)
+        self.size = size
+        self.fps = fps
+        self.frames = frames
+        self.num_hands = hands
+        self.rng = np.random.default_rng(seed)
+        self.hands = []
+        w, h = size
+        self.background = np.full((h, w, 3), 90, dtype=np.uint8)
+
+    def _grab(self):
+        from synthetic_landmarks import drifting_hand
+        from renderer import draw_hand
+        if self.frames is not None and self.frame_index >= self.frames:
+            return None
+        w, h = self.size
+        t = self.frame_index / self.fps
+        self.hands = [drifting_hand(self.rng, t + 3 * i, w, h) for i in range(self.num_hands)]
+        img = self.background.copy()
+        for points in self.hands:
+            draw_hand(img, points)
+        return img
+
+
+class SharedMemorySource(FrameSource):
+    """
+    Frames published by another process into a shared-memory block
+    Layout: [seq uint64][timestamp float64][closed uint64][h * w * 3 BGR bytes].
+    The writer makes seq odd while it copies a frame in and even when done;
+    read() waits for a new even seq and retries if it changed mid-copy.
+    """
+
+    HEADER = 24
+
+    def __init__(self, name, size=(640, 480), clock=None, timeout=1.0, create=False):
+        from multiprocessing import shared_memory
+        super().__init__(clock)
+        w, h = size
+        self.shape = (h, w, 3)
+        nbytes = self.HEADER + h * w * 3
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=nbytes)
+        self.header = np.ndarray((3,), dtype=np.uint64, buffer=self.shm.buf)
+        self.ts = np.ndarray((1,), dtype=np.float64, buffer=self.shm.buf, offset=8)
+        self.frame = np.ndarray(self.shape, dtype=np.uint8, buffer=self.shm.buf,
+                                offset=self.HEADER)
+        self.timeout = timeout
+        self.last_seq = 0
+        self.owner = create
+
+    def read(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            if self.header[2]:
+                self.finished = True
+                return False, None
+            seq = int(self.header[0])
+            if seq != self.last_seq and seq % 2 == 0:
+                img = self.frame.copy()
+                ts = float(self.ts[0])
+                if int(self.header[0]) == seq:
+                    self.last_seq = seq
+                    self.timestamp = ts
+                    self.frame_index += 1
+                    return True, img
+            if time.monotonic() > deadline:
+                return False, None
+            time.sleep(0.001)
+
+    def write(self, img, timestamp=None):
+        """Publish a frame (producer side)"""
+        self.header[0] += 1
+        self.frame[:] = img
+        self.ts[0] = self.clock() if timestamp is None else timestamp
+        self.header[0] += 1
+
+    def close_stream(self):
+        """Tell readers no more frames are coming (producer side)"""
+        self.header[2] = 1
+
+    def release(self):
+        del self.header, self.ts, self.frame
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+        self.finished = True
+
+
+def open_source(spec, clock=None, **kwargs):
+    """
+    Build a frame source from a spec
+    Args:
+        spec: Camera index (int or digits), "synthetic[:hands]",
+              "shm:<name>:<w>x<h>", an image directory or a video file
+        clock: Time source shared with the rest of the app
+        kwargs: Passed to the source (realtime, loop, ...); width/height only
+                reach cameras, other sources keep their own frame size
+    """
+    width, height = kwargs.pop("width", None), kwargs.pop("height", None)
+    if isinstance(spec, int) or (isinstance(spec, str) and spec.isdigit()):
+        return CameraSource(int(spec), width=width, height=height, clock=clock, **kwargs)
+    if spec.startswith("synthetic"):
+        _, _, hands = spec.partition(":")
+        return SyntheticSource(hands=int(hands or 1), clock=clock, **kwargs)
+    if spec.startswith("shm:"):
+        _, name, size = spec.split(":")
+        w, h = (int(v) for v in size.split("x"))
+        return SharedMemorySource(name, (w, h), clock=clock, **kwargs)
+    if os.path.isdir(spec):
+        return ImageDirSource(spec, clock=clock, **kwargs)
+    return VideoFileSource(spec, clock=clock, **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read a frame source and report its rate")
+    parser.add_argument("source", help="camera index, video file, image dir, synthetic, shm:...")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--simulated", action="store_true", help="use a simulated clock")
+    args = parser.parse_args()
+
+    clock = SimulatedClock() if args.simulated else SystemClock()
+    source = open_source(args.source, clock=clock)
+    start = time.perf_counter()
+    first = None
+    n = 0
+    while n < args.frames:
+        success, img = source.read()
+        if not success:
+            if source.finished:
+                break
+            continue
+        first = source.timestamp if first is None else first
+        n += 1
+    elapsed = time.perf_counter() - start
+    span = (source.timestamp - first) if n > 1 else 0.0
+    print(f"{n} frames in {elapsed:.2f}s wall ({n / max(elapsed, 1e-9):.0f} fps), "
+          f"{span:.2f}s of source time")
+    source.release()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+# gesture_controller.py
+"""
+Gesture to action logic of main.py
+
+GestureController takes one frame's hand landmarks and fires actions. It
+knows nothing about the camera or MediaPipe and calls actions through a
+backend object, so the same logic runs live, on recordings, or in the
+latency harness with an instrumented backend.
+"""
+import time
+
+import cv2
+
+import actions
+import config
+from features import HandFeatures
+from gesture_stabilizer import stabilizer_from_config
+from gestures import classify_gesture
+from hand_tracker import HandTracker
+from input_backend import default_backend
+from mouse_smoother import MouseController
+from screen_mapping import PointerAcceleration, default_mapping
+
+
+class SystemActions:
+    """Action backend that launches apps and drives the real pointer"""
+
+    def __init__(self, inputs=None):
+        """
+        Args:
+            inputs: InputBackend for the pointer (defaults to config.INPUT_BACKEND)
+        """
+        self.inputs = inputs or default_backend()
+
+    def open_myutep(self):
+        actions.open_myutep()
+
+    def open_spotify(self):
+        actions.open_spotify()
+
+    def change_volume(self, direction):
+        actions.change_volume(direction)
+
+    def mouse_down(self):
+        self.inputs.mouse_down()
+
+    def mouse_up(self):
+        self.inputs.mouse_up()
+
+    def move_to(self, x, y):
+        self.inputs.move_to(x, y)
+
+    def flush(self):
+        self.inputs.flush()
+
+
+class HandState:
+    """Per-hand state, owned by a HandTracker track"""
+
+    def __init__(self, screen_w, screen_h, move_to=None, mapping=None):
+        acceleration = None
+        if config.POINTER_ACCELERATION and mapping is not None:
+            acceleration = PointerAcceleration(config.POINTER_ACCELERATION,
+                                               config.POINTER_ACCEL_THRESHOLD,
+                                               bounds=mapping.bounds)
+        self.mouse_controller = MouseController(screen_w, screen_h, config.EDGE_DAMPENING_MARGIN,
+                                                move_to=move_to, mapping=mapping,
+                                                acceleration=acceleration)
+        self.dragging = False
+        self.drag_start_time = 0
+        self.last_pinch_time = float("-inf")
+
+
+class GestureController:
+    """Turns tracked hands into app launches, volume changes and mouse input"""
+
+    def __init__(self, screen_size, backend=None, event_log=None, clock=time.time,
+                 mapping=None):
+        """
+        Args:
+            screen_size: (width, height) of the screen the cursor maps to
+            backend: Object with the SystemActions methods (defaults to SystemActions)
+            event_log: Optional EventLog receiving every triggered action
+            clock: Returns the current time in seconds (for cooldowns and latency)
+            mapping: ScreenMapping for the cursor (defaults to config.py, the saved
+                     calibration and the detected monitors)
+        """
+        self.screen_size = screen_size
+        self.mapping = mapping or default_mapping(screen_size)
+        self.backend = backend or SystemActions()
+        self.event_log = event_log
+        self.event_sinks = []  # callables(gesture, action, hand, timestamp, duration)
+        self.clock = clock
+        self.tracker = HandTracker(gate=config.TRACK_GATE, max_age=config.TRACK_MAX_AGE,
+                                   state_factory=self._new_state,
+                                   on_remove=self._release_hand,
+                                   max_tracks=config.TRACK_MAX_TRACKS)
+        # Launches and volume steps only follow gestures that held for a few frames
+        self.stabilizer = stabilizer_from_config()
+        self.last_hang_time = float("-inf")
+        self.last_rock_time = float("-inf")
+        self.last_vol_time = float("-inf")
+        self.frame_time = 0
+
+    def _new_state(self):
+        return HandState(*self.screen_size, move_to=self.backend.move_to, mapping=self.mapping)
+
+    def _release_hand(self, track):
+        # Don't leave the button held if a hand disappears mid-drag
+        if track.state.dragging:
+            self.backend.mouse_up()
+            self.log_event("RELEASE", "mouseUp", track.id,
+                           duration=self.clock() - track.state.drag_start_time)
+
+    def log_event(self, gesture, action, hand=0, duration=0.0):
+        if self.event_log is None and not self.event_sinks:
+            return
+        now = self.clock()
+        if self.event_log is not None:
+            self.event_log.append(gesture, hand=hand, action=action, timestamp=now,
+                                  latency=now - self.frame_time, duration=duration)
+        for sink in self.event_sinks:
+            sink(gesture, action, hand, now, duration)
+
+    def process(self, hand_points, frame_size, frame_time, img=None, scores=None):
+        """
+        Run the gesture logic for one frame
+        Args:
+            hand_points: (21, 2) pixel landmark arrays, one per detected hand
+            frame_size: (width, height) of the camera frame
+            frame_time: Capture time of the frame
+            img: Optional frame to draw the pinch indicator on
+            scores: Detection (handedness) confidence per hand, the vote weights
+                    in GESTURE_VOTE_MODE = "confidence" (1.0 each if not given)
+        Returns: gesture label to display
+        """
+        self.frame_time = frame_time
+        w, h = frame_size
+        gesture_label = "NONE"
+        now = self.clock()
+
+        tracks = self.tracker.update(hand_points, frame_size)
+        if not tracks:
+            self.stabilizer.update(gesture_label)
+            return gesture_label
+
+        # Follow the longest-lived hand, regardless of MediaPipe's ordering
+        track = min(tracks, key=lambda t: t.id)
+        state = track.state
+        # Geometry is computed once per frame and shared by everything below
+        features = HandFeatures(track.points)
+        lmList = features.lmList
+        confidence = 1.0
+        if scores:
+            index = tracks.index(track)  # tracks come back in detection order
+            if index < len(scores):
+                confidence = float(scores[index])
+        gesture_label = self.stabilizer.update(classify_gesture(features.fingers), confidence)
+
+        # Gesture: Hang Loose → Open myUTEP
+        if gesture_label == "PICKS UP!":
+            if now - self.last_hang_time > config.HANG_COOLDOWN:
+                self.backend.open_myutep()
+                self.log_event(gesture_label, "open_myutep", track.id)
+                self.last_hang_time = now
+
+        # Gesture: Rock On → Open Spotify
+        elif gesture_label == "ROCK ON":
+            if now - self.last_rock_time > config.ROCK_COOLDOWN:
+                self.backend.open_spotify()
+                self.log_event(gesture_label, "open_spotify", track.id)
+                self.last_rock_time = now
+
+        # Gesture: Open Palm → Volume Up
+        elif gesture_label == "VOLUME UP":
+            if now - self.last_vol_time > config.VOLUME_COOLDOWN:
+                self.backend.change_volume("UP")
+                self.log_event(gesture_label, "change_volume", track.id)
+                self.last_vol_time = now
+
+        # Gesture: Fist → Volume Down
+        elif gesture_label == "VOLUME DOWN":
+            if now - self.last_vol_time > config.VOLUME_COOLDOWN:
+                self.backend.change_volume("DOWN")
+                self.log_event(gesture_label, "change_volume", track.id)
+                self.last_vol_time = now
+
+        # Mouse control with index finger
+        ix, iy = lmList[8][1], lmList[8][2]
+        state.mouse_controller.process_movement(ix, iy, w, h)
+
+        # Pinch detection for clicking (thresholds scale with hand size)
+        pinch_distance = features.pinch_distance
+        pinch_threshold = features.scaled(config.PINCH_THRESHOLD)
+        release_threshold = features.scaled(config.RELEASE_THRESHOLD)
+
+        # Draw pinch indicator
+        if img is not None and pinch_distance < release_threshold:
+            x1, y1 = lmList[4][1], lmList[4][2]
+            color = (0, 255, 0) if pinch_distance < pinch_threshold else (0, 255, 255)
+            cv2.line(img, (x1, y1), (ix, iy), color, 3)
+            cv2.circle(img, (x1, y1), 10, color, cv2.FILLED)
+            cv2.circle(img, (ix, iy), 10, color, cv2.FILLED)
+
+        # Start drag/click
+        if (pinch_distance < pinch_threshold and
+                not state.dragging and
+                now - state.last_pinch_time > config.PINCH_COOLDOWN):
+            self.backend.mouse_down()
+            state.dragging = True
+            state.last_pinch_time = now
+            state.drag_start_time = now
+            gesture_label = "PINCH (DRAG)"
+            self.log_event(gesture_label, "mouseDown", track.id)
+
+        # Release drag
+        elif pinch_distance > release_threshold and state.dragging:
+            self.backend.mouse_up()
+            state.dragging = False
+            gesture_label = "RELEASE"
+            self.log_event(gesture_label, "mouseUp", track.id,
+                           duration=now - state.drag_start_time)
+
+        # Send this frame's batched pointer motion as one event
+        self.backend.flush()
+        return gesture_label
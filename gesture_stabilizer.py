@@ -0,0 +1,171 @@
+# gesture_stabilizer.py
+"""
+Multi-frame gesture voting
+
+One misclassified frame is enough for the per-frame rules to report a
+gesture, and a launch action then opens another browser or Spotify.
+GestureStabilizer keeps the last `window` labels (and their confidences) in
+a ring buffer with running per-label counts, so each update is O(1) in the
+window size: the evicted label is subtracted and the new one added.
+
+A gesture becomes stable when it wins the vote (most frames, or most summed
+confidence) with at least its `enter` frames in the window; a stable gesture
+ends after its `exit` consecutive frames of something else. When a gesture
+ends its own votes are dropped, so it has to collect its enter frames again
+before it fires a second time, but the frames the next gesture collected
+meanwhile are kept: switching straight from one gesture to another takes
+max(exit, enter) frames, not exit + enter. Actions fire on the stable label
+only. Runs of a gesture that never became stable are
+counted as suppressed flickers.
+
+    stabilizer = stabilizer_from_config()
+    stable = stabilizer.update(classify_gesture(fingers), confidence)
+    if stabilizer.entered == "PICKS UP!":
+        open_myutep()
+"""
+import config
+
+MODES = ("majority", "confidence")
+
+
+class GestureStabilizer:
+    """Ring-buffer vote over recent gesture labels with enter/exit hysteresis"""
+
+    def __init__(self, window=8, enter=None, exit=None, default_enter=3, default_exit=3,
+                 mode="majority", idle="NONE"):
+        """
+        Args:
+            window: Frames in the vote
+            enter: {label: frames in the window needed to become stable}
+            exit: {label: consecutive other frames that end a stable label}
+            default_enter / default_exit: For labels missing from enter / exit
+            mode: "majority" (frame counts) or "confidence" (summed confidences)
+            idle: The "no gesture" label
+        """
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+        self.window = window
+        self.enter = dict(enter or {})
+        self.exit = dict(exit or {})
+        self.default_enter = default_enter
+        self.default_exit = default_exit
+        self.mode = mode
+        self.idle = idle
+        self.frames = 0
+        self.transitions = 0
+        self.suppressed = 0
+        self.suppressed_by = {}
+        self.reset()
+
+    def reset(self):
+        """Forget the window and return to idle (flicker counts are kept)"""
+        self._clear()
+        self.stable = self.idle
+        self.entered = None
+        self.misses = 0
+        self._run_label = None
+        self._run_stable = False
+
+    def _clear(self):
+        self.labels = [None] * self.window
+        self.weights = [0.0] * self.window
+        self.pos = 0
+        self.counts = {}   # label -> frames in the window
+        self.scores = {}   # label -> summed confidence in the window
+
+    def winner(self):
+        """Label currently winning the vote (idle if the window is empty)"""
+        votes = self.counts if self.mode == "majority" else self.scores
+        if not votes:
+            return self.idle
+        return max(votes, key=votes.get)
+
+    def update(self, label, confidence=1.0):
+        """
+        Add one frame's label
+        Returns: the stable label (self.entered is set on the frame it changes)
+        """
+        self.frames += 1
+        pos = self.pos
+        old = self.labels[pos]
+        if old is not None:
+            n = self.counts[old] - 1
+            if n:
+                self.counts[old] = n
+                self.scores[old] -= self.weights[pos]
+            else:
+                del self.counts[old], self.scores[old]
+        self.labels[pos] = label
+        self.weights[pos] = confidence
+        self.counts[label] = self.counts.get(label, 0) + 1
+        self.scores[label] = self.scores.get(label, 0.0) + confidence
+        self.pos = (pos + 1) % self.window
+
+        self._track_run(label)
+        self.entered = None
+        self.misses = 0 if label == self.stable else self.misses + 1
+
+        if self.stable == self.idle or \
+                self.misses >= self.exit.get(self.stable, self.default_exit):
+            if self.stable != self.idle:
+                self._drop(self.stable)
+            winner = self.winner()
+            if winner != self.stable and \
+                    self.counts.get(winner, 0) >= self.enter.get(winner, self.default_enter):
+                self._set(winner)
+            elif self.stable != self.idle:
+                self._set(self.idle)
+        return self.stable
+
+    def _drop(self, label):
+        """Remove a label's votes from the window, keeping everything else"""
+        if label not in self.counts:
+            return
+        for i, old in enumerate(self.labels):
+            if old == label:
+                self.labels[i] = None
+                self.weights[i] = 0.0
+        del self.counts[label], self.scores[label]
+
+    def _set(self, label):
+        self.stable = label
+        self.transitions += 1
+        self.misses = 0
+        if label != self.idle:
+            self._clear()
+            self.entered = label
+        if label == self._run_label:
+            self._run_stable = True
+
+    def _track_run(self, label):
+        """Count runs of a non-idle label that ended without becoming stable"""
+        if label == self._run_label:
+            return
+        previous = self._run_label
+        if previous is not None and previous != self.idle and not self._run_stable:
+            self.suppressed += 1
+            self.suppressed_by[previous] = self.suppressed_by.get(previous, 0) + 1
+        self._run_label = label
+        self._run_stable = label == self.stable
+
+    def stats(self):
+        return {"frames": self.frames, "stable": self.stable, "transitions": self.transitions,
+                "suppressed": self.suppressed, "suppressed_by": dict(self.suppressed_by)}
+
+
+def stabilizer_from_config():
+    """A GestureStabilizer with the GESTURE_VOTE_* settings from config.py"""
+    return GestureStabilizer(window=config.GESTURE_VOTE_WINDOW,
+                             enter=config.GESTURE_ENTER_FRAMES,
+                             exit=config.GESTURE_EXIT_FRAMES,
+                             default_enter=config.GESTURE_DEFAULT_ENTER,
+                             default_exit=config.GESTURE_DEFAULT_EXIT,
+                             mode=config.GESTURE_VOTE_MODE)
+
+
+def format_stats(stabilizer):
+    """One-line summary for exit reports"""
+    s = stabilizer.stats()
+    detail = ", ".join(f"{label}: {n}" for label, n in sorted(s["suppressed_by"].items()))
+    return (f"Gesture voting: {s['suppressed']} flickers suppressed"
+            + (f" ({detail})" if detail else "") + f", {s['transitions']} transitions")
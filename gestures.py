@@ -2,6 +2,8 @@
 """
 Hand gesture recognition functions
 """
+import math
+
 
 def fingers_up(lmList):
     """Detect which fingers are up based on hand landmarks"""
@@ -37,12 +39,31 @@ def is_rock_roll(fingers):
     return fingers == [0, 1, 0, 0, 1]
 
 
+# Labels shown by main.py, in a fixed order so they can be stored as codes
+GESTURE_LABELS = ["NONE", "PICKS UP!", "ROCK ON", "VOLUME UP", "VOLUME DOWN"]
+
+
+def classify_gesture(fingers):
+    """
+    Map finger states to the gesture label used by main.py
+    Returns: one of GESTURE_LABELS
+    """
+    if is_hang_loose(fingers):
+        return "PICKS UP!"
+    if is_rock_roll(fingers):
+        return "ROCK ON"
+    if is_open_palm(fingers):
+        return "VOLUME UP"
+    if is_fist(fingers):
+        return "VOLUME DOWN"
+    return "NONE"
+
+
 def detect_pinch(lmList, thumb_id=4, index_id=8):
     """
     Calculate distance between thumb and index finger
     Returns: distance in pixels
     """
-    import math
     x1, y1 = lmList[thumb_id][1], lmList[thumb_id][2]
     x2, y2 = lmList[index_id][1], lmList[index_id][2]
     return math.hypot(x2 - x1, y2 - y1), (x1, y1), (x2, y2)
\ No newline at end of file
@@ -0,0 +1,166 @@
+# hand_tracker.py
+"""
+Persistent hand identities across frames
+
+MediaPipe can reorder results.multi_hand_landmarks between frames, so the
+list index is not a stable hand identity. HandTracker matches each
+detection to an existing track by wrist and palm-centroid distance, using
+an optimal assignment on the (tiny) cost matrix with gating and track aging.
+Each track owns its per-hand state (smoother, drag flag, cooldowns, ...).
+"""
+from itertools import count
+
+import numpy as np
+
+from landmarks import WRIST, PALM_IDS
+
+
+class Track:
+    """One tracked hand"""
+
+    def __init__(self, track_id, points, anchor, state):
+        self.id = track_id
+        self.points = points
+        self.anchor = anchor  # wrist and palm centroid, cached for matching
+        self.state = state
+        self.hits = 1      # frames this track was matched
+        self.missed = 0    # consecutive frames without a match
+
+    def __repr__(self):
+        return f"Track(id={self.id}, hits={self.hits}, missed={self.missed})"
+
+
+def _anchors(hands):
+    """Wrist and palm centroid of each hand: array (n, 2, 2)"""
+    pts = np.asarray(hands, dtype=np.float32)
+    anchors = np.empty((len(pts), 2, 2), dtype=np.float32)
+    anchors[:, 0] = pts[:, WRIST]
+    anchors[:, 1] = pts[:, PALM_IDS].mean(axis=1)
+    return anchors
+
+
+def assign(cost, gate):
+    """
+    Optimal assignment of detections (rows) to tracks (columns)
+    A detection may also stay unmatched at cost `gate`, so pairs costing
+    more than the gate are never matched. Branch and bound over each
+    detection's in-gate tracks (cheapest first) plus one "new track"
+    choice. Exact, and since real frames have few in-gate pairs it visits a
+    handful of nodes (about 0.03 ms for 4 hands and 9 tracks).
+
+    Returns: list with a track column or None for each detection
+    """
+    n, m = cost.shape
+    if n == 0:
+        return []
+    if m == 0:
+        return [None] * n
+    options = [sorted((c, j) for j, c in enumerate(row) if c < gate) for row in cost.tolist()]
+    best = [None] * n
+    best_cost = [gate * n]  # every detection starting a new track
+    current = [None] * n
+    used = [False] * m
+
+    def search(i, total):
+        if total >= best_cost[0]:
+            return
+        if i == n:
+            best_cost[0] = total
+            best[:] = current
+            return
+        for c, j in options[i]:
+            if not used[j]:
+                used[j] = True
+                current[i] = j
+                search(i + 1, total + c)
+                used[j] = False
+        current[i] = None
+        search(i + 1, total + gate)
+
+    search(0, 0.0)
+    return best
+
+
+class HandTracker:
+    """Assign persistent IDs to hands across frames"""
+
+    def __init__(self, gate=0.25, max_age=5, state_factory=dict, on_remove=None,
+                 max_tracks=8):
+        """
+        Args:
+            gate: Max match distance as a fraction of the frame diagonal
+            max_age: Frames a track survives without a match
+            state_factory: Called to create each new track's state
+            on_remove: Optional callback(track) when a track expires
+            max_tracks: Most live tracks; beyond it the unmatched tracks missing
+                        longest are dropped early (None = no limit)
+        """
+        self.gate = gate
+        self.max_age = max_age
+        self.max_tracks = max_tracks
+        self.state_factory = state_factory
+        self.on_remove = on_remove
+        self.tracks = []
+        self._ids = count()
+
+    def update(self, hands, frame_size):
+        """
+        Match this frame's detections to tracks
+        Args:
+            hands: Sequence of (21, 2) pixel landmark arrays
+            frame_size: (width, height) used to normalize distances
+        Returns: list of Track, one per detection, in detection order
+        """
+        det = _anchors(hands) if len(hands) else np.empty((0, 2, 2), dtype=np.float32)
+        if len(hands) and self.tracks:
+            trk = np.stack([t.anchor for t in self.tracks])
+            # Mean of wrist and palm centroid distances, normalized by the diagonal
+            diff = det[:, None] - trk[None, :]
+            cost = np.sqrt((diff * diff).sum(axis=-1)).mean(axis=-1)
+            cost /= float(np.hypot(*frame_size))
+        else:
+            cost = np.zeros((len(hands), len(self.tracks)), dtype=np.float32)
+
+        matches = assign(cost, self.gate)
+        result = []
+        matched = set()
+        for points, anchor, j in zip(hands, det, matches):
+            if j is None:
+                track = Track(next(self._ids), points, anchor, self.state_factory())
+                self.tracks.append(track)
+            else:
+                track = self.tracks[j]
+                track.points = points
+                track.anchor = anchor
+                track.hits += 1
+                track.missed = 0
+            matched.add(track.id)
+            result.append(track)
+
+        alive = []
+        for track in self.tracks:
+            if track.id not in matched:
+                track.missed += 1
+                if track.missed > self.max_age:
+                    if self.on_remove is not None:
+                        self.on_remove(track)
+                    continue
+            alive.append(track)
+        if self.max_tracks is not None and len(alive) > self.max_tracks:
+            # Flickering detections leave many stale tracks; keep the matching cheap
+            spare = sorted((t for t in alive if t.id not in matched),
+                           key=lambda t: (-t.missed, t.id))
+            dropped = {t.id for t in spare[:len(alive) - self.max_tracks]}
+            for track in spare[:len(dropped)]:
+                if self.on_remove is not None:
+                    self.on_remove(track)
+            alive = [t for t in alive if t.id not in dropped]
+        self.tracks = alive
+        return result
+
+    def get(self, track_id):
+        """Return the live track with this id, or None"""
+        for track in self.tracks:
+            if track.id == track_id:
+                return track
+        return None
@@ -4,6 +4,14 @@ import time
 import subprocess
 import platform
 
+import config
+from clock import FpsCounter
+from console_log import console
+from capture_supervisor import supervised_source
+from gesture_stabilizer import stabilizer_from_config, format_stats
+from landmarks import landmarks_to_array
+from renderer import draw_hand
+
 class handDetector():
     def __init__(self, mode=False, maxHands=2, detectionCon=0.5, trackCon=0.5):
         """
@@ -36,6 +44,11 @@ class handDetector():
         self.last_gesture_time = 0
         self.cooldown = 3  # 3 seconds between detections
         
+        # Hooks for the latency harness: time source and an optional
+        # launcher that replaces the real browser launch
+        self.clock = time.time
+        self.launcher = None
+        
     def findHands(self, img, draw=True):
         """
         Detect hands in the image and optionally draw landmarks
@@ -52,11 +65,10 @@ class handDetector():
         self.results = self.hands.process(imgRGB)
         
         # Draw landmarks if hands are detected
-        if self.results.multi_hand_landmarks:
+        if self.results.multi_hand_landmarks and draw:
+            h, w, c = img.shape
             for handLms in self.results.multi_hand_landmarks:
-                if draw:
-                    self.mpDraw.draw_landmarks(
-                        img, handLms, self.mpHands.HAND_CONNECTIONS)
+                draw_hand(img, landmarks_to_array(handLms, w, h))
         return img
     
     def findPosition(self, img, handNo=0, draw=True):
@@ -151,7 +163,7 @@ class handDetector():
         Returns:
             True if successfully opened, False otherwise
         """
-        current_time = time.time()
+        current_time = self.clock()
         
         # Check cooldown to avoid multiple openings
         if current_time - self.last_gesture_time < self.cooldown:
@@ -159,38 +171,67 @@ class handDetector():
         
         self.last_gesture_time = current_time
         
+        if self.launcher is not None:
+            self.launcher()
+            return True
+        
         try:
             system = platform.system()
             
             if system == "Windows":
                 # On Windows, try to open from Microsoft Store or open browser
                 subprocess.Popen(['start', 'https://my.utep.edu'], shell=True)
-                print("✓ Opening myUTEP on Windows")
+                console.info("✓ Opening myUTEP on Windows")
                 
             elif system == "Darwin":  # macOS
                 # On macOS, open browser with URL
                 subprocess.Popen(['open', 'https://my.utep.edu'])
-                print("✓ Opening myUTEP on macOS")
+                console.info("✓ Opening myUTEP on macOS")
                 
             else:  # Linux
                 # On Linux, use xdg-open
                 subprocess.Popen(['xdg-open', 'https://my.utep.edu'])
-                print("✓ Opening myUTEP on Linux")
+                console.info("✓ Opening myUTEP on Linux")
             
             return True
             
         except Exception as e:
-            print(f"✗ Error opening myUTEP: {e}")
+            console.error("✗ Error opening myUTEP: %s", e, key="myutep_error")
             return False
 
+def check_gesture(detector, fingers, gesture_detected, stabilizer=None):
+    """
+    Open myUTEP on the rising edge of the hang loose gesture
+    
+    Args:
+        detector: handDetector instance
+        fingers: Finger states from detector.fingersUp
+        gesture_detected: Whether the gesture was already held last frame
+        stabilizer: Optional GestureStabilizer; the gesture then has to hold
+                    for a few frames, so single-frame flickers don't relaunch
+        
+    Returns:
+        (new gesture_detected flag, True if this frame is a new detection)
+    """
+    held = detector.isHangLooseSign(fingers)
+    if stabilizer is not None:
+        held = stabilizer.update("PICKS UP!" if held else "NONE") == "PICKS UP!"
+    if held:
+        if not gesture_detected:
+            detector.openMyUTEP()
+            return True, True
+        return True, False
+    return False, False
+
 def main():
     """
     Main function to run the hand gesture detector
     Continuously captures video and detects the hang gesture
     """
-    pTime = 0  # Previous time for FPS calculation
-    cap = cv2.VideoCapture(0)  # Initialize webcam
+    cap = supervised_source(config.FRAME_SOURCE)  # Initialize webcam (reconnects with backoff if it drops out)
     detector = handDetector()  # Create detector instance
+    detector.clock = cap.clock  # Cooldowns follow the frame clock
+    fps_counter = FpsCounter(cap.clock)  # FPS from the same clock
     
     # Print instructions
     print("=" * 50)
@@ -205,12 +246,17 @@ def main():
     print("=" * 50)
     
     gesture_detected = False  # Flag to track gesture state
+    stabilizer = stabilizer_from_config()  # Multi-frame vote against flicker
     
     while True:
         # Read frame from webcam
         success, img = cap.read()
         if not success:
-            break
+            if cap.finished:
+                break
+            if cv2.waitKey(1) & 0xFF == 27: # keep the window responsive; ESC still exits
+                break
+            continue  # camera missing: the supervisor waits before retrying
         
         # Flip image horizontally for mirror effect
         img = cv2.flip(img, 1)
@@ -224,17 +270,13 @@ def main():
             # Get finger states
             fingers = detector.fingersUp(lmList)
             
-            # Check for hang loose gesture
-            if detector.isHangLooseSign(fingers):
-                if not gesture_detected:
-                    # Display detection message
-                    cv2.putText(img, "HAND DETECTED! 🤙", (50, 100),
-                               cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 3)
-                    # Open myUTEP
-                    detector.openMyUTEP()
-                    gesture_detected = True
-            else:
-                gesture_detected = False
+            # Check for hang loose gesture (opens myUTEP on a new detection)
+            gesture_detected, triggered = check_gesture(detector, fingers, gesture_detected,
+                                                        stabilizer)
+            if triggered:
+                # Display detection message
+                cv2.putText(img, "HAND DETECTED! 🤙", (50, 100),
+                           cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 3)
             
             # Display finger status on screen
             finger_names = ["Thumb", "Index", "Middle", "Ring", "Pinky"]
@@ -245,9 +287,7 @@ def main():
                            (10, 150 + i*30), cv2.FONT_HERSHEY_PLAIN, 1.5, color, 2)
         
         # Calculate and display FPS
-        cTime = time.time()
-        fps = 1 / (cTime - pTime) if (cTime - pTime) > 0 else 0
-        pTime = cTime
+        fps = fps_counter.tick()
         
         cv2.putText(img, f'FPS: {int(fps)}', (10, 50),
                    cv2.FONT_HERSHEY_PLAIN, 2, (255, 0, 255), 2)
@@ -266,6 +306,7 @@ def main():
     # Clean up
     cap.release()
     cv2.destroyAllWindows()
+    print(format_stats(stabilizer))
     print("\nProgram finished!")
 
 # Run the main function if script is executed directly
@@ -0,0 +1,244 @@
+# inertial_scroll.py
+"""
+Inertial scrolling from hand motion
+
+Hold up two fingers (index and middle) and move the hand up or down to
+scroll; flick and drop the pose to let the page coast. InertialScroller
+estimates the vertical hand velocity from the last few frames (a least
+squares slope over their capture times, in palm sizes per second so it
+doesn't depend on the distance to the camera) and hands it to a timer
+thread. The thread runs at SCROLL_EVENT_HZ, independent of the camera:
+    - while the pose is held it eases towards the hand velocity
+    - once released it keeps the momentum and decays exponentially
+    - every tick it queues velocity * dt wheel clicks and flushes them,
+      so events are small, evenly spaced, and never more than
+      SCROLL_EVENT_HZ per second (fractions carry over, see input_backend.py)
+    - ticks are skipped while a modifier is held (the zoom gesture holds
+      ctrl), so they don't turn into ctrl+wheel
+
+Headless check of event rate and smoothness with a recording backend:
+    python inertial_scroll.py --seconds 3
+"""
+import argparse
+import math
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+import config
+from features import HandFeatures
+from landmarks import PALM_IDS
+from scheduling import apply_stage
+
+
+class InertialScroller:
+    """Hand velocity in, momentum scrolling out from a timer thread"""
+
+    def __init__(self, inputs, fingers=None, gain=None, event_hz=None, decay=None,
+                 response=None, deadzone=None, min_speed=None, history=None):
+        """
+        Args:
+            inputs: InputBackend the wheel events are sent through
+            fingers: Finger states of the scroll pose ([thumb, index, middle, ring, pinky])
+            gain: Wheel clicks per second for one palm size per second of hand motion
+            event_hz: Timer rate, the most scroll events per second
+            decay: Momentum time constant in seconds after the pose is released
+            response: Time constant in seconds of easing towards the hand velocity
+            deadzone: Hand speeds below this (palm sizes/s) don't scroll
+            min_speed: Momentum below this (clicks/s) stops
+            history: Frames in the velocity estimate
+        """
+        self.inputs = inputs
+        self.fingers = list(config.SCROLL_FINGERS if fingers is None else fingers)
+        self.gain = config.SCROLL_GAIN if gain is None else gain
+        self.interval = 1.0 / (config.SCROLL_EVENT_HZ if event_hz is None else event_hz)
+        self.decay = config.SCROLL_DECAY if decay is None else decay
+        self.response = config.SCROLL_RESPONSE if response is None else response
+        self.deadzone = config.SCROLL_DEADZONE if deadzone is None else deadzone
+        self.min_speed = config.SCROLL_MIN_SPEED if min_speed is None else min_speed
+        self.samples = deque(maxlen=config.SCROLL_HISTORY if history is None else history)
+
+        self.lock = threading.Lock()
+        self.held = False
+        self.target = 0.0    # clicks/s wanted by the hand
+        self.velocity = 0.0  # clicks/s being sent
+        self.ticks = 0
+        self.moving = 0    # ticks that queued wheel motion
+        self.held_off = 0  # ticks skipped while a modifier key was down
+        self.clicks = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def update(self, hand, frame_time):
+        """
+        Feed one camera frame
+        Args:
+            hand: (21, 2) landmarks or HandFeatures of the controlling hand, or None
+            frame_time: Capture time of the frame
+        Returns: True while the scroll pose is held
+        """
+        if hand is not None and not isinstance(hand, HandFeatures):
+            hand = HandFeatures(hand)
+        if hand is None or hand.fingers != self.fingers:
+            with self.lock:
+                self.held = False
+            self.samples.clear()
+            return False
+
+        y = float(hand.points[PALM_IDS, 1].mean()) / hand.palm_size
+        self.samples.append((frame_time, y))
+        speed = self.hand_velocity()
+        if abs(speed) < self.deadzone:
+            speed = 0.0
+        with self.lock:
+            self.held = True
+            self.target = -speed * self.gain  # image y points down; hand up scrolls up
+        return True
+
+    def hand_velocity(self):
+        """Least squares slope of the recent palm heights, in palm sizes per second"""
+        n = len(self.samples)
+        if n < 2:
+            return 0.0
+        t0 = self.samples[0][0]
+        st = sy = stt = sty = 0.0
+        for t, y in self.samples:
+            t -= t0
+            st += t
+            sy += y
+            stt += t * t
+            sty += t * y
+        den = n * stt - st * st
+        return (n * sty - st * sy) / den if den > 1e-12 else 0.0
+
+    def tick(self, dt):
+        """Advance the momentum by dt seconds and send the resulting wheel motion"""
+        with self.lock:
+            v = self.velocity
+            if self.held:
+                v += (self.target - v) * (1.0 - math.exp(-dt / self.response))
+            else:
+                v *= math.exp(-dt / self.decay)
+                if abs(v) < self.min_speed:
+                    v = 0.0
+            self.velocity = v
+        self.ticks += 1
+        if not v:
+            return
+        with self.inputs.lock:
+            # Wheel events with ctrl held (a zoom in progress) would zoom: hold off
+            if self.inputs.modifier_held():
+                self.held_off += 1
+                return
+            self.inputs.scroll(v * dt)
+            self.inputs.flush_scroll()
+        self.moving += 1
+        self.clicks += v * dt
+
+    def start(self):
+        """Run tick() on a daemon thread every 1 / event_hz seconds"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="inertial-scroll",
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        apply_stage("cursor")
+        last = time.perf_counter()
+        next_tick = last + self.interval
+        while not self._stop.wait(max(next_tick - time.perf_counter(), 0.0)):
+            now = time.perf_counter()
+            self.tick(now - last)
+            last = now
+            next_tick += self.interval
+            if next_tick < now:  # fell behind: don't burst to catch up
+                next_tick = now + self.interval
+
+    def stop(self):
+        """Stop the thread and any momentum"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self.lock:
+            self.held = False
+            self.velocity = self.target = 0.0
+
+    def stats(self):
+        return {"ticks": self.ticks, "moving": self.moving, "held_off": self.held_off,
+                "clicks": self.clicks, "velocity": self.velocity}
+
+
+def flick_frames(seconds, fps=30.0):
+    """
+    Synthetic scroll session: slow drags up and down, then flicks that are released
+    Yields: (frame time, (21, 2) landmarks or None)
+    """
+    from synthetic_landmarks import pose_points
+    two_fingers = [0, 1, 1, 0, 0]
+    start = time.perf_counter()
+    for i in range(int(seconds * fps)):
+        t = i / fps
+        phase = t % 2.0
+        if phase < 0.8:    # drag: +-1.5 palm sizes/s
+            y = 300 + 90 * math.sin(phase * math.pi / 0.8)
+            hand = pose_points(two_fingers, center=(320, y))
+        elif phase < 1.0:  # flick upwards
+            hand = pose_points(two_fingers, center=(320, 300 - 900 * (phase - 0.8)))
+        else:              # released: momentum only
+            hand = None
+        yield start + t, hand
+
+
+def check(seconds=3.0, fps=30.0, event_hz=None, resolution=120):
+    """
+    Run the scroller in real time on flick_frames() with a recording backend
+    Returns: (scroller, [(time, wheel units)] of the sent events)
+    """
+    from input_backend import RecordingBackend
+    inputs = RecordingBackend(clock=time.perf_counter, scroll_resolution=resolution)
+    scroller = InertialScroller(inputs, event_hz=event_hz).start()
+    for frame_time, hand in flick_frames(seconds, fps):
+        time.sleep(max(frame_time - time.perf_counter(), 0.0))
+        scroller.update(hand, frame_time)
+    scroller.stop()
+    return scroller, [(t, args[0]) for t, kind, args in inputs.events if kind == "scroll"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless inertial scrolling check")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--fps", type=float, default=30.0, help="simulated camera rate")
+    parser.add_argument("--event-hz", type=float, default=config.SCROLL_EVENT_HZ)
+    parser.add_argument("--resolution", type=int, default=120,
+                        help="wheel units per click of the fake backend (1 = whole clicks)")
+    args = parser.parse_args()
+
+    scroller, events = check(args.seconds, args.fps, args.event_hz, args.resolution)
+    if len(events) < 2:
+        print("No scroll events")
+        return
+    times = np.array([t for t, _ in events])
+    units = np.array([u for _, u in events], dtype=float)
+    gaps = np.diff(times) * 1000
+    per_second = np.histogram(times, bins=np.arange(times[0], times[-1] + 1.0, 1.0))[0]
+    # Smoothness: how much the scroll speed changes from one event to the next
+    speed = units[1:] / np.maximum(gaps, 1e-3)
+    jerk = np.abs(np.diff(speed)) / max(float(np.abs(speed).mean()), 1e-9)
+    s = scroller.stats()
+    print(f"{len(events)} events in {times[-1] - times[0]:.2f}s "
+          f"(cap {args.event_hz:.0f}/s, busiest second {per_second.max()})")
+    print(f"Interval: p50 {np.percentile(gaps, 50):.2f} ms, p95 {np.percentile(gaps, 95):.2f} ms, "
+          f"max {gaps.max():.2f} ms")
+    print(f"Step size: median {np.median(np.abs(units)) / args.resolution:.3f} clicks, "
+          f"max {np.abs(units).max() / args.resolution:.3f} clicks")
+    print(f"Speed change between events: median {np.median(jerk) * 100:.1f}% of the mean speed")
+    print(f"Wheel clicks sent {units.sum() / args.resolution:+.2f} of {s['clicks']:+.2f} queued")
+
+
+if __name__ == "__main__":
+    main()
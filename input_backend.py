@@ -0,0 +1,499 @@
+# input_backend.py
+"""
+Pointer input backends
+
+pyautogui sleeps PAUSE (0.1s) after every call and goes through several
+layers of Python per event. The backends here send events directly:
+    XTestBackend    X11 XTest extension via python-xlib
+    UInputBackend   Linux /dev/uinput virtual devices via python-evdev
+    PyAutoGUIBackend  fallback, with the per-call pause disabled
+    RecordingBackend  records events instead of sending them (tests, harness)
+
+Moves are batched: move_to() keeps only the latest target and move_rel()
+accumulates deltas until flush() (called once per frame) or the next button
+event, so a frame sends at most one motion event. scroll() accumulates
+fractional wheel clicks the same way; flush() sends the whole wheel units
+(clicks, or 1/120 clicks on backends with high-resolution scrolling) and
+keeps the remainder for the next one, so no motion is lost; clear_scroll()
+drops a remainder that shouldn't carry over (the end of a ctrl+wheel zoom).
+Sending is serialized by a lock, so a timer thread (inertial_scroll.py) can
+scroll while the frame loop moves the pointer. Every backend records
+each event's latency, from the first request to the end of its flush, for
+latency_report().
+
+    backend = get_backend("auto")   # xtest -> uinput -> pyautogui
+"""
+import argparse
+import os
+import platform
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+MODIFIERS = ("ctrl", "shift", "alt")
+
+
+class InputBackend:
+    """Base class: batching and latency bookkeeping around _send_* methods"""
+
+    name = "base"
+    scroll_resolution = 1  # wheel units per click sent by _send_scroll
+
+    def __init__(self, history=1000):
+        self.lock = threading.RLock()
+        self.latencies = {}
+        self.history = history
+        self._target = None     # pending absolute move
+        self._rel = [0, 0]      # pending relative move
+        self._move_since = None
+        self._pos = None
+        self._scroll = 0.0      # pending wheel clicks, fractions carried over
+        self._scroll_since = None
+        self.held_keys = set()  # keys pressed with key_down() and not yet released
+
+    def _record(self, event, since):
+        if event not in self.latencies:
+            self.latencies[event] = deque(maxlen=self.history)
+        self.latencies[event].append(time.perf_counter() - since)
+
+    def move_to(self, x, y):
+        """Queue an absolute move; only the last one before flush() is sent"""
+        with self.lock:
+            if self._move_since is None:
+                self._move_since = time.perf_counter()
+            self._target = (int(round(x)), int(round(y)))
+            self._rel = [0, 0]
+
+    def move_rel(self, dx, dy):
+        """Queue a relative move; deltas accumulate until flush()"""
+        with self.lock:
+            if self._move_since is None:
+                self._move_since = time.perf_counter()
+            if self._target is not None:
+                self._target = (self._target[0] + int(dx), self._target[1] + int(dy))
+            else:
+                self._rel[0] += int(dx)
+                self._rel[1] += int(dy)
+
+    def scroll(self, clicks):
+        """Queue vertical wheel clicks (positive = up); fractions add up across flushes"""
+        with self.lock:
+            if self._scroll_since is None:
+                self._scroll_since = time.perf_counter()
+            self._scroll += clicks
+
+    def flush_scroll(self):
+        """Send the whole wheel units queued by scroll(), keeping the remainder"""
+        with self.lock:
+            if self._scroll_since is None:
+                return
+            units = int(self._scroll * self.scroll_resolution)  # towards zero
+            if units:
+                self._send_scroll(units)
+                self._scroll -= units / self.scroll_resolution
+                self._flush_display()
+                self._record("scroll", self._scroll_since)
+                self._scroll_since = None if abs(self._scroll) < 1e-9 else time.perf_counter()
+
+    def clear_scroll(self):
+        """Drop the fraction of a wheel unit left over by flush_scroll()"""
+        with self.lock:
+            self._scroll = 0.0
+            self._scroll_since = None
+
+    def modifier_held(self):
+        """True while ctrl, shift or alt is held down with key_down()"""
+        with self.lock:
+            return any(key in self.held_keys for key in MODIFIERS)
+
+    def flush(self):
+        """Send the batched motion and wheel clicks (one event each at most)"""
+        with self.lock:
+            self.flush_scroll()
+            since = self._move_since
+            if since is None:
+                return
+            if self._target is not None:
+                self._send_move(*self._target)
+                self._pos = self._target
+                self._flush_display()
+                self._record("move_to", since)
+            elif self._rel != [0, 0]:
+                self._send_rel(*self._rel)
+                self._flush_display()
+                self._record("move_rel", since)
+            self._target = None
+            self._rel = [0, 0]
+            self._move_since = None
+
+    def mouse_down(self, button="left"):
+        since = time.perf_counter()
+        with self.lock:
+            self.flush()
+            self._send_button(button, True)
+            self._flush_display()
+            self._record("mouse_down", since)
+
+    def mouse_up(self, button="left"):
+        since = time.perf_counter()
+        with self.lock:
+            self.flush()
+            self._send_button(button, False)
+            self._flush_display()
+            self._record("mouse_up", since)
+
+    def click(self, button="left"):
+        since = time.perf_counter()
+        with self.lock:
+            self.flush()
+            self._send_button(button, True)
+            self._send_button(button, False)
+            self._flush_display()
+            self._record("click", since)
+
+    def key_down(self, key):
+        """Press a key: "ctrl", "shift", "alt", "=", "-" or a letter"""
+        since = time.perf_counter()
+        with self.lock:
+            self.flush()
+            self._send_key(key, True)
+            self.held_keys.add(key)
+            self._flush_display()
+            self._record("key", since)
+
+    def key_up(self, key):
+        since = time.perf_counter()
+        with self.lock:
+            self._send_key(key, False)
+            self.held_keys.discard(key)
+            self._flush_display()
+            self._record("key", since)
+
+    def hotkey(self, *keys):
+        """Press keys in order and release them in reverse, e.g. hotkey("ctrl", "=")"""
+        since = time.perf_counter()
+        with self.lock:
+            self.flush()
+            for key in keys:
+                self._send_key(key, True)
+            for key in reversed(keys):
+                self._send_key(key, False)
+            self._flush_display()
+            self._record("hotkey", since)
+
+    def size(self):
+        raise NotImplementedError
+
+    def close(self):
+        self.flush()
+
+    def latency_report(self):
+        """{event: (count, p50 ms, p95 ms, max ms)} over the recent history"""
+        report = {}
+        for event, samples in self.latencies.items():
+            ms = np.array(samples) * 1000
+            report[event] = (len(ms), float(np.percentile(ms, 50)),
+                             float(np.percentile(ms, 95)), float(ms.max()))
+        return report
+
+    def _send_move(self, x, y):
+        raise NotImplementedError
+
+    def _send_rel(self, dx, dy):
+        raise NotImplementedError
+
+    def _send_button(self, button, down):
+        raise NotImplementedError
+
+    def _send_scroll(self, units):
+        """Send `units` wheel units (scroll_resolution per click, positive = up)"""
+        raise NotImplementedError
+
+    def _send_key(self, key, down):
+        raise NotImplementedError
+
+    def _flush_display(self):
+        pass
+
+
+class PyAutoGUIBackend(InputBackend):
+    """pyautogui without its per-call PAUSE sleep"""
+
+    name = "pyautogui"
+
+    def __init__(self, **kwargs):
+        import pyautogui
+        super().__init__(**kwargs)
+        self.pyautogui = pyautogui
+
+    def _send_move(self, x, y):
+        self.pyautogui.moveTo(x, y, duration=0, _pause=False)
+
+    def _send_rel(self, dx, dy):
+        self.pyautogui.moveRel(dx, dy, duration=0, _pause=False)
+
+    def _send_button(self, button, down):
+        if down:
+            self.pyautogui.mouseDown(button=button, _pause=False)
+        else:
+            self.pyautogui.mouseUp(button=button, _pause=False)
+
+    def _send_scroll(self, clicks):
+        self.pyautogui.scroll(clicks, _pause=False)
+
+    def _send_key(self, key, down):
+        if down:
+            self.pyautogui.keyDown(key, _pause=False)
+        else:
+            self.pyautogui.keyUp(key, _pause=False)
+
+    def size(self):
+        return tuple(self.pyautogui.size())
+
+
+class XTestBackend(InputBackend):
+    """Direct X11 events through the XTest extension (needs python-xlib)"""
+
+    name = "xtest"
+    BUTTONS = {"left": 1, "middle": 2, "right": 3}
+    WHEEL_UP, WHEEL_DOWN = 4, 5
+    KEYSYMS = {"ctrl": "Control_L", "shift": "Shift_L", "alt": "Alt_L", "=": "equal",
+               "-": "minus", "+": "plus"}
+
+    def __init__(self, display=None, **kwargs):
+        from Xlib import X, XK, display as xdisplay
+        from Xlib.ext import xtest
+        super().__init__(**kwargs)
+        self.X = X
+        self.XK = XK
+        self.xtest = xtest
+        self._keycodes = {}
+        self.display = xdisplay.Display(display)
+        if not self.display.has_extension("XTEST"):
+            raise RuntimeError("X server has no XTEST extension")
+        screen = self.display.screen()
+        self._size = (screen.width_in_pixels, screen.height_in_pixels)
+
+    def _send_move(self, x, y):
+        self.xtest.fake_input(self.display, self.X.MotionNotify, x=x, y=y)
+
+    def _send_rel(self, dx, dy):
+        self.xtest.fake_input(self.display, self.X.MotionNotify, detail=True, x=dx, y=dy)
+
+    def _send_button(self, button, down):
+        event = self.X.ButtonPress if down else self.X.ButtonRelease
+        self.xtest.fake_input(self.display, event, self.BUTTONS[button])
+
+    def _send_scroll(self, clicks):
+        button = self.WHEEL_UP if clicks > 0 else self.WHEEL_DOWN
+        for _ in range(abs(clicks)):
+            self.xtest.fake_input(self.display, self.X.ButtonPress, button)
+            self.xtest.fake_input(self.display, self.X.ButtonRelease, button)
+
+    def _send_key(self, key, down):
+        code = self._keycodes.get(key)
+        if code is None:
+            keysym = self.XK.string_to_keysym(self.KEYSYMS.get(key, key))
+            code = self._keycodes[key] = self.display.keysym_to_keycode(keysym)
+        event = self.X.KeyPress if down else self.X.KeyRelease
+        self.xtest.fake_input(self.display, event, code)
+
+    def _flush_display(self):
+        # flush() only writes the request; sync() would add a server round trip
+        self.display.flush()
+
+    def size(self):
+        return self._size
+
+    def close(self):
+        super().close()
+        self.display.close()
+
+
+class UInputBackend(InputBackend):
+    """
+    Linux virtual input devices (needs python-evdev and write access to /dev/uinput)
+    Works under X11, Wayland and the console. Absolute moves go through a
+    tablet-like device, relative moves through a plain mouse device.
+    """
+
+    name = "uinput"
+    scroll_resolution = 120  # REL_WHEEL_HI_RES units per click
+    BUTTONS = {"left": "BTN_LEFT", "middle": "BTN_MIDDLE", "right": "BTN_RIGHT"}
+    KEYS = {"ctrl": "KEY_LEFTCTRL", "shift": "KEY_LEFTSHIFT", "alt": "KEY_LEFTALT",
+            "=": "KEY_EQUAL", "-": "KEY_MINUS", "+": "KEY_KPPLUS"}
+
+    def __init__(self, screen_size=None, **kwargs):
+        from evdev import UInput, AbsInfo, ecodes
+        super().__init__(**kwargs)
+        self.e = ecodes
+        self.wheel_hi_res = getattr(ecodes, "REL_WHEEL_HI_RES", 0x0b)  # missing in older evdev
+        self._wheel = 0  # hi-res units not yet reported as a whole REL_WHEEL click
+        self._size = screen_size or _screen_size()
+        w, h = self._size
+        buttons = [ecodes.BTN_LEFT, ecodes.BTN_MIDDLE, ecodes.BTN_RIGHT]
+        self.abs_dev = UInput({
+            ecodes.EV_KEY: buttons,
+            ecodes.EV_ABS: [(ecodes.ABS_X, AbsInfo(0, 0, w - 1, 0, 0, 0)),
+                            (ecodes.ABS_Y, AbsInfo(0, 0, h - 1, 0, 0, 0))],
+        }, name="hand-gesture-pointer")
+        keys = [getattr(ecodes, name) for name in self.KEYS.values()]
+        keys += [getattr(ecodes, f"KEY_{c}") for c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ"]
+        self.rel_dev = UInput({
+            ecodes.EV_KEY: buttons + keys,
+            ecodes.EV_REL: [ecodes.REL_X, ecodes.REL_Y, ecodes.REL_WHEEL,
+                           self.wheel_hi_res],
+        }, name="hand-gesture-mouse")
+
+    def _send_move(self, x, y):
+        w, h = self._size
+        self.abs_dev.write(self.e.EV_ABS, self.e.ABS_X, min(max(x, 0), w - 1))
+        self.abs_dev.write(self.e.EV_ABS, self.e.ABS_Y, min(max(y, 0), h - 1))
+        self.abs_dev.syn()
+
+    def _send_rel(self, dx, dy):
+        self.rel_dev.write(self.e.EV_REL, self.e.REL_X, dx)
+        self.rel_dev.write(self.e.EV_REL, self.e.REL_Y, dy)
+        self.rel_dev.syn()
+
+    def _send_button(self, button, down):
+        code = getattr(self.e, self.BUTTONS[button])
+        self.abs_dev.write(self.e.EV_KEY, code, 1 if down else 0)
+        self.abs_dev.syn()
+
+    def _send_scroll(self, units):
+        # Hi-res units for smooth scrolling, plus the legacy click every 120 of
+        # them for clients that only read REL_WHEEL
+        self.rel_dev.write(self.e.EV_REL, self.wheel_hi_res, units)
+        self._wheel += units
+        clicks = int(self._wheel / self.scroll_resolution)
+        if clicks:
+            self.rel_dev.write(self.e.EV_REL, self.e.REL_WHEEL, clicks)
+            self._wheel -= clicks * self.scroll_resolution
+        self.rel_dev.syn()
+
+    def _send_key(self, key, down):
+        code = getattr(self.e, self.KEYS.get(key, f"KEY_{key.upper()}"))
+        self.rel_dev.write(self.e.EV_KEY, code, 1 if down else 0)
+        self.rel_dev.syn()
+
+    def size(self):
+        return self._size
+
+    def close(self):
+        super().close()
+        self.abs_dev.close()
+        self.rel_dev.close()
+
+
+class RecordingBackend(InputBackend):
+    """Records (time, event, args) instead of moving anything"""
+
+    name = "recording"
+
+    def __init__(self, clock=time.time, screen_size=(1920, 1080), scroll_resolution=1,
+                 **kwargs):
+        super().__init__(**kwargs)
+        self.clock = clock
+        self.scroll_resolution = scroll_resolution
+        self._size = screen_size
+        self.events = []
+
+    def _send_move(self, x, y):
+        self.events.append((self.clock(), "move_to", (x, y)))
+
+    def _send_rel(self, dx, dy):
+        self.events.append((self.clock(), "move_rel", (dx, dy)))
+
+    def _send_button(self, button, down):
+        self.events.append((self.clock(), "mouse_down" if down else "mouse_up", (button,)))
+
+    def _send_scroll(self, units):
+        self.events.append((self.clock(), "scroll", (units,)))
+
+    def _send_key(self, key, down):
+        self.events.append((self.clock(), "key_down" if down else "key_up", (key,)))
+
+    def size(self):
+        return self._size
+
+
+def _screen_size():
+    """Screen size from pyautogui if it can reach a display, else 1920x1080"""
+    try:
+        import pyautogui
+        return tuple(pyautogui.size())
+    except Exception:
+        return (1920, 1080)
+
+
+BACKENDS = {
+    "xtest": XTestBackend,
+    "uinput": UInputBackend,
+    "pyautogui": PyAutoGUIBackend,
+    "recording": RecordingBackend,
+}
+
+
+def get_backend(name="auto", **kwargs):
+    """
+    Create an input backend
+    Args:
+        name: "xtest", "uinput", "pyautogui", "recording" or "auto"
+              (auto tries xtest when DISPLAY is set, then uinput on Linux,
+              then pyautogui)
+    """
+    if name != "auto":
+        return BACKENDS[name](**kwargs)
+    candidates = []
+    if os.environ.get("DISPLAY"):
+        candidates.append("xtest")
+    if platform.system() == "Linux":
+        candidates.append("uinput")
+    for candidate in candidates:
+        try:
+            return BACKENDS[candidate](**kwargs)
+        except Exception:
+            continue
+    return PyAutoGUIBackend(**kwargs)
+
+
+_default = None
+
+
+def default_backend():
+    """The process-wide backend chosen by config.INPUT_BACKEND (created on first use)"""
+    global _default
+    if _default is None:
+        import config
+        _default = get_backend(config.INPUT_BACKEND)
+    return _default
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure input backend event latency")
+    parser.add_argument("--backend", default="auto", choices=["auto"] + sorted(BACKENDS))
+    parser.add_argument("--events", type=int, default=500)
+    args = parser.parse_args()
+
+    backend = get_backend(args.backend)
+    w, h = backend.size()
+    print(f"Backend: {backend.name}, screen {w}x{h}")
+    for i in range(args.events):
+        angle = i * 0.05
+        backend.move_to(w / 2 + 200 * np.cos(angle), h / 2 + 200 * np.sin(angle))
+        backend.flush()
+    for i in range(args.events):
+        backend.move_rel(3, 0)
+        backend.move_rel(-1, 1)  # batched with the previous move
+        backend.flush()
+    backend.close()
+    print(f"{'event':<10} {'n':>6} {'p50':>9} {'p95':>9} {'max':>9}")
+    for event, (n, p50, p95, worst) in backend.latency_report().items():
+        print(f"{event:<10} {n:>6} {p50:8.3f}ms {p95:8.3f}ms {worst:8.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
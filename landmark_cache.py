@@ -0,0 +1,376 @@
+# landmark_cache.py
+"""
+On-disk landmark cache for static-image and dataset runs
+
+Tuning gesture rules over an image set reruns MediaPipe on the same images
+every time. Here each image is keyed by a hash of its file contents plus the
+detector settings (model complexity, detection confidence, max hands), and
+the hands found in it are stored as a fixed-size record in one
+memory-mapped file:
+
+    header | record 0 | record 1 | ...
+    record = key, last use, image size, hand count, labels, scores,
+             float16 normalized (x, y) landmarks per hand
+
+The file holds at most max_bytes; when it is full the least recently used
+records are evicted (a few percent at a time, so eviction stays cheap).
+Lookups only hash the file; misses are decoded and detected in parallel
+worker processes, each with its own static-image Hands graph. Only the
+calling process writes to the store.
+
+    cache = LandmarkCache("landmark_cache.bin", max_bytes=256 << 20)
+    results = cache.detect_files(paths, DetectorSettings.from_config(), workers=8)
+
+Re-evaluate the gesture rules over a directory (the first run fills the cache):
+    python landmark_cache.py dataset/ --workers 8
+"""
+import argparse
+import hashlib
+import os
+import time
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import cv2
+import numpy as np
+
+import config
+from console_log import console
+from detector_pool import HandResult, to_hand_result
+from frame_source import IMAGE_EXTENSIONS
+from landmarks import NUM_LANDMARKS
+
+MAGIC = b"LMCACHE1"
+HEADER = np.dtype({"names": ["magic", "max_hands", "capacity", "clock"],
+                   "formats": ["S8", "<u4", "<u8", "<u8"],
+                   "offsets": [0, 8, 16, 24], "itemsize": 64})
+LABELS = ["", "Left", "Right"]
+EVICT_FRACTION = 0.05
+
+
+def record_dtype(max_hands):
+    """Layout of one cached image with room for max_hands hands"""
+    return np.dtype([
+        ("key", "u1", (16,)),
+        ("used", "<u8"),          # LRU clock of the last access, 0 = empty slot
+        ("size", "<u2", (2,)),    # image (width, height)
+        ("hands", "u1"),
+        ("labels", "u1", (max_hands,)),
+        ("scores", "<f2", (max_hands,)),
+        ("landmarks", "<f2", (max_hands, NUM_LANDMARKS, 2)),
+    ])
+
+
+class DetectorSettings(namedtuple("DetectorSettings",
+                                  "model_complexity min_detection_confidence max_hands")):
+    """Hands settings that change the landmarks, and so are part of the cache key"""
+    __slots__ = ()
+
+    @classmethod
+    def from_config(cls):
+        return cls(config.MODEL_COMPLEXITY, config.MIN_DETECTION_CONFIDENCE, config.MAX_HANDS)
+
+    def tag(self):
+        return (f"c{self.model_complexity}/d{self.min_detection_confidence:.4f}"
+                f"/h{self.max_hands}").encode()
+
+    def graph(self):
+        """A static-image Hands graph with these settings"""
+        import mediapipe as mp
+        return mp.solutions.hands.Hands(
+            static_image_mode=True,
+            max_num_hands=self.max_hands,
+            model_complexity=self.model_complexity,
+            min_detection_confidence=self.min_detection_confidence
+        )
+
+
+def content_key(path, settings):
+    """16-byte key: hash of the file contents and the detector settings"""
+    h = hashlib.blake2b(digest_size=16, person=b"landmark-cache")
+    h.update(settings.tag())
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.digest()
+
+
+def find_images(paths):
+    """Expand files and directories into a sorted list of image files"""
+    images = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                images.extend(os.path.join(root, f) for f in files
+                              if f.lower().endswith(IMAGE_EXTENSIONS))
+        else:
+            images.append(path)
+    return sorted(images)
+
+
+# Worker process state: one graph per process, built once by the initializer
+_graph = None
+
+
+def _init_worker(settings, graph_factory):
+    global _graph
+    _graph = graph_factory(settings) if graph_factory else settings.graph()
+
+
+def _detect_batch(paths):
+    """Runs in a worker: (path, HandResult or None if unreadable) per path"""
+    out = []
+    for path in paths:
+        img = cv2.imread(path)
+        if img is None:
+            out.append((path, None))
+            continue
+        h, w = img.shape[:2]
+        start = time.perf_counter()
+        results = _graph.process(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+        out.append((path, to_hand_result(results, path, None, (w, h),
+                                         time.perf_counter() - start)))
+    return out
+
+
+class LandmarkCache:
+    """Memory-mapped store of hand landmarks keyed by content hash, with LRU eviction"""
+
+    def __init__(self, path, max_bytes=256 << 20, max_hands=4):
+        """
+        Args:
+            path: Store file (created if missing)
+            max_bytes: Size limit of the store; least recently used records are evicted
+            max_hands: Hands a record can hold (settings may ask for at most this many)
+        """
+        self.path = path
+        self.max_hands = max_hands
+        self.dtype = record_dtype(max_hands)
+        self.capacity = max(int(max_bytes - HEADER.itemsize) // self.dtype.itemsize, 1)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._open()
+
+    def _map(self):
+        self.header = np.memmap(self.path, dtype=HEADER, mode="r+", shape=(1,))
+        self.records = np.memmap(self.path, dtype=self.dtype, mode="r+",
+                                 offset=HEADER.itemsize, shape=(self.capacity,))
+
+    def _open(self):
+        old = None
+        if os.path.exists(self.path) and os.path.getsize(self.path) >= HEADER.itemsize:
+            header = np.fromfile(self.path, dtype=HEADER, count=1)[0]
+            if header["magic"] != MAGIC or header["max_hands"] != self.max_hands:
+                console.warning("Landmark cache %s has a different format, starting over",
+                                self.path)
+            elif header["capacity"] != self.capacity:
+                old = self._read_all(int(header["capacity"]))
+            else:
+                self._map()
+                self._index()
+                return
+        self._create(old)
+        self._index()
+
+    def _read_all(self, capacity):
+        records = np.memmap(self.path, dtype=self.dtype, mode="r", offset=HEADER.itemsize,
+                            shape=(capacity,))
+        valid = records[records["used"] > 0]
+        return np.array(valid[np.argsort(valid["used"])[::-1]])  # most recent first
+
+    def _create(self, old=None):
+        """New store; keeps the most recently used records of `old` that fit"""
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.truncate(HEADER.itemsize + self.capacity * self.dtype.itemsize)
+        header = np.memmap(tmp, dtype=HEADER, mode="r+", shape=(1,))
+        header["magic"] = MAGIC
+        header["max_hands"] = self.max_hands
+        header["capacity"] = self.capacity
+        if old is not None and len(old):
+            kept = old[:self.capacity]
+            records = np.memmap(tmp, dtype=self.dtype, mode="r+", offset=HEADER.itemsize,
+                                shape=(self.capacity,))
+            records[:len(kept)] = kept
+            header["clock"] = kept["used"].max()
+            records.flush()
+            del records
+        header.flush()
+        del header
+        os.replace(tmp, self.path)
+        self._map()
+
+    def _index(self):
+        used = np.asarray(self.records["used"])
+        valid = np.nonzero(used)[0]
+        keys = np.asarray(self.records["key"][valid])
+        self.index = {k.tobytes(): int(slot) for k, slot in zip(keys, valid)}
+        self.free = np.nonzero(used == 0)[0][::-1].tolist()  # pop() hands out low slots first
+
+    def _tick(self):
+        self.header["clock"] += 1
+        return int(self.header["clock"][0])
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def nbytes(self):
+        return HEADER.itemsize + self.capacity * self.dtype.itemsize
+
+    def get(self, key, stream=None):
+        """Cached HandResult for a key (its LRU position is refreshed), or None"""
+        slot = self.index.get(key)
+        if slot is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        rec = self.records[slot]
+        rec["used"] = self._tick()
+        n = int(rec["hands"])
+        landmarks = []
+        for pts in rec["landmarks"][:n].astype(np.float32):
+            pts.flags.writeable = False
+            landmarks.append(pts)
+        return HandResult(stream, None, tuple(int(v) for v in rec["size"]), tuple(landmarks),
+                          tuple(LABELS[i] for i in rec["labels"][:n]),
+                          tuple(float(s) for s in rec["scores"][:n]))
+
+    def put(self, key, result):
+        """Store a HandResult (hands beyond max_hands are dropped)"""
+        slot = self.index.get(key)
+        if slot is None:
+            if not self.free:
+                self._evict()
+            slot = self.free.pop()
+            self.index[key] = slot
+        n = min(len(result.landmarks), self.max_hands)
+        rec = self.records[slot]
+        rec["key"] = np.frombuffer(key, dtype=np.uint8)
+        rec["used"] = self._tick()
+        rec["size"] = result.size
+        rec["hands"] = n
+        rec["labels"] = 0
+        rec["scores"] = 0
+        for i in range(n):
+            label = result.labels[i]
+            rec["labels"][i] = LABELS.index(label) if label in LABELS else 0
+            rec["scores"][i] = result.scores[i]
+            rec["landmarks"][i] = result.landmarks[i]
+
+    def _evict(self):
+        """Free the least recently used EVICT_FRACTION of the store"""
+        n = max(int(self.capacity * EVICT_FRACTION), 1)
+        used = np.asarray(self.records["used"])
+        oldest = np.argpartition(used, n - 1)[:n]
+        for slot in oldest:
+            del self.index[self.records["key"][slot].tobytes()]
+        self.records["used"][oldest] = 0
+        self.free.extend(sorted(oldest.tolist(), reverse=True))
+        self.evictions += n
+
+    def detect_files(self, paths, settings=None, workers=None, batch=32, graph_factory=None):
+        """
+        Hands in each image file, from the cache or detected in parallel
+        Args:
+            settings: DetectorSettings (defaults to config.py)
+            workers: Worker processes for cache misses
+            batch: Images per worker task
+            graph_factory: settings -> graph, for tests (defaults to MediaPipe)
+        Returns: list of HandResult (stream = path), None for unreadable images
+        """
+        settings = settings or DetectorSettings.from_config()
+        if settings.max_hands > self.max_hands:
+            raise ValueError(f"store holds {self.max_hands} hands per image, "
+                             f"settings ask for {settings.max_hands}")
+        workers = workers or os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=min(workers, 8)) as hashers:
+            keys = list(hashers.map(lambda p: content_key(p, settings), paths))
+
+        results = [None] * len(paths)
+        missing = {}
+        for i, (path, key) in enumerate(zip(paths, keys)):
+            results[i] = self.get(key, path)
+            if results[i] is None:
+                missing.setdefault(path, []).append(i)
+
+        if missing:
+            todo = list(missing)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(settings, graph_factory)) as pool:
+                futures = [pool.submit(_detect_batch, todo[i:i + batch])
+                           for i in range(0, len(todo), batch)]
+                for future in as_completed(futures):
+                    for path, result in future.result():
+                        if result is None:
+                            console.warning("Cannot read %s", path, key="unreadable_image")
+                            continue
+                        for i in missing[path]:
+                            results[i] = result
+                        self.put(keys[missing[path][0]], result)
+        return results
+
+    def stats(self):
+        return {"records": len(self), "capacity": self.capacity, "bytes": self.nbytes,
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def flush(self):
+        self.records.flush()
+        self.header.flush()
+
+    def close(self):
+        self.flush()
+        del self.records, self.header
+
+
+def evaluate_gestures(results):
+    """Gesture label counts over all detected hands (uses the rules in gestures.py)"""
+    from gestures import classify_gesture, fingers_up
+    from landmarks import array_to_lmlist
+    counts = Counter()
+    for result in results:
+        if result is None:
+            continue
+        for points in result.pixel_points():
+            counts[classify_gesture(fingers_up(array_to_lmlist(points)))] += 1
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cached hand landmarks for image sets")
+    parser.add_argument("inputs", nargs="+", help="image files or directories")
+    parser.add_argument("--cache", default=config.LANDMARK_CACHE_PATH)
+    parser.add_argument("--max-mb", type=float, default=config.LANDMARK_CACHE_MB)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--complexity", type=int, default=config.MODEL_COMPLEXITY)
+    parser.add_argument("--confidence", type=float, default=config.MIN_DETECTION_CONFIDENCE)
+    parser.add_argument("--max-hands", type=int, default=config.MAX_HANDS)
+    args = parser.parse_args()
+
+    paths = find_images(args.inputs)
+    if not paths:
+        print("No images found")
+        return
+    settings = DetectorSettings(args.complexity, args.confidence, args.max_hands)
+    cache = LandmarkCache(args.cache, max_bytes=int(args.max_mb * (1 << 20)))
+
+    start = time.perf_counter()
+    results = cache.detect_files(paths, settings, workers=args.workers)
+    detect_time = time.perf_counter() - start
+    start = time.perf_counter()
+    counts = evaluate_gestures(results)
+    eval_time = time.perf_counter() - start
+
+    s = cache.stats()
+    cache.close()
+    print(f"{len(paths)} images: {s['hits']} cached, {s['misses']} detected "
+          f"in {detect_time:.1f}s; gesture rules took {eval_time:.2f}s")
+    print(f"Cache: {s['records']}/{s['capacity']} records, {s['bytes'] / (1 << 20):.0f} MB, "
+          f"{s['evictions']} evicted")
+    for label, n in counts.most_common():
+        print(f"  {label:<12} {n}")
+
+
+if __name__ == "__main__":
+    main()
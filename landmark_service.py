@@ -0,0 +1,396 @@
+# landmark_service.py
+"""
+Local hand landmark service
+
+Other processes (in any language) POST a frame and get landmarks back,
+without embedding MediaPipe themselves:
+
+    POST /landmarks?stream=cam0&format=jpeg            body: JPEG bytes
+    POST /landmarks?stream=cam0&format=raw&width=640&height=480   body: BGR bytes
+    GET  /stats     throughput, latency / decode / queue / inference percentiles, graph load
+    GET  /health
+
+The response is JSON: {"hands": [{"label", "score", "landmarks": [[x, y] * 21]}],
+"size": [w, h], "decode_ms", "queue_ms", "inference_ms"} with landmarks normalized
+to 0-1.
+
+Frames run on a DetectorPool. Requests with a `stream` id stick to one
+graph so MediaPipe's tracking carries over between that client's frames;
+a stream that sends nothing for SERVICE_STREAM_IDLE seconds is unpinned.
+JPEGs bigger than the inference size are decoded at 1/2, 1/4 or 1/8 scale
+straight from the DCT (cv2.IMREAD_REDUCED_COLOR_*), which is much cheaper
+than a full decode and resize. A request that waits in a graph's queue
+longer than max_queue_ms (counted from the end of decoding) is answered
+with 503 instead of being processed late.
+
+    python landmark_service.py --port 8765 --graphs 4
+    python landmark_service.py --unix /tmp/landmarks.sock
+    python landmark_service.py --client --port 8765 --concurrency 8 --requests 1000
+"""
+import argparse
+import http.client
+import itertools
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import cv2
+import numpy as np
+
+import config
+from console_log import console
+from detector_pool import DetectorPool, QueueTimeout
+
+# JPEG start-of-frame markers (they carry the image size)
+_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+_REDUCED = {8: cv2.IMREAD_REDUCED_COLOR_8, 4: cv2.IMREAD_REDUCED_COLOR_4,
+            2: cv2.IMREAD_REDUCED_COLOR_2}
+
+
+def jpeg_size(data):
+    """(width, height) from a JPEG header without decoding it, or None"""
+    i = 2
+    n = len(data)
+    while i + 9 < n:
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:  # fill byte
+            i += 1
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            i += 2
+            continue
+        length = int.from_bytes(data[i + 2:i + 4], "big")
+        if marker in _SOF_MARKERS:
+            h = int.from_bytes(data[i + 5:i + 7], "big")
+            w = int.from_bytes(data[i + 7:i + 9], "big")
+            return w, h
+        i += 2 + length
+    return None
+
+
+def fit_size(img, target):
+    """Downscale (never upscale) to fit inside target, keeping the aspect ratio"""
+    h, w = img.shape[:2]
+    scale = min(target[0] / w, target[1] / h)
+    if scale >= 1:
+        return img
+    return cv2.resize(img, (max(int(w * scale), 1), max(int(h * scale), 1)),
+                      interpolation=cv2.INTER_AREA)
+
+
+def decode_jpeg(data, target):
+    """Decode a JPEG at the smallest DCT scale that still covers the target size"""
+    flag = cv2.IMREAD_COLOR
+    size = jpeg_size(data)
+    if size is not None:
+        for factor, reduced in _REDUCED.items():
+            if size[0] // factor >= target[0] and size[1] // factor >= target[1]:
+                flag = reduced
+                break
+    img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), flag)
+    if img is None:
+        raise ValueError("could not decode JPEG")
+    return fit_size(img, target)
+
+
+def decode_raw(data, width, height):
+    """Raw BGR24 bytes to an image"""
+    if len(data) != width * height * 3:
+        raise ValueError(f"expected {width * height * 3} bytes for {width}x{height} BGR, "
+                         f"got {len(data)}")
+    return np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3)
+
+
+class ServiceStats:
+    """Thread-safe request counters and recent latency samples"""
+
+    def __init__(self, history=2000):
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.requests = 0
+        self.completed = 0
+        self.rejected = 0
+        self.errors = 0
+        self.samples = deque(maxlen=history)  # (done time, total, decode, queue, inference) s
+
+    def record(self, total, decode, queue, inference):
+        with self.lock:
+            self.completed += 1
+            self.samples.append((time.monotonic(), total, decode, queue, inference))
+
+    def count(self, field):
+        with self.lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def snapshot(self, window=10.0):
+        with self.lock:
+            samples = list(self.samples)
+            counts = {"requests": self.requests, "completed": self.completed,
+                      "rejected": self.rejected, "errors": self.errors}
+        now = time.monotonic()
+        recent = [s for s in samples if now - s[0] <= window]
+        span = min(window, now - self.started)
+        stats = dict(counts, uptime=now - self.started,
+                     throughput=len(recent) / span if span > 0 else 0.0)
+        for i, name in enumerate(("latency", "decode", "queue", "inference"), start=1):
+            ms = np.array([s[i] for s in samples]) * 1000
+            stats[name + "_ms"] = ({"p50": float(np.percentile(ms, 50)),
+                                    "p95": float(np.percentile(ms, 95)),
+                                    "max": float(ms.max())} if len(ms) else None)
+        return stats
+
+
+class LandmarkService:
+    """Decodes frames, runs them on the detector pool and keeps stats"""
+
+    def __init__(self, pool, infer_size=(320, 240), max_queue_ms=100.0, timeout=5.0):
+        self.pool = pool
+        self.infer_size = infer_size
+        self.max_queue = max_queue_ms / 1000.0
+        self.timeout = timeout
+        self.stats = ServiceStats()
+        self._anon = itertools.count()
+
+    def decode(self, body, params):
+        fmt = params.get("format", "jpeg")
+        target = self.infer_size
+        if "size" in params:
+            target = tuple(int(v) for v in params["size"].split("x"))
+        if fmt == "jpeg":
+            return decode_jpeg(body, target)
+        if fmt == "raw":
+            img = decode_raw(body, int(params["width"]), int(params["height"]))
+            return fit_size(img, target)
+        raise ValueError(f"unknown format {fmt!r}")
+
+    def detect(self, body, params):
+        """Returns the JSON-ready response for one frame (raises QueueTimeout / ValueError)"""
+        self.stats.count("requests")
+        start = time.monotonic()
+        img = self.decode(body, params)
+        decoded = time.monotonic()  # the queue deadline doesn't count decoding
+        stream = params.get("stream")
+        if stream is None:
+            # Anonymous requests are spread over the graphs without pinning new streams
+            stream = f"_anon{next(self._anon) % len(self.pool.graphs)}"
+        future = self.pool.submit(stream, img, deadline=decoded + self.max_queue)
+        result = future.result(timeout=self.timeout)
+        done = time.monotonic()
+        decode = decoded - start
+        queue = max(done - decoded - result.inference, 0.0)
+        self.stats.record(done - start, decode, queue, result.inference)
+        return {
+            "hands": [{"label": label, "score": score, "landmarks": lm.tolist()}
+                      for label, score, lm in zip(result.labels, result.scores, result.landmarks)],
+            "size": list(result.size),
+            "decode_ms": decode * 1000,
+            "queue_ms": queue * 1000,
+            "inference_ms": result.inference * 1000,
+        }
+
+    def snapshot(self):
+        stats = self.stats.snapshot()
+        stats["graphs"] = self.pool.stats()
+        return stats
+
+
+class LandmarkHandler(BaseHTTPRequestHandler):
+    """HTTP front end for LandmarkService (keep-alive, JSON responses)"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; with Nagle on, each keep-alive
+    # response would wait on the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/stats":
+            self._reply(200, self.server.service.snapshot())
+        elif path == "/health":
+            self._reply(200, {"ok": True})
+        else:
+            self._reply(404, {"error": "not found"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if url.path != "/landmarks":
+            self._reply(404, {"error": "not found"})
+            return
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        service = self.server.service
+        try:
+            self._reply(200, service.detect(body, params))
+        except QueueTimeout as e:
+            service.stats.count("rejected")
+            self._reply(503, {"error": str(e)})
+        except (ValueError, KeyError) as e:
+            service.stats.count("errors")
+            self._reply(400, {"error": str(e)})
+        except Exception as e:
+            service.stats.count("errors")
+            self._reply(500, {"error": str(e)})
+
+    def address_string(self):
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        console.debug("%s %s", self.address_string(), format % args)
+
+
+class UnixLandmarkHandler(LandmarkHandler):
+    disable_nagle_algorithm = False  # TCP_NODELAY can't be set on a Unix socket
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(service, port=None, unix_path=None):
+    """Run the HTTP server on 127.0.0.1:port or a Unix socket until interrupted"""
+    if unix_path:
+        if os.path.exists(unix_path):
+            os.unlink(unix_path)
+        server = UnixHTTPServer(unix_path, UnixLandmarkHandler)
+        where = unix_path
+    else:
+        server = ThreadingHTTPServer(("127.0.0.1", port), LandmarkHandler)
+        server.daemon_threads = True
+        where = f"http://127.0.0.1:{server.server_address[1]}"
+    server.service = service
+    print(f"Landmark service on {where} ({len(service.pool.graphs)} graphs, "
+          f"inference size {service.infer_size[0]}x{service.infer_size[1]})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if unix_path and os.path.exists(unix_path):
+            os.unlink(unix_path)
+    return server
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """http.client over a Unix domain socket"""
+
+    def __init__(self, path, timeout=10.0):
+        super().__init__("localhost", timeout=timeout)
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+
+def load_test(connect, body, query, concurrency=4, requests=200):
+    """
+    Send `requests` frames from `concurrency` client threads
+    Returns: (elapsed seconds, latencies in seconds, status counts)
+    """
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+    remaining = [requests]
+
+    def worker(index):
+        conn = connect()
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    break
+                remaining[0] -= 1
+            start = time.perf_counter()
+            conn.request("POST", f"/landmarks?stream=client{index}&{query}", body=body)
+            response = conn.getresponse()
+            response.read()
+            elapsed = time.perf_counter() - start
+            with lock:
+                statuses[response.status] = statuses.get(response.status, 0) + 1
+                if response.status == 200:
+                    latencies.append(elapsed)
+        conn.close()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start, latencies, statuses
+
+
+def client_main(args):
+    from frame_source import SyntheticSource
+    w, h = (int(v) for v in args.frame_size.split("x"))
+    if args.image:
+        img = cv2.imread(args.image)
+    else:
+        _, img = SyntheticSource(size=(w, h), frames=1).read()
+    if args.raw:
+        body, query = img.tobytes(), f"format=raw&width={img.shape[1]}&height={img.shape[0]}"
+    else:
+        body, query = cv2.imencode(".jpg", img)[1].tobytes(), "format=jpeg"
+
+    if args.unix:
+        connect = lambda: UnixHTTPConnection(args.unix)
+    else:
+        connect = lambda: http.client.HTTPConnection("127.0.0.1", args.port, timeout=10)
+
+    elapsed, latencies, statuses = load_test(connect, body, query, args.concurrency, args.requests)
+    ms = np.array(latencies) * 1000
+    print(f"{args.requests} requests, {args.concurrency} clients, {len(body) / 1024:.0f} KB frames: "
+          f"{len(latencies) / elapsed:.1f} req/s")
+    if len(ms):
+        print(f"latency p50 {np.percentile(ms, 50):.1f}ms  p95 {np.percentile(ms, 95):.1f}ms  "
+              f"max {ms.max():.1f}ms")
+    print(f"status codes: {statuses}")
+    conn = connect()
+    conn.request("GET", "/stats")
+    print("server stats:", json.dumps(json.loads(conn.getresponse().read()), indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local hand landmark service")
+    parser.add_argument("--port", type=int, default=config.SERVICE_PORT)
+    parser.add_argument("--unix", help="serve on (or connect to) a Unix socket instead")
+    parser.add_argument("--graphs", type=int, default=config.SERVICE_GRAPHS)
+    parser.add_argument("--max-queue-ms", type=float, default=config.SERVICE_MAX_QUEUE_MS)
+    parser.add_argument("--infer-size", default="x".join(map(str, config.SERVICE_INFER_SIZE)))
+    parser.add_argument("--client", action="store_true", help="run the load generator")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--frame-size", default="640x480", help="client frame size")
+    parser.add_argument("--image", help="client: send this image instead of a synthetic frame")
+    parser.add_argument("--raw", action="store_true", help="client: send raw BGR instead of JPEG")
+    args = parser.parse_args()
+
+    if args.client:
+        client_main(args)
+        return
+    infer_size = tuple(int(v) for v in args.infer_size.split("x"))
+    pool = DetectorPool(graphs=args.graphs, idle_timeout=config.SERVICE_STREAM_IDLE)
+    service = LandmarkService(pool, infer_size, args.max_queue_ms)
+    serve(service, args.port, args.unix)
+    service.pool.close()
+
+
+if __name__ == "__main__":
+    main()
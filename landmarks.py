@@ -0,0 +1,51 @@
+# landmarks.py
+"""
+Hand landmark indices and array helpers
+"""
+import numpy as np
+
+# Landmark IDs (see section2.LANDMARK_NAMES for the full list)
+WRIST = 0
+THUMB_TIP = 4
+INDEX_TIP = 8
+MIDDLE_TIP = 12
+RING_TIP = 16
+PINKY_TIP = 20
+
+TIP_IDS = [THUMB_TIP, INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP]
+PALM_IDS = [0, 5, 9, 13, 17]
+NUM_LANDMARKS = 21
+
+# The 21 MediaPipe hand connections expressed as 6 open polylines,
+# so a whole skeleton can be drawn with a single cv2.polylines call
+HAND_CHAINS = [
+    [0, 1, 2, 3, 4],        # thumb
+    [0, 5, 6, 7, 8],        # index
+    [9, 10, 11, 12],        # middle
+    [13, 14, 15, 16],       # ring
+    [0, 17, 18, 19, 20],    # pinky
+    [5, 9, 13, 17],         # knuckles
+]
+
+
+def landmarks_to_array(hand_landmarks, width, height):
+    """
+    Convert a MediaPipe hand landmark message to pixel coordinates
+    Args:
+        hand_landmarks: One entry of results.multi_hand_landmarks
+        width, height: Frame dimensions
+    Returns: int32 array of shape (21, 2)
+    """
+    pts = np.array([(lm.x, lm.y) for lm in hand_landmarks.landmark], dtype=np.float32)
+    pts *= (width, height)
+    return pts.astype(np.int32)
+
+
+def array_to_lmlist(points):
+    """Convert a (21, 2) landmark array to the [[id, x, y], ...] list used by the scripts"""
+    return [[i, int(x), int(y)] for i, (x, y) in enumerate(points)]
+
+
+def lmlist_to_array(lmList):
+    """Convert a [[id, x, y], ...] landmark list to a (21, 2) array"""
+    return np.array([(lm[1], lm[2]) for lm in lmList], dtype=np.int32)
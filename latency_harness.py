@@ -0,0 +1,311 @@
+# latency_harness.py
+"""
+Glass-to-action latency harness
+
+A fake frame source plays a script of hand poses, stamping each frame with
+its capture time. Frames go through a simulated camera buffer and inference
+delay into the real gesture logic of main.py (GestureController),
+VolumeHandControl.py and handgesturePicksUp.py, whose actions are replaced
+by an instrumented backend that records when each action is invoked.
+
+Time is simulated, so runs are deterministic and faster than real time;
+the real CPU time of the gesture logic is added to the simulated clock.
+
+Usage:
+    python latency_harness.py                      # all apps
+    python latency_harness.py --app main --buffer 2 --inference-ms 25
+"""
+import argparse
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from clock import SimulatedClock
+from landmarks import array_to_lmlist
+from synthetic_landmarks import POSES, pose_points
+
+FRAME_SIZE = (640, 480)
+SCREEN_SIZE = (1920, 1080)
+
+
+def make_pose(name, **kwargs):
+    """Landmarks for a named pose; "NONE" means no hand in view"""
+    if name == "NONE":
+        return None
+    if name in POSES:
+        return pose_points(POSES[name], **kwargs)
+    if name == "PINCH":
+        return pose_points(POSES["POINT"], thumb_offset=(5, 5), **kwargs)
+    # e.g. VOL40: thumb-index distance that maps to 40% volume
+    percent = int(name[3:])
+    return pose_points(POSES["POINT"], thumb_offset=(50 + 2.5 * percent, 0), **kwargs)
+
+
+# Scripts: (pose, seconds, pose kwargs, expected action)
+SCRIPTS = {
+    "main": [
+        ("NONE", 1.0, {}, None),
+        ("POINT", 1.0, {}, None),
+        ("ROCK ON", 1.5, {}, "open_spotify"),
+        ("POINT", 1.0, {}, None),
+        ("PICKS UP!", 1.5, {}, "open_myutep"),
+        ("VOLUME UP", 1.0, {}, "change_volume"),
+        ("POINT", 0.5, {}, None),
+        ("POINT", 1.0, {"center": (200, 300)}, "cursor"),
+        ("PINCH", 0.5, {"center": (200, 300)}, "mouse_down"),
+        ("POINT", 0.5, {"center": (200, 300)}, "mouse_up"),
+        ("POINT", 1.0, {"center": (440, 360)}, "cursor"),
+        ("ROCK ON", 1.5, {}, "open_spotify"),  # inside the 10s cooldown
+    ],
+    "volume": [
+        ("NONE", 0.5, {}, None),
+        ("VOL10", 1.0, {}, "set_volume"),
+        ("VOL80", 1.0, {}, "set_volume"),
+        ("VOL40", 1.0, {}, "set_volume"),
+        ("NONE", 0.5, {}, None),
+        ("VOL60", 1.0, {}, "set_volume"),
+    ],
+    "picks_up": [
+        ("NONE", 1.0, {}, None),
+        ("PICKS UP!", 1.0, {}, "open_myutep"),
+        ("POINT", 0.5, {}, None),
+        ("PICKS UP!", 1.0, {}, "open_myutep"),  # inside the 3s cooldown
+        ("NONE", 3.0, {}, None),
+        ("PICKS UP!", 1.0, {}, "open_myutep"),
+    ],
+}
+
+
+class RecordingBackend:
+    """Instrumented action backend: records (time, action, args) for every call"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.calls = []
+
+    def _record(self, action, *args):
+        self.calls.append((self.clock(), action, args))
+
+    def open_myutep(self):
+        self._record("open_myutep")
+
+    def open_spotify(self):
+        self._record("open_spotify")
+
+    def change_volume(self, direction):
+        self._record("change_volume", direction)
+
+    def mouse_down(self):
+        self._record("mouse_down")
+
+    def mouse_up(self):
+        self._record("mouse_up")
+
+    def move_to(self, x, y):
+        self._record("move_to", x, y)
+
+    def flush(self):
+        pass
+
+    def set_volume(self, percent):
+        self._record("set_volume", percent)
+
+
+class FakeFrameSource:
+    """
+    Plays a pose script at a fixed frame rate
+    Each frame is stamped with its capture time; with buffer_frames > 0 the
+    app receives it that many frame intervals later, like a camera queue.
+    """
+
+    def __init__(self, script, fps=30.0, buffer_frames=1, start=1000.0):
+        self.script = script
+        self.fps = fps
+        self.buffer_frames = buffer_frames
+        self.start = start
+
+    def segments(self):
+        """(onset capture time, end time, pose, kwargs, expected action) per script step"""
+        t = self.start
+        for pose, seconds, kwargs, expected in self.script:
+            yield t, t + seconds, pose, kwargs, expected
+            t += seconds
+
+    def frames(self):
+        """Yield (capture_time, delivery_time, segment_index, points)"""
+        dt = 1.0 / self.fps
+        for index, (onset, end, pose, kwargs, _) in enumerate(self.segments()):
+            points = make_pose(pose, **kwargs)
+            t = onset
+            while t < end - 1e-9:
+                yield t, t + self.buffer_frames * dt, index, points
+                t += dt
+
+
+def _main_app(clock, backend):
+    from gesture_controller import GestureController
+    import config
+    from screen_mapping import Monitor, ScreenMapping
+    # A fixed single screen, whatever monitors or calibration this machine has
+    mapping = ScreenMapping(monitors=[Monitor(0, 0, *SCREEN_SIZE)],
+                            edge_margin=config.EDGE_DAMPENING_MARGIN,
+                            edge_gain=config.EDGE_DAMPENING_GAIN)
+    controller = GestureController(SCREEN_SIZE, backend=backend, clock=clock, mapping=mapping)
+
+    def step(points, capture_time):
+        hands = [] if points is None else [points]
+        controller.process(hands, FRAME_SIZE, capture_time)
+    return step, controller, controller.stabilizer
+
+
+def _volume_app(clock, backend):
+    from VolumeHandControl import length_to_volume
+    from features import HandFeatures
+
+    def step(points, capture_time):
+        if points is not None:
+            volPer, _ = length_to_volume(HandFeatures(points).pinch_distance)
+            backend.set_volume(volPer)
+    return step, None, None
+
+
+def _picks_up_app(clock, backend):
+    from handgesturePicksUp import handDetector, check_gesture
+    from gesture_stabilizer import stabilizer_from_config
+    detector = handDetector()
+    stabilizer = stabilizer_from_config()
+    detector.clock = clock
+    detector.launcher = backend.open_myutep
+    state = {"detected": False}
+
+    def step(points, capture_time):
+        if points is None:
+            return
+        fingers = detector.fingersUp(array_to_lmlist(points))
+        state["detected"], _ = check_gesture(detector, fingers, state["detected"], stabilizer)
+    return step, None, stabilizer
+
+
+APPS = {"main": _main_app, "volume": _volume_app, "picks_up": _picks_up_app}
+
+
+def _cursor_target(controller, points):
+    """Screen position the smoothed cursor converges to for this pose"""
+    return controller.mapping.map_point(points[8][0], points[8][1], *FRAME_SIZE)
+
+
+def _matches(call, expected, segment_points, controller, tolerance):
+    t, action, args = call
+    if expected == "cursor":
+        if action != "move_to":
+            return False
+        tx, ty = _cursor_target(controller, segment_points)
+        return abs(args[0] - tx) <= tolerance and abs(args[1] - ty) <= tolerance
+    if expected == "set_volume":
+        from VolumeHandControl import length_to_volume
+        from features import HandFeatures
+        target, _ = length_to_volume(HandFeatures(segment_points).pinch_distance)
+        return action == "set_volume" and abs(args[0] - target) <= 1
+    return action == expected
+
+
+def run(app, fps=30.0, buffer_frames=1, inference_ms=20.0, repeats=3, tolerance=5.0):
+    """
+    Play an app's script and measure glass-to-action latency per transition
+    Returns: list of dicts (gesture, latency, pipeline, vote, wait) ; latency None if missed
+    """
+    script = SCRIPTS[app] * repeats
+    clock = SimulatedClock()
+    backend = RecordingBackend(clock)
+    step, controller, stabilizer = APPS[app](clock, backend)
+    source = FakeFrameSource(script, fps, buffer_frames, start=clock())
+    segments = list(source.segments())
+
+    first_done = {}  # segment index -> time the first frame of that pose was processed
+    stable_at = {}   # segment index -> time its pose won the gesture vote
+    for capture_time, delivery_time, index, points in source.frames():
+        clock.wait_until(delivery_time)
+        clock.advance(inference_ms / 1000.0)
+        start = time.perf_counter()
+        step(points, capture_time)
+        clock.advance(time.perf_counter() - start)
+        first_done.setdefault(index, (clock(), capture_time))
+        if stabilizer is not None and index not in stable_at and \
+                stabilizer.stable == segments[index][2]:
+            stable_at[index] = clock()
+
+    results = []
+    calls = backend.calls
+    for index, (onset, end, pose, kwargs, expected) in enumerate(segments):
+        if expected is None:
+            continue
+        points = make_pose(pose, **kwargs)
+        done, capture = first_done[index]
+        hit = next((c for c in calls if onset <= c[0] < end + 1.0 and
+                    _matches(c, expected, points, controller, tolerance)), None)
+        pipeline = done - onset
+        result = {"gesture": pose if expected != "cursor" else "CURSOR MOVE",
+                  "action": expected, "pipeline": pipeline,
+                  "buffering": buffer_frames / fps, "inference": inference_ms / 1000.0,
+                  "latency": None, "vote": None, "wait": None}
+        if hit is not None:
+            result["latency"] = hit[0] - onset
+            # Frames the stabilizer needed to accept the pose, then cooldowns / smoothing
+            result["vote"] = max(stable_at[index] - done, 0.0) if index in stable_at else 0.0
+            result["wait"] = max(result["latency"] - pipeline - result["vote"], 0.0)
+        results.append(result)
+    return results
+
+
+def report(app, results):
+    """Print per-gesture latency distributions and where the time goes"""
+    by_gesture = defaultdict(list)
+    for r in results:
+        by_gesture[(r["gesture"], r["action"])].append(r)
+
+    print(f"\n=== {app} ===")
+    print(f"{'gesture':<14} {'action':<14} {'n':>3} {'miss':>4} {'p50':>8} {'p95':>8} "
+          f"{'max':>8} | {'buffer':>7} {'infer':>7} {'logic':>7} {'vote':>7} {'wait':>8}")
+    for (gesture, action), rows in by_gesture.items():
+        lat = np.array([r["latency"] for r in rows if r["latency"] is not None]) * 1000
+        votes = np.array([r["vote"] for r in rows if r["vote"] is not None]) * 1000
+        waits = np.array([r["wait"] for r in rows if r["wait"] is not None]) * 1000
+        missed = sum(r["latency"] is None for r in rows)
+        buf = rows[0]["buffering"] * 1000
+        inf = rows[0]["inference"] * 1000
+        logic = np.mean([r["pipeline"] for r in rows]) * 1000 - buf - inf
+        # Beyond the vote, wait comes from cooldowns for launches and smoothing lag for motion
+        kind = "smooth" if action in ("cursor", "set_volume") else "cooldown"
+        if len(lat):
+            print(f"{gesture:<14} {action:<14} {len(rows):>3} {missed:>4} "
+                  f"{np.percentile(lat, 50):7.1f}ms {np.percentile(lat, 95):7.1f}ms "
+                  f"{lat.max():7.1f}ms | {buf:6.1f}ms {inf:6.1f}ms {logic:6.2f}ms "
+                  f"{votes.mean():5.1f}ms {waits.mean():6.1f}ms {kind}")
+        else:
+            print(f"{gesture:<14} {action:<14} {len(rows):>3} {missed:>4} "
+                  f"{'-':>8} {'-':>8} {'-':>8} | never fired ({kind})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Glass-to-action latency harness")
+    parser.add_argument("--app", choices=sorted(APPS), action="append",
+                        help="app to measure (default: all)")
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--buffer", type=int, default=1, help="camera buffer depth in frames")
+    parser.add_argument("--inference-ms", type=float, default=20.0,
+                        help="simulated MediaPipe inference time")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    for app in args.app or ["main", "volume", "picks_up"]:
+        try:
+            results = run(app, args.fps, args.buffer, args.inference_ms, args.repeats)
+        except ImportError as e:
+            print(f"\n=== {app} ===\nskipped: {e}")
+            continue
+        report(app, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,24 @@
 """
 Main application file for hand gesture control
 """
+import argparse
+
 import cv2
 import mediapipe as mp
-import time
 import pyautogui
 
-from gestures import (
-    fingers_up, is_fist, is_open_palm, 
-    is_hang_loose, is_rock_roll, detect_pinch
-)
-from actions import open_myutep, open_spotify, change_volume
-from mouse_smoother import MouseController
+from clock import SystemClock, SimulatedClock, FpsCounter
+from capture_supervisor import supervised_source
+from landmarks import landmarks_to_array
+from renderer import draw_hand, HudOverlay
+from event_log import EventLog
+from gesture_controller import GestureController
+from gesture_stabilizer import format_stats
+from input_backend import default_backend
+from profiler import SamplingProfiler
+from memory_monitor import MemoryMonitor
+from scheduling import configure_process, print_startup_report
+from session_recorder import SessionRecorder
 import config
 
 
@@ -20,11 +27,24 @@ import config
 pyautogui.FAILSAFE = False
 
 
-def main():
-    """Main application loop"""
-    
-    # Initialize camera
-    cap = cv2.VideoCapture(config.CAMERA_INDEX)
+def main(source=None, clock=None, headless=False):
+    """
+    Main application loop
+    Args:
+        source: Frame source spec or FrameSource (defaults to config.FRAME_SOURCE)
+        clock: Time source for cooldowns and FPS (defaults to the system clock)
+        headless: Don't open a window (runs until the source is exhausted)
+    """
+    clock = clock or SystemClock()
+
+    # CPU affinity / priority of the frame loop and OpenCV's thread count, set
+    # before MediaPipe starts its threads so they inherit them
+    configure_process()
+
+    # Initialize camera (or any other frame source), reopened with backoff if it drops out
+    if source is None:
+        source = config.FRAME_SOURCE
+    cap = supervised_source(source, clock=clock) if isinstance(source, (int, str)) else source
 
     # Initialize MediaPipe
     mpHands = mp.solutions.hands
@@ -34,133 +54,129 @@ def main():
         min_detection_confidence=config.MIN_DETECTION_CONFIDENCE,
         min_tracking_confidence=config.MIN_TRACKING_CONFIDENCE
     )
-    mpDraw = mp.solutions.drawing_utils
 
-    # Initialize mouse controller
-    screen_w, screen_h = pyautogui.size()
-    mouse_controller = MouseController(screen_w, screen_h, config.EDGE_DAMPENING_MARGIN)
-
-    # Timing variables
-    pTime = 0
-    last_hang_time = 0
-    last_rock_time = 0
-    last_vol_time = 0
-    last_pinch_time = 0
-
-    # Drag state
-    dragging = False
+    # HUD text is only re-rendered when its value changes
+    hud = HudOverlay()
+
+    # Structured gesture event log
+    event_log = EventLog(config.EVENT_LOG_PATH) if config.EVENT_LOG_PATH else None
+
+    # Gesture logic: tracks hands, each track owns its mouse smoother and drag state
+    inputs = default_backend()
+    controller = GestureController(inputs.size(), event_log=event_log, clock=clock)
+    tracker = controller.tracker
+
+    # Session recorder: frames are copied into a buffer pool and encoded on its own thread
+    recorder = SessionRecorder()
+    controller.event_sinks.append(recorder.event)
+    if config.RECORD_AT_START:
+        recorder.start()
+
+    # FPS counter on the same clock as the frames
+    fps_counter = FpsCounter(clock)
+
+    # On-demand profiler: `kill -USR1 <pid>` or press 'p'
+    profiler = SamplingProfiler(config.PROFILE_DURATION, config.PROFILE_INTERVAL,
+                                config.PROFILE_DIR)
+    profiler.install_signal()
+
+    # Optional memory monitor: reports RSS, growing allocation sites and buffer sizes
+    monitor = None
+    if config.MEMORY_MONITOR:
+        monitor = MemoryMonitor(interval=config.MEMORY_INTERVAL)
+        monitor.register("tracks", lambda: len(tracker.tracks))
+        monitor.register("smoother_buffers", lambda: sum(
+            len(t.state.mouse_controller.smoother.position_buffer) for t in tracker.tracks))
+        monitor.register("hud_texts", hud._texts)
+        monitor.install_signal()
+        monitor.start()
 
     print("Starting hand gesture control...")
-    print("Press ESC to exit")
+    print(f"Input backend: {inputs.name}")
+    print_startup_report()
+    print("Press ESC to exit, 'p' to profile, 'r' to record")
 
     while True:
+        profiler.mark("capture")
         success, img = cap.read()
         if not success:
+            if cap.finished:
+                break
+            # Camera missing: the supervisor idles between reconnects, keep ESC working
+            if not headless and cv2.waitKey(1) & 0xFF == 27:
+                break
             continue
+        frame_time = cap.timestamp
 
         img = cv2.flip(img, 1)
         h, w, c = img.shape
+        recorder.begin_frame(img, frame_time)
 
         # Process with MediaPipe
+        profiler.mark("inference")
         imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
         results = hands.process(imgRGB)
 
-        lmList = []
-        gesture_label = "NONE"
-        now = time.time()
-
-        # Extract hand landmarks
-        if results.multi_hand_landmarks:
-            handLms = results.multi_hand_landmarks[0]
-            mpDraw.draw_landmarks(img, handLms, mpHands.HAND_CONNECTIONS)
-
-            for id, lm in enumerate(handLms.landmark):
-                cx, cy = int(lm.x * w), int(lm.y * h)
-                lmList.append([id, cx, cy])
-
-        # Process gestures if hand detected
-        if len(lmList) != 0:
-            fingers = fingers_up(lmList)
-
-            # Gesture: Hang Loose → Open myUTEP
-            if is_hang_loose(fingers):
-                gesture_label = "PICKS UP!"
-                if now - last_hang_time > config.HANG_COOLDOWN:
-                    open_myutep()
-                    last_hang_time = now
-
-            # Gesture: Rock On → Open Spotify
-            elif is_rock_roll(fingers):
-                gesture_label = "ROCK ON"
-                if now - last_rock_time > config.ROCK_COOLDOWN:
-                    open_spotify()
-                    last_rock_time = now
-
-            # Gesture: Open Palm → Volume Up
-            elif is_open_palm(fingers):
-                gesture_label = "VOLUME UP"
-                if now - last_vol_time > config.VOLUME_COOLDOWN:
-                    change_volume("UP")
-                    last_vol_time = now
-
-            # Gesture: Fist → Volume Down
-            elif is_fist(fingers):
-                gesture_label = "VOLUME DOWN"
-                if now - last_vol_time > config.VOLUME_COOLDOWN:
-                    change_volume("DOWN")
-                    last_vol_time = now
-
-            # Mouse control with index finger
-            ix, iy = lmList[8][1], lmList[8][2]
-            mouse_controller.process_movement(ix, iy, w, h)
-
-            # Pinch detection for clicking
-            pinch_distance, (x1, y1), (x2, y2) = detect_pinch(lmList)
-
-            # Draw pinch indicator
-            if pinch_distance < config.RELEASE_THRESHOLD:
-                color = (0, 255, 0) if pinch_distance < config.PINCH_THRESHOLD else (0, 255, 255)
-                cv2.line(img, (x1, y1), (x2, y2), color, 3)
-                cv2.circle(img, (x1, y1), 10, color, cv2.FILLED)
-                cv2.circle(img, (x2, y2), 10, color, cv2.FILLED)
-
-            # Start drag/click
-            if (pinch_distance < config.PINCH_THRESHOLD and 
-                not dragging and 
-                now - last_pinch_time > config.PINCH_COOLDOWN):
-                pyautogui.mouseDown()
-                dragging = True
-                last_pinch_time = now
-                gesture_label = "PINCH (DRAG)"
-
-            # Release drag
-            elif pinch_distance > config.RELEASE_THRESHOLD and dragging:
-                pyautogui.mouseUp()
-                dragging = False
-                gesture_label = "RELEASE"
+        # Extract hand landmarks and run the gesture logic
+        profiler.mark("gesture")
+        hand_points = [landmarks_to_array(handLms, w, h)
+                       for handLms in results.multi_hand_landmarks or []]
+        scores = [hand.classification[0].score for hand in results.multi_handedness or []]
+        for points in hand_points:
+            draw_hand(img, points)
+        gesture_label = controller.process(hand_points, (w, h), frame_time, img, scores)
 
         # Display info
+        profiler.mark("render")
         if config.DISPLAY_FPS:
-            cTime = time.time()
-            fps = 1 / (cTime - pTime) if pTime else 0
-            pTime = cTime
-            cv2.putText(img, f'FPS: {int(fps)}', (10, 40), 
-                       cv2.FONT_HERSHEY_PLAIN, 2, (0, 0, 0), 2)
+            fps = fps_counter.tick()
+            hud.set_text("fps", f'FPS: {int(fps)}', (10, 40))
 
         if config.DISPLAY_GESTURE:
-            cv2.putText(img, f'Gesture: {gesture_label}', (10, 80), 
-                       cv2.FONT_HERSHEY_PLAIN, 2, (0, 0, 0), 2)
+            hud.set_text("gesture", f'Gesture: {gesture_label}', (10, 80))
+
+        hud.render(img)
+        recorder.end_frame(img, hand_points, gesture_label)
 
-        cv2.imshow("Hand Gesture Control", img)
+        key = -1
+        if not headless:
+            cv2.imshow("Hand Gesture Control", img)
 
-        # Exit on ESC
-        if cv2.waitKey(1) & 0xFF == 27:
+            # Exit on ESC, 'p' toggles the profiler
+            key = cv2.waitKey(1) & 0xFF
+        if key == 27:
             break
+        if key == ord('p'):
+            profiler.toggle()
+        if key == ord('r'):
+            recorder.toggle()
+        if monitor is not None:
+            if key == ord('m'):
+                monitor.request_dump()
+            monitor.tick()
 
     cap.release()
-    cv2.destroyAllWindows()
+    recorder.close()
+    inputs.close()
+    if hasattr(cap, "stats"):
+        stats = cap.stats()
+        print(f"Camera: {stats['frames']} frames, {stats['reconnects']} reconnects, "
+              f"{stats['downtime']:.1f}s downtime")
+    print(format_stats(controller.stabilizer))
+    if not headless:
+        cv2.destroyAllWindows()
+    if event_log is not None:
+        event_log.close()
     print("Exiting...")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Hand gesture control")
+    parser.add_argument("--source", help="camera index, video file, image directory, "
+                                         "synthetic or shm:<name>:<w>x<h>")
+    parser.add_argument("--simulated", action="store_true",
+                        help="drive cooldowns from the frame timestamps (replays run "
+                             "faster than real time)")
+    parser.add_argument("--headless", action="store_true", help="no preview window")
+    args = parser.parse_args()
+    main(args.source, SimulatedClock() if args.simulated else None, args.headless)
\ No newline at end of file
@@ -0,0 +1,242 @@
+# memory_monitor.py
+"""
+Long-run memory instrumentation
+
+MemoryMonitor.tick() is called once per frame. Every `interval` seconds it
+records RSS, takes a tracemalloc snapshot and compares it with the previous
+one; allocation sites that keep growing interval after interval are flagged.
+Bounded buffers (smoothers, tracks, history, ...) are registered by name and
+their sizes are reported with each sample. dump() writes a diff against the
+first snapshot on demand (SIGUSR2 or a key).
+
+Soak test (replays synthetic frames through the gesture layer and fails if
+memory does not stay flat):
+    python memory_monitor.py --soak 7200 --interval 60
+"""
+import argparse
+import os
+import signal
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+]
+
+
+def rss_bytes():
+    """Current resident set size in bytes"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        # ru_maxrss is the peak, in KB on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class MemoryMonitor:
+    """Periodic RSS / tracemalloc sampling with growth detection"""
+
+    def __init__(self, interval=300.0, top=10, frames=1, growth_streak=3,
+                 history=288, out_dir="."):
+        """
+        Args:
+            interval: Seconds between samples
+            top: Allocation sites to report per sample
+            frames: Traceback depth recorded by tracemalloc
+            growth_streak: Consecutive growing samples before a site is flagged
+            history: Samples kept in memory (the monitor is bounded too)
+        """
+        self.interval = interval
+        self.top = top
+        self.frames = frames
+        self.growth_streak = growth_streak
+        self.out_dir = out_dir
+        self.samples = deque(maxlen=history)
+        self.buffers = {}
+        self.flagged = set()
+        self._streaks = {}
+        self._baseline = None
+        self._previous = None
+        self._last = 0.0
+        self._dump_requested = False
+
+    def start(self):
+        """Start tracemalloc and take the baseline snapshot"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self._baseline = self._previous = self._snapshot()
+        self._last = time.monotonic()
+        self.samples.append((time.time(), rss_bytes(), self.buffer_sizes()))
+
+    def stop(self):
+        tracemalloc.stop()
+
+    def register(self, name, buffer):
+        """
+        Report the size of a bounded buffer with every sample
+        Args:
+            buffer: Anything with len(), or a callable returning a size
+        """
+        self.buffers[name] = buffer
+
+    def buffer_sizes(self):
+        return {name: (buf() if callable(buf) else len(buf))
+                for name, buf in self.buffers.items()}
+
+    def install_signal(self, signum=getattr(signal, "SIGUSR2", None)):
+        """Dump a diff on `kill -USR2 <pid>` (written on the next tick)"""
+        if signum is not None:
+            signal.signal(signum, lambda *_: self.request_dump())
+
+    def request_dump(self):
+        self._dump_requested = True
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(_FILTERS)
+
+    def tick(self, now=None):
+        """Call once per frame; samples when the interval has elapsed"""
+        if self._dump_requested:
+            self._dump_requested = False
+            self.dump()
+        now = time.monotonic() if now is None else now
+        if self._baseline is None or now - self._last < self.interval:
+            return None
+        self._last = now
+        return self.sample()
+
+    def sample(self):
+        """Record RSS and buffer sizes, and update the growing-site streaks"""
+        snapshot = self._snapshot()
+        growth = snapshot.compare_to(self._previous, "lineno")
+        self._previous = snapshot
+
+        grew = set()
+        for stat in growth:
+            if stat.size_diff > 0:
+                site = stat.traceback[0]
+                grew.add(site)
+                self._streaks[site] = self._streaks.get(site, 0) + 1
+                if self._streaks[site] >= self.growth_streak:
+                    self.flagged.add(site)
+        for site in list(self._streaks):
+            if site not in grew:
+                del self._streaks[site]
+
+        rss = rss_bytes()
+        sizes = self.buffer_sizes()
+        self.samples.append((time.time(), rss, sizes))
+        top = [s for s in growth[:self.top] if s.size_diff > 0]
+        print(f"[memory] rss={rss / 2**20:.1f}MB buffers={sizes} "
+              f"growing sites={len(self.flagged)}")
+        for stat in top:
+            mark = "!" if stat.traceback[0] in self.flagged else " "
+            print(f"[memory] {mark} {stat.size_diff / 1024:+8.1f}KB  {stat.traceback[0]}")
+        return rss, top
+
+    def dump(self, path=None):
+        """Write the top allocation differences since start() to a file"""
+        if self._baseline is None:
+            return None
+        diff = self._snapshot().compare_to(self._baseline, "traceback")
+        path = path or os.path.join(self.out_dir, time.strftime("memdiff-%Y%m%d-%H%M%S.txt"))
+        with open(path, "w") as f:
+            f.write(f"rss: {rss_bytes() / 2**20:.1f} MB\n")
+            f.write(f"buffers: {self.buffer_sizes()}\n")
+            f.write(f"flagged sites: {len(self.flagged)}\n")
+            for site in sorted(self.flagged, key=str):
+                f.write(f"  ! {site}\n")
+            f.write("\nTop differences since start:\n")
+            for stat in diff[:50]:
+                f.write(f"{stat.size_diff / 1024:+10.1f} KB {stat.count_diff:+8d} blocks\n")
+                for line in stat.traceback.format():
+                    f.write(f"    {line}\n")
+        print(f"[memory] diff written to {path}")
+        return path
+
+
+def soak(duration, interval, fps=0, tolerance_mb=8.0):
+    """
+    Replay synthetic frames through the gesture layer and assert memory stays flat
+    Returns: True if RSS after warm-up stayed within tolerance, False if it grew,
+             None if too few samples were taken to judge (raise --soak or lower --interval)
+    """
+    import numpy as np
+    from features import HandFeatures
+    from gestures import classify_gesture
+    from hand_tracker import HandTracker
+    from mouse_smoother import MouseSmoothing
+    from renderer import HudOverlay, draw_hand
+    from synthetic_landmarks import drifting_hand
+
+    rng = np.random.default_rng(0)
+    w, h = 640, 480
+    img = np.zeros((h, w, 3), dtype=np.uint8)
+    tracker = HandTracker(state_factory=lambda: MouseSmoothing(7, 0.25))
+    hud = HudOverlay()
+    hud.add_rect((50, 150), (85, 400), (0, 0, 0), 3)
+
+    monitor = MemoryMonitor(interval=interval)
+    monitor.register("tracks", lambda: len(tracker.tracks))
+    monitor.register("hud_texts", hud._texts)
+    monitor.register("samples", monitor.samples)
+    monitor.start()
+
+    start = time.monotonic()
+    frames = 0
+    while time.monotonic() - start < duration:
+        t = frames / 30.0
+        n_hands = int(t / 7) % 3  # hands come and go
+        hands = [drifting_hand(rng, t + 3 * i, w, h) for i in range(n_hands)]
+        for track in tracker.update(hands, (w, h)):
+            features = HandFeatures(track.points)
+            label = classify_gesture(features.fingers)
+            track.state.add_position(*features.points[8])
+            track.state.get_smoothed_position()
+            draw_hand(img, track.points)
+        hud.set_text("gesture", f"Gesture: {label if hands else 'NONE'}", (10, 80))
+        hud.set_text("frame", f"Frame: {frames}", (10, 40))
+        hud.render(img)
+        frames += 1
+        monitor.tick()
+        if fps:
+            time.sleep(1.0 / fps)
+
+    rss = [s[1] for s in monitor.samples]
+    if len(rss) < 3:
+        # the first sample is warm-up, and drift needs two more after it
+        print(f"Soak too short to judge: {len(rss)} samples, need at least 3")
+        return None
+    warm = rss[max(len(rss) // 10, 1):]
+    drift = (max(warm) - warm[0]) / 2**20
+    print(f"\n{frames} frames in {time.monotonic() - start:.0f}s, "
+          f"RSS drift after warm-up: {drift:+.2f} MB, flagged sites: {len(monitor.flagged)}")
+    monitor.dump()
+    return drift <= tolerance_mb
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory soak test for the gesture layer")
+    parser.add_argument("--soak", type=float, default=600, help="duration in seconds")
+    parser.add_argument("--interval", type=float, default=30, help="seconds between samples")
+    parser.add_argument("--fps", type=float, default=0, help="throttle replay (0 = flat out)")
+    parser.add_argument("--tolerance", type=float, default=8.0, help="allowed RSS drift in MB")
+    args = parser.parse_args()
+
+    ok = soak(args.soak, args.interval, args.fps, args.tolerance)
+    if ok is None:
+        print("INCONCLUSIVE: not enough samples")
+        sys.exit(2)
+    print("PASS: memory stayed flat" if ok else "FAIL: memory grew")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,11 @@
 Mouse smoothing and movement control
 """
 from collections import deque
-import pyautogui
 import numpy as np
 
+from input_backend import default_backend
+from screen_mapping import Monitor, ScreenMapping
+
 
 class MouseSmoothing:
     """Smooth mouse movement using moving average and exponential smoothing"""
@@ -41,13 +43,31 @@ class MouseSmoothing:
         return self.smooth_x, self.smooth_y
 
 
+def _move_now(x, y):
+    """Move the pointer through the default input backend without batching"""
+    backend = default_backend()
+    backend.move_to(x, y)
+    backend.flush()
+
+
 class MouseController:
     """Handle mouse movement and clicking"""
     
-    def __init__(self, screen_width, screen_height, edge_margin=0.15):
+    def __init__(self, screen_width, screen_height, edge_margin=0.15, move_to=None,
+                 mapping=None, acceleration=None):
+        """
+        Args:
+            mapping: ScreenMapping (defaults to the whole screen with edge dampening)
+            acceleration: Optional PointerAcceleration applied before smoothing
+        """
         self.screen_w = screen_width
         self.screen_h = screen_height
         self.edge_margin = edge_margin
+        # Pointer backend, swappable for tests and the latency harness
+        self.move_to = move_to or _move_now
+        self.mapping = mapping or ScreenMapping(
+            monitors=[Monitor(0, 0, screen_width, screen_height)], edge_margin=edge_margin)
+        self.acceleration = acceleration
         self.smoother = MouseSmoothing(buffer_size=7, exponential_weight=0.25)
         
     def process_movement(self, hand_x, hand_y, frame_width, frame_height):
@@ -57,17 +77,10 @@ class MouseController:
             hand_x, hand_y: Hand landmark position in frame
             frame_width, frame_height: Camera frame dimensions
         """
-        # Normalize to 0-1 range
-        norm_x = hand_x / frame_width
-        norm_y = hand_y / frame_height
-        
-        # Apply edge dampening (reduce jitter near screen edges)
-        norm_x = self._apply_edge_dampening(norm_x)
-        norm_y = self._apply_edge_dampening(norm_y)
-        
-        # Map to screen coordinates
-        target_x = norm_x * self.screen_w
-        target_y = norm_y * self.screen_h
+        # Active region, edge dampening and monitor layout: one precomputed table lookup
+        target_x, target_y = self.mapping.map_point(hand_x, hand_y, frame_width, frame_height)
+        if self.acceleration is not None:
+            target_x, target_y = self.acceleration.apply(target_x, target_y)
         
         # Add to smoothing buffer
         self.smoother.add_position(target_x, target_y)
@@ -76,14 +89,6 @@ class MouseController:
         # Move mouse
         if smooth_x is not None and smooth_y is not None:
             try:
-                pyautogui.moveTo(smooth_x, smooth_y, duration=0)
+                self.move_to(smooth_x, smooth_y)
             except:
-                pass
-                
-    def _apply_edge_dampening(self, value):
-        """Reduce sensitivity near edges"""
-        if value < self.edge_margin:
-            return value * (1 - self.edge_margin) / self.edge_margin
-        elif value > (1 - self.edge_margin):
-            return self.edge_margin + (value - (1 - self.edge_margin)) * (1 - self.edge_margin) / self.edge_margin
-        return value
\ No newline at end of file
+                pass
\ No newline at end of file
@@ -0,0 +1,303 @@
+# multi_camera.py
+"""
+Concurrent multi-camera capture with fused hand detections
+
+Each camera is read on its own thread into a latest-frame slot, so a slow
+or stalled device never blocks the others. Hand detection runs on a
+DetectorPool (MediaPipe does its work outside the GIL) with one graph per
+camera by default, since a graph tracks hands across its own frames.
+
+Cameras that have not seen a hand for `idle_after` seconds drop to one
+detection every `idle_interval` seconds, so the total inference cost follows
+where the hands are rather than how many cameras are plugged in.
+
+Detections are fused per handedness: the most confident camera wins, with a
+small margin before switching cameras so the cursor doesn't jump between
+views. The fused hands come out as (21, 2) pixel arrays in a common frame
+size, ready for GestureController.
+
+    python multi_camera.py                # cameras from config.CAMERA_INDICES
+    python multi_camera.py --cameras 0 2 --headless
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+import cv2
+import numpy as np
+
+import config
+from console_log import console
+from detector_pool import DetectorPool
+from scheduling import apply_stage, configure_process, print_startup_report
+
+
+class CameraStream:
+    """One camera: a capture thread and its activity state"""
+
+    def __init__(self, name, source):
+        self.name = name
+        self.source = source
+        self.frame = None
+        self.frame_time = None
+        self.seq = 0             # frames captured
+        self.detected_seq = 0    # last frame sent to the detector
+        self.detections = 0
+        self.pending = None      # in-flight detection future
+        self.last_detect = float("-inf")
+        self.last_hand = float("-inf")
+        self.pending_frame = None
+        self.result = None       # (frame_time, frame, [(label, score, points), ...])
+        self.result_at = None    # when the result came back (poll clock)
+        self._lock = threading.Lock()
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name=f"camera-{name}", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop = True
+        self._thread.join(timeout=2.0)
+        self.source.release()
+
+    def _run(self):
+        apply_stage("capture")
+        while not self._stop:
+            success, img = self.source.read()
+            if not success:
+                if getattr(self.source, "finished", False):
+                    break
+                continue
+            img = cv2.flip(img, 1)  # mirror like the single-camera apps (handedness depends on it)
+            with self._lock:
+                self.frame = img
+                self.frame_time = self.source.timestamp
+                self.seq += 1
+
+    @property
+    def finished(self):
+        return not self._thread.is_alive() and self._thread.ident is not None
+
+    def latest(self):
+        with self._lock:
+            return self.seq, self.frame, self.frame_time
+
+    def active(self, now, idle_after):
+        return now - self.last_hand < idle_after
+
+
+class MultiCamera:
+    """Captures N cameras, detects on a worker pool and fuses hands by confidence"""
+
+    def __init__(self, sources, pool=None, idle_after=1.0, idle_interval=0.25, max_age=0.15,
+                 switch_margin=0.05, frame_size=(640, 480), clock=time.monotonic):
+        """
+        Args:
+            sources: {name: capture} with cv2.VideoCapture-like read()/timestamp
+            pool: DetectorPool to run on (defaults to one graph per camera)
+            idle_after: Seconds without a hand before a camera goes idle
+            idle_interval: Seconds between detections on an idle camera
+            max_age: Detections older than this are not fused
+            switch_margin: Confidence advantage needed to move a hand to another camera
+            frame_size: (width, height) of the fused output frame
+        """
+        self.streams = [CameraStream(name, src) for name, src in sources.items()]
+        self.own_pool = pool is None
+        self.pool = pool or DetectorPool(graphs=len(self.streams))
+        self.idle_after = idle_after
+        self.idle_interval = idle_interval
+        self.max_age = max_age
+        self.switch_margin = switch_margin
+        self.frame_size = frame_size
+        self.clock = clock
+        self.owner = {}  # handedness label -> camera name currently providing it
+
+    def start(self):
+        for stream in self.streams:
+            stream.start()
+
+    def stop(self):
+        for stream in self.streams:
+            stream.stop()
+            self.pool.unpin(stream.name)
+        if self.own_pool:
+            self.pool.close()
+
+    @property
+    def finished(self):
+        return all(s.finished for s in self.streams) and not any(s.pending for s in self.streams)
+
+    def _schedule(self, now):
+        for stream in self.streams:
+            if stream.pending is not None:
+                continue
+            seq, frame, frame_time = stream.latest()
+            if frame is None or seq == stream.detected_seq:
+                continue
+            if not stream.active(now, self.idle_after) and \
+                    now - stream.last_detect < self.idle_interval:
+                continue
+            stream.detected_seq = seq
+            stream.last_detect = now
+            stream.pending = self.pool.submit(stream.name, frame, frame_time)
+            stream.pending_frame = frame
+
+    def _collect(self, now):
+        fresh = False
+        for stream in self.streams:
+            future = stream.pending
+            if future is None or not future.done():
+                continue
+            stream.pending = None
+            stream.detections += 1
+            try:
+                result = future.result()
+                hands = list(zip(result.labels, result.scores, result.landmarks))
+                frame_time = result.frame_time
+            except Exception as e:
+                console.error("Detector failed on camera %s: %s", stream.name, e,
+                              key=f"detector_{stream.name}")
+                hands, frame_time = [], None
+            stream.result = (frame_time, stream.pending_frame, hands)
+            stream.result_at = now
+            if hands:
+                stream.last_hand = now
+            fresh = True
+        return fresh
+
+    def _fuse(self, now):
+        """Pick one detection per handedness label across cameras"""
+        candidates = {}
+        for stream in self.streams:
+            if stream.result is None:
+                continue
+            if now - stream.result_at > self.max_age:
+                continue
+            frame_time, _, hands = stream.result
+            for label, score, pts in hands:
+                candidates.setdefault(label, []).append((score, stream.name, pts, frame_time))
+
+        fused = []
+        for label, options in candidates.items():
+            options.sort(key=lambda o: o[0], reverse=True)
+            best = options[0]
+            owner = self.owner.get(label)
+            for option in options:
+                if option[1] == owner and option[0] + self.switch_margin >= best[0]:
+                    best = option
+                    break
+            self.owner[label] = best[1]
+            score, name, pts, frame_time = best
+            pixels = (pts * self.frame_size).astype(np.int32)
+            fused.append({"label": label, "score": score, "camera": name,
+                          "points": pixels, "frame_time": frame_time})
+        for label in list(self.owner):
+            if label not in candidates:
+                del self.owner[label]
+        return fused
+
+    def poll(self, timeout=0.05):
+        """
+        Schedule detections and wait for at least one to finish
+        Returns: list of fused hands (dicts with label, score, camera, points,
+                 frame_time), or None if no detection finished within timeout
+        """
+        now = self.clock()
+        self._schedule(now)
+        pending = [s.pending for s in self.streams if s.pending is not None]
+        if pending:
+            wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        else:
+            time.sleep(min(timeout, 0.005))
+        now = self.clock()
+        if not self._collect(now):
+            return None
+        return self._fuse(now)
+
+    def stats(self):
+        """Per camera: frames captured, detections run, and whether it is active"""
+        now = self.clock()
+        return {s.name: {"frames": s.seq, "detections": s.detections,
+                         "active": s.active(now, self.idle_after)}
+                for s in self.streams}
+
+
+def _tile(multi, size=(320, 240)):
+    """Side-by-side previews of each camera's last detected frame with its hands"""
+    from renderer import draw_hand
+    tiles = []
+    now = multi.clock()
+    for stream in multi.streams:
+        tile = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+        if stream.result is not None:
+            _, frame, hands = stream.result
+            tile = cv2.resize(frame, size)
+            for _, _, pts in hands:
+                draw_hand(tile, (pts * size).astype(np.int32))
+        state = "ACTIVE" if stream.active(now, multi.idle_after) else "IDLE"
+        cv2.putText(tile, f"cam {stream.name}: {state}", (8, 20),
+                    cv2.FONT_HERSHEY_PLAIN, 1.2, (0, 255, 255), 2)
+        tiles.append(tile)
+    return np.hstack(tiles)
+
+
+def main():
+    import pyautogui
+    from capture_supervisor import supervised_source
+    from gesture_controller import GestureController
+    from input_backend import default_backend
+
+    parser = argparse.ArgumentParser(description="Multi-camera hand gesture control")
+    parser.add_argument("--cameras", nargs="+", default=config.CAMERA_INDICES,
+                        help="camera indices or frame source specs")
+    parser.add_argument("--headless", action="store_true")
+    args = parser.parse_args()
+    if not args.cameras:
+        parser.error("no cameras: set CAMERA_INDICES in config.py or pass --cameras")
+
+    pyautogui.FAILSAFE = False
+    configure_process()
+    sources = {str(spec): supervised_source(spec) for spec in args.cameras}
+    multi = MultiCamera(sources, idle_after=config.CAMERA_IDLE_AFTER,
+                        idle_interval=config.CAMERA_IDLE_INTERVAL)
+    inputs = default_backend()
+    controller = GestureController(inputs.size())
+    multi.start()
+    print(f"Fusing {len(sources)} cameras, press ESC to exit")
+    print_startup_report()
+
+    last_stats = time.monotonic()
+    while not multi.finished:
+        fused = multi.poll()
+        if fused is not None:
+            # Hands are tracked on the fused stream, by left/right
+            fused.sort(key=lambda hand: hand["label"])
+            hand_points = [hand["points"] for hand in fused]
+            frame_time = max((h["frame_time"] for h in fused if h["frame_time"]),
+                             default=time.time())
+            gesture_label = controller.process(hand_points, multi.frame_size, frame_time,
+                                               scores=[hand["score"] for hand in fused])
+            if gesture_label != "NONE":
+                console.info("Gesture: %s (%s)", gesture_label,
+                             ", ".join(f"{h['label']}@cam{h['camera']}" for h in fused),
+                             key="gesture", every=0.5)
+        if time.monotonic() - last_stats > 10:
+            last_stats = time.monotonic()
+            console.info("Cameras: %s", multi.stats())
+        if not args.headless:
+            cv2.imshow("Multi-camera Hand Control", _tile(multi))
+            if cv2.waitKey(1) & 0xFF == 27:
+                break
+
+    multi.stop()
+    inputs.close()
+    if not args.headless:
+        cv2.destroyAllWindows()
+    for name, s in multi.stats().items():
+        print(f"cam {name}: {s['frames']} frames captured, {s['detections']} detections")
+
+
+if __name__ == "__main__":
+    main()
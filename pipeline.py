@@ -0,0 +1,290 @@
+# pipeline.py
+"""
+Single-process gesture pipeline with plugins
+
+main.py, VolumeHandControl.py, handgesturePicksUp.py and AirMouse each run
+their own capture -> MediaPipe -> landmarks loop, so running two features
+means two camera readers and two graphs. PipelineHost runs capture and
+inference once per frame and hands the shared results (a Frame) to every
+enabled plugin in order (see plugins/).
+
+Every plugin has a time budget. Its run time is measured on every call;
+a plugin that goes over budget is warned about (rate limited) and skips
+the next frame or few, in proportion to the overrun, so one slow feature
+cannot drag the frame rate of the others down with it. Plugin exceptions
+are logged and counted instead of stopping the loop.
+
+    python pipeline.py                          # plugins from config.PLUGINS
+    python pipeline.py --plugins mouse volume --source clip.mp4 --headless
+"""
+import argparse
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+import pyautogui
+
+import config
+from capture_supervisor import supervised_source
+from clock import SystemClock, SimulatedClock, FpsCounter
+from console_log import console
+from detector_pool import mediapipe_graph, to_hand_result
+from features import HandFeatures
+from input_backend import default_backend
+from plugins import Plugin, load_plugin, AVAILABLE
+from profiler import SamplingProfiler
+from renderer import draw_hand, HudOverlay
+from scheduling import configure_process, print_startup_report
+
+
+class Frame:
+    """One frame's shared results: the image, its hands and their features"""
+
+    def __init__(self, img, frame_time, hands, labels=(), scores=()):
+        """
+        Args:
+            img: Mirrored BGR frame (plugins may draw on it)
+            frame_time: Capture time of the frame
+            hands: (21, 2) pixel landmark arrays, one per detected hand
+            labels / scores: Handedness ("Left"/"Right") and its confidence per hand
+        """
+        self.img = img
+        self.frame_time = frame_time
+        h, w = img.shape[:2]
+        self.size = (w, h)
+        self.hands = hands
+        self.labels = labels
+        self.scores = scores
+        self._features = {}
+
+    def features(self, i=0):
+        """HandFeatures of hand i, computed once per frame however many plugins ask"""
+        features = self._features.get(i)
+        if features is None:
+            features = self._features[i] = HandFeatures(self.hands[i])
+        return features
+
+
+class PluginSlot:
+    """A loaded plugin with its budget and timing stats"""
+
+    def __init__(self, plugin, budget_ms, history=500):
+        self.plugin = plugin
+        self.name = plugin.name
+        self.budget = budget_ms / 1000.0
+        self.skip = 0  # frames left to skip after an overrun
+        self.calls = 0
+        self.skipped = 0
+        self.errors = 0
+        self.overruns = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=history)
+
+    def record(self, elapsed):
+        self.calls += 1
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+        self.recent.append(elapsed)
+
+    def stats(self):
+        recent = np.array(self.recent) * 1000
+        return {"calls": self.calls, "skipped": self.skipped, "errors": self.errors,
+                "overruns": self.overruns, "budget_ms": self.budget * 1000,
+                "mean_ms": self.total / self.calls * 1000 if self.calls else 0.0,
+                "p95_ms": float(np.percentile(recent, 95)) if len(recent) else 0.0,
+                "max_ms": self.max * 1000}
+
+
+class PipelineHost:
+    """Calls the enabled plugins on each frame's shared results"""
+
+    def __init__(self, plugins=None, clock=None, inputs=None, event_log=None,
+                 max_skip=None):
+        """
+        Args:
+            plugins: Plugin names (defaults to config.PLUGINS) or Plugin instances
+            clock: Time source shared by the plugins (defaults to the system clock)
+            inputs: InputBackend shared by the plugins (defaults to config.INPUT_BACKEND)
+            event_log: Optional EventLog for plugins that record actions
+            max_skip: Most frames a plugin skips after going over budget (0 = never skip)
+        """
+        self.clock = clock or SystemClock()
+        self.inputs = inputs or default_backend()
+        self.screen_size = self.inputs.size()
+        self.event_log = event_log
+        self.max_skip = config.PLUGIN_MAX_SKIP if max_skip is None else max_skip
+        self.profiler = None
+        self.slots = []
+        for plugin in config.PLUGINS if plugins is None else plugins:
+            self.add(plugin)
+
+    def add(self, plugin, budget_ms=None, **options):
+        """
+        Load and enable a plugin
+        Args:
+            plugin: Registered name (see plugins.AVAILABLE) or a Plugin instance
+            budget_ms: Overrides config.PLUGIN_BUDGETS and the plugin's default
+            options: Passed to the plugin's constructor
+        """
+        if not isinstance(plugin, Plugin):
+            plugin = load_plugin(plugin)(self, **options)
+        if budget_ms is None:
+            budget_ms = config.PLUGIN_BUDGETS.get(plugin.name, plugin.budget_ms)
+        self.slots.append(PluginSlot(plugin, budget_ms))
+        return plugin
+
+    def process(self, frame):
+        """
+        Run every plugin on one frame
+        Returns: list of (plugin name, status text) for the plugins that reported one
+        """
+        statuses = []
+        for slot in self.slots:
+            if slot.skip:
+                slot.skip -= 1
+                slot.skipped += 1
+                continue
+            if self.profiler is not None:
+                self.profiler.mark("plugin:" + slot.name)
+            start = time.perf_counter()
+            try:
+                status = slot.plugin.process(frame)
+            except Exception as e:
+                slot.errors += 1
+                status = None
+                console.error("Plugin %s failed: %s", slot.name, e, key="plugin_" + slot.name)
+            elapsed = time.perf_counter() - start
+            slot.record(elapsed)
+            if elapsed > slot.budget:
+                slot.overruns += 1
+                slot.skip = min(int(elapsed / slot.budget) - 1, self.max_skip)
+                console.warning("Plugin %s took %.1f ms (budget %.1f ms)", slot.name,
+                                elapsed * 1000, slot.budget * 1000,
+                                key="budget_" + slot.name, every=5.0)
+            if status:
+                statuses.append((slot.name, status))
+        return statuses
+
+    def stats(self):
+        """Timing stats per plugin"""
+        return {slot.name: slot.stats() for slot in self.slots}
+
+    def close(self):
+        for slot in self.slots:
+            try:
+                slot.plugin.close()
+            except Exception as e:
+                console.error("Plugin %s failed to close: %s", slot.name, e)
+        self.inputs.flush()
+
+
+def print_stats(host):
+    print(f"{'plugin':<10} {'calls':>7} {'mean ms':>8} {'p95 ms':>7} {'max ms':>7} "
+          f"{'budget':>7} {'over':>5} {'skip':>5} {'err':>4}")
+    for name, s in host.stats().items():
+        print(f"{name:<10} {s['calls']:>7} {s['mean_ms']:>8.2f} {s['p95_ms']:>7.2f} "
+              f"{s['max_ms']:>7.2f} {s['budget_ms']:>7.1f} {s['overruns']:>5} "
+              f"{s['skipped']:>5} {s['errors']:>4}")
+
+
+def main(source=None, plugins=None, clock=None, headless=False):
+    """
+    Capture, detect once per frame and run the plugins
+    Args:
+        source: Frame source spec or FrameSource (defaults to config.FRAME_SOURCE)
+        plugins: Plugin names (defaults to config.PLUGINS)
+        clock: Time source for cooldowns and FPS (defaults to the system clock)
+        headless: Don't open a window (runs until the source is exhausted)
+    """
+    clock = clock or SystemClock()
+    configure_process()
+    if source is None:
+        source = config.FRAME_SOURCE
+    cap = supervised_source(source, clock=clock) if isinstance(source, (int, str)) else source
+
+    hands = mediapipe_graph()
+    event_log = None
+    if config.EVENT_LOG_PATH:
+        from event_log import EventLog
+        event_log = EventLog(config.EVENT_LOG_PATH)
+    host = PipelineHost(plugins, clock=clock, event_log=event_log)
+    hud = HudOverlay()
+    fps_counter = FpsCounter(clock)
+    profiler = SamplingProfiler(config.PROFILE_DURATION, config.PROFILE_INTERVAL,
+                                config.PROFILE_DIR)
+    profiler.install_signal()
+    host.profiler = profiler
+
+    print(f"Plugins: {', '.join(slot.name for slot in host.slots) or 'none'}")
+    print_startup_report()
+    print("Press ESC to exit, 'p' to profile")
+
+    shown = 0
+    while True:
+        profiler.mark("capture")
+        success, img = cap.read()
+        if not success:
+            if cap.finished:
+                break
+            if not headless and cv2.waitKey(1) & 0xFF == 27:
+                break
+            continue
+        frame_time = cap.timestamp
+        img = cv2.flip(img, 1)
+        h, w = img.shape[:2]
+
+        profiler.mark("inference")
+        result = to_hand_result(hands.process(cv2.cvtColor(img, cv2.COLOR_BGR2RGB)),
+                                None, frame_time, (w, h))
+        points = result.pixel_points()
+        for pts in points:
+            draw_hand(img, pts)
+
+        frame = Frame(img, frame_time, points, result.labels, result.scores)
+        statuses = host.process(frame)
+
+        profiler.mark("render")
+        if config.DISPLAY_FPS:
+            hud.set_text("fps", f"FPS: {int(fps_counter.tick())}", (10, 40))
+        for i, (name, status) in enumerate(statuses):
+            hud.set_text(f"status{i}", status, (10, 80 + 40 * i))
+        for i in range(len(statuses), shown):
+            hud.clear_text(f"status{i}")
+        shown = len(statuses)
+        hud.render(img)
+
+        key = -1
+        if not headless:
+            cv2.imshow("Hand Gesture Pipeline", img)
+            key = cv2.waitKey(1) & 0xFF
+        if key == 27:
+            break
+        if key == ord('p'):
+            profiler.toggle()
+
+    cap.release()
+    host.close()
+    host.inputs.close()
+    if hasattr(hands, "close"):
+        hands.close()
+    if event_log is not None:
+        event_log.close()
+    if not headless:
+        cv2.destroyAllWindows()
+    print_stats(host)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hand gesture pipeline host")
+    parser.add_argument("--plugins", nargs="*", choices=sorted(AVAILABLE),
+                        help="plugins to run, in order (defaults to config.PLUGINS)")
+    parser.add_argument("--source", help="camera index, video file, image directory, "
+                                         "synthetic or shm:<name>:<w>x<h>")
+    parser.add_argument("--simulated", action="store_true",
+                        help="drive cooldowns from the frame timestamps")
+    parser.add_argument("--headless", action="store_true", help="no preview window")
+    args = parser.parse_args()
+    pyautogui.FAILSAFE = False
+    main(args.source, args.plugins, SimulatedClock() if args.simulated else None, args.headless)
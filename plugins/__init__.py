@@ -0,0 +1,64 @@
+# plugins/__init__.py
+"""
+Gesture features that run inside the pipeline host (pipeline.py)
+
+A plugin gets every frame's shared results (landmarks, handedness, lazily
+computed HandFeatures) from the host and acts on them. Plugins are listed
+here by name and only imported when enabled in config.PLUGINS, so unused
+features cost nothing at startup.
+
+Writing a plugin:
+    class MyPlugin(Plugin):
+        name = "my_plugin"
+        budget_ms = 2.0
+
+        def process(self, frame):
+            ...                  # return a short status for the HUD, or None
+"""
+import importlib
+
+# name -> "module:Class", imported on first use
+AVAILABLE = {
+    "gestures": "plugins.gestures:GesturesPlugin",
+    "mouse": "plugins.mouse:MousePlugin",
+    "volume": "plugins.volume:VolumePlugin",
+    "picks_up": "plugins.picks_up:PicksUpPlugin",
+    "zoom": "plugins.zoom:ZoomPlugin",
+    "scroll": "plugins.scroll:ScrollPlugin",
+}
+
+
+class Plugin:
+    """Base class: one feature driven by the host's per-frame results"""
+
+    name = "plugin"
+    budget_ms = 5.0  # time per frame this plugin may use (see config.PLUGIN_BUDGETS)
+
+    def __init__(self, host):
+        """
+        Args:
+            host: The PipelineHost (shared clock, input backend, screen size, event log)
+        """
+        self.host = host
+
+    def process(self, frame):
+        """
+        Handle one frame
+        Args:
+            frame: pipeline.Frame (read-only; draw on frame.img if needed)
+        Returns: status text for the HUD, or None
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Release anything held (buttons, devices) when the host stops"""
+
+
+def load_plugin(name):
+    """Import and return the plugin class registered as `name`"""
+    try:
+        target = AVAILABLE[name]
+    except KeyError:
+        raise ValueError(f"unknown plugin {name!r} (available: {', '.join(AVAILABLE)})")
+    module, cls = target.split(":")
+    return getattr(importlib.import_module(module), cls)
@@ -0,0 +1,34 @@
+# plugins/gestures.py
+"""
+main.py's gesture set: launches, volume steps and pinch-drag mouse
+"""
+from console_log import console
+from gesture_controller import GestureController, SystemActions
+from gesture_stabilizer import format_stats
+from plugins import Plugin
+
+
+class GesturesPlugin(Plugin):
+    """Runs GestureController on the host's landmarks"""
+
+    name = "gestures"
+    budget_ms = 4.0
+
+    def __init__(self, host):
+        super().__init__(host)
+        self.controller = GestureController(host.screen_size, SystemActions(host.inputs),
+                                            event_log=host.event_log, clock=host.clock)
+
+    def process(self, frame):
+        label = self.controller.process(frame.hands, frame.size, frame.frame_time, frame.img,
+                                        frame.scores)
+        return f"Gesture: {label}"
+
+    def close(self):
+        # Don't leave the button held if the host stops mid-drag
+        for track in self.controller.tracker.tracks:
+            if track.state.dragging:
+                self.controller.backend.mouse_up()
+                track.state.dragging = False
+        self.controller.backend.flush()
+        console.info("gestures: %s", format_stats(self.controller.stabilizer))
@@ -0,0 +1,29 @@
+# plugins/mouse.py
+"""
+Air mouse: index finger moves the cursor, a pinch clicks (HandTrackingMouse.AirMouse)
+"""
+from HandTrackingMouse import AirMouse
+from plugins import Plugin
+from screen_mapping import default_mapping
+
+
+class MousePlugin(Plugin):
+    """Drives AirMouse with the first detected hand"""
+
+    name = "mouse"
+    budget_ms = 2.0
+
+    def __init__(self, host):
+        super().__init__(host)
+        # Calibrated region and all monitors; mirror=True because AirMouse gets unmirrored x
+        self.mouse = AirMouse(clock=host.clock, backend=host.inputs,
+                              mapping=default_mapping(host.screen_size, mirror=True))
+
+    def process(self, frame):
+        if not frame.hands:
+            return None
+        w, h = frame.size
+        # AirMouse mirrors x itself, and the host's frames are already mirrored
+        lmList = [[i, w - x, y] for i, x, y in frame.features(0).lmList]
+        self.mouse.controlMouse(lmList, w, h)
+        return None
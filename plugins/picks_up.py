@@ -0,0 +1,40 @@
+# plugins/picks_up.py
+"""
+Hang loose opens myUTEP (handgesturePicksUp.py)
+"""
+import actions
+import config
+from console_log import console
+from gesture_stabilizer import stabilizer_from_config, format_stats
+from gestures import is_hang_loose
+from plugins import Plugin
+
+
+class PicksUpPlugin(Plugin):
+    """Opens myUTEP when the hang loose gesture becomes stable, with a cooldown"""
+
+    name = "picks_up"
+    budget_ms = 1.0
+
+    def __init__(self, host, launcher=None):
+        super().__init__(host)
+        self.launcher = launcher or actions.open_myutep
+        self.stabilizer = stabilizer_from_config()
+        self.last_launch = float("-inf")
+
+    def process(self, frame):
+        score = max((s for i, s in enumerate(frame.scores)
+                     if is_hang_loose(frame.features(i).fingers)), default=None)
+        if score is None:
+            self.stabilizer.update("NONE")
+        else:
+            self.stabilizer.update("PICKS UP!", score)
+        if self.stabilizer.entered == "PICKS UP!":
+            now = self.host.clock()
+            if now - self.last_launch > config.HANG_COOLDOWN:
+                self.launcher()
+                self.last_launch = now
+        return "PICKS UP!" if self.stabilizer.stable == "PICKS UP!" else None
+
+    def close(self):
+        console.info("picks_up: %s", format_stats(self.stabilizer))
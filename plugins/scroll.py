@@ -0,0 +1,26 @@
+# plugins/scroll.py
+"""
+Inertial scrolling (inertial_scroll.py): two fingers up and move the hand
+"""
+from inertial_scroll import InertialScroller
+from plugins import Plugin
+
+
+class ScrollPlugin(Plugin):
+    """Feeds the first hand to an InertialScroller running on its own timer thread"""
+
+    name = "scroll"
+    budget_ms = 1.0
+
+    def __init__(self, host, **options):
+        super().__init__(host)
+        self.scroller = InertialScroller(host.inputs, **options).start()
+
+    def process(self, frame):
+        hand = frame.features(0) if frame.hands else None
+        if self.scroller.update(hand, frame.frame_time):
+            return f"Scroll: {self.scroller.velocity:+.1f}/s"
+        return None
+
+    def close(self):
+        self.scroller.stop()
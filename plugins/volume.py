@@ -0,0 +1,35 @@
+# plugins/volume.py
+"""
+Absolute volume from the thumb-index distance (VolumeHandControl.py)
+"""
+import cv2
+
+from VolumeHandControl import length_to_volume, set_volume
+from plugins import Plugin
+
+
+class VolumePlugin(Plugin):
+    """Maps the pinch distance of the first hand to the system volume"""
+
+    name = "volume"
+    budget_ms = 2.0
+
+    def __init__(self, host):
+        super().__init__(host)
+        self.volPer = 0
+        self.volBar = 400
+        self.applied = None
+
+    def process(self, frame):
+        if frame.hands:
+            features = frame.features(0)
+            self.volPer, self.volBar = length_to_volume(features.pinch_distance)
+            # Each set_volume spawns a mixer process: only call it when the value changes
+            if self.volPer != self.applied:
+                set_volume(self.volPer)
+                self.applied = self.volPer
+            lmList = features.lmList
+            cv2.line(frame.img, tuple(lmList[4][1:]), tuple(lmList[8][1:]), (255, 0, 255), 3)
+        cv2.rectangle(frame.img, (50, 150), (85, 400), (0, 0, 0), 3)
+        cv2.rectangle(frame.img, (50, int(self.volBar)), (85, 400), (0, 255, 0), cv2.FILLED)
+        return f"Volume: {self.volPer}%"
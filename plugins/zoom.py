@@ -0,0 +1,27 @@
+# plugins/zoom.py
+"""
+Two-hand zoom (zoom.py): ctrl + wheel or ctrl + =/- from the hand spread
+"""
+from plugins import Plugin
+from zoom import ZoomController
+
+
+class ZoomPlugin(Plugin):
+    """Zooms while both hands are in view"""
+
+    name = "zoom"
+    budget_ms = 1.0
+
+    def __init__(self, host, **options):
+        super().__init__(host)
+        self.zoom = ZoomController(host.inputs, clock=host.clock, **options)
+
+    def process(self, frame):
+        hands = [frame.features(i) for i in range(len(frame.hands))]
+        level = self.zoom.update(hands)
+        if level is None:
+            return None
+        return f"Zoom: {level:+.1f}"
+
+    def close(self):
+        self.zoom.release()
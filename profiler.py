@@ -0,0 +1,125 @@
+# profiler.py
+"""
+On-demand sampling profiler for the live frame loop
+
+The frame loop calls profiler.mark("capture"), mark("inference"), ... as it
+moves through the pipeline; when disabled that is a single attribute store.
+When a profile is started (SIGUSR1, or a key in the OpenCV window) a
+background thread samples the loop thread's Python stack for a set duration
+and writes:
+    profile-<time>.collapsed  collapsed stacks for flamegraph.pl / speedscope
+    profile-<time>.txt        per-function table, tagged with pipeline stage
+"""
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+
+# Samples whose stack passes through these modules (matched on the top-level
+# package of the frame's __name__, so pyautogui.* and Xlib.* count too) are
+# tagged as the "action" stage
+ACTION_MODULES = frozenset({"actions", "mouse_smoother", "input_backend", "pyautogui", "Xlib", "evdev"})
+
+
+class SamplingProfiler:
+    """Samples one thread's stack at a fixed interval while enabled"""
+
+    def __init__(self, duration=10.0, interval=0.005, out_dir="."):
+        self.duration = duration
+        self.interval = interval
+        self.out_dir = out_dir
+        self.stage = "idle"
+        self.running = False
+        self._target = threading.get_ident()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def mark(self, stage):
+        """Tag subsequent samples with a pipeline stage (cheap enough to leave in)"""
+        self.stage = stage
+
+    def install_signal(self, signum=getattr(signal, "SIGUSR1", None)):
+        """Toggle profiling with a signal, e.g. `kill -USR1 <pid>`"""
+        if signum is not None:
+            signal.signal(signum, lambda *_: self.toggle())
+
+    def toggle(self):
+        """Start a profile, or stop the running one early"""
+        if self.running:
+            self.stop()
+        else:
+            self.start()
+
+    def start(self, duration=None, thread_id=None):
+        """
+        Start sampling in the background
+        Args:
+            duration: Seconds to sample (defaults to self.duration)
+            thread_id: Thread to sample (defaults to the thread that created the profiler)
+        """
+        if self.running:
+            return
+        self.running = True
+        self._stop.clear()
+        target = thread_id or self._target
+        self._thread = threading.Thread(
+            target=self._run, args=(target, duration or self.duration),
+            name="sampling-profiler", daemon=True)
+        self._thread.start()
+        print(f"Profiling for {duration or self.duration:.1f}s...")
+
+    def stop(self):
+        """Stop sampling early; results are still written"""
+        self._stop.set()
+
+    def _run(self, target, duration):
+        stacks = Counter()
+        samples = 0
+        end = time.perf_counter() + duration
+        while time.perf_counter() < end and not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(target)
+            if frame is None:
+                break
+            stack = []
+            in_action = False
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                module = frame.f_globals.get("__name__") or ""
+                in_action = in_action or module.partition(".")[0] in ACTION_MODULES
+                frame = frame.f_back
+            stack.reverse()
+            stage = "action" if in_action else self.stage
+            stacks[(stage, tuple(stack))] += 1
+            samples += 1
+        self.running = False
+        self._write(stacks, samples)
+
+    def _write(self, stacks, samples):
+        """Write collapsed stacks and the per-function table"""
+        base = os.path.join(self.out_dir, time.strftime("profile-%Y%m%d-%H%M%S"))
+        with open(base + ".collapsed", "w") as f:
+            for (stage, stack), n in stacks.most_common():
+                f.write(";".join((stage,) + stack) + f" {n}\n")
+
+        self_counts = Counter()
+        total_counts = Counter()
+        stage_counts = Counter()
+        for (stage, stack), n in stacks.items():
+            stage_counts[stage] += n
+            self_counts[(stage, stack[-1])] += n
+            for func in set(stack):
+                total_counts[(stage, func)] += n
+
+        with open(base + ".txt", "w") as f:
+            f.write(f"{samples} samples at {self.interval * 1000:.1f} ms\n\n")
+            f.write(f"{'stage':<12} {'samples':>8} {'%':>6}\n")
+            for stage, n in stage_counts.most_common():
+                f.write(f"{stage:<12} {n:>8} {100 * n / max(samples, 1):6.1f}\n")
+            f.write(f"\n{'stage':<12} {'self%':>6} {'total%':>7}  function\n")
+            for (stage, func), n in total_counts.most_common(50):
+                f.write(f"{stage:<12} {100 * self_counts[(stage, func)] / max(samples, 1):6.1f} "
+                        f"{100 * n / max(samples, 1):7.1f}  {func}\n")
+        print(f"Profile written to {base}.collapsed and {base}.txt")
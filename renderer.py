@@ -0,0 +1,142 @@
+# renderer.py
+"""
+Fast skeleton and HUD rendering
+
+draw_hand() replaces mp.solutions.drawing_utils.draw_landmarks with one
+cv2.polylines call for the bones (plus one for the joints). HudOverlay keeps
+static HUD elements in a pre-rendered layer and only re-renders text when
+its value changes.
+"""
+import cv2
+import numpy as np
+
+from landmarks import HAND_CHAINS
+
+# Same look as the MediaPipe drawing_utils defaults
+BONE_COLOR = (224, 224, 224)
+JOINT_COLOR = (0, 0, 255)
+
+_CHAIN_INDEX = np.concatenate(HAND_CHAINS)
+_CHAIN_SPLITS = np.cumsum([len(chain) for chain in HAND_CHAINS])[:-1]
+
+
+def draw_hand(img, points, bone_color=BONE_COLOR, joint_color=JOINT_COLOR,
+              thickness=2, radius=3):
+    """
+    Draw one hand skeleton from a (21, 2) landmark array
+    Args:
+        img: BGR frame, drawn in place
+        points: int32 array of pixel coordinates
+        joint_color: None to skip drawing joints
+    """
+    pts = np.asarray(points, dtype=np.int32)
+    cv2.polylines(img, np.split(pts[_CHAIN_INDEX], _CHAIN_SPLITS), False,
+                  bone_color, thickness)
+    if joint_color is not None:
+        # A zero-length thick segment renders as a filled dot
+        joints = np.repeat(pts, 2, axis=0).reshape(-1, 2, 2)
+        cv2.polylines(img, joints, False, joint_color, radius * 2)
+    return img
+
+
+def draw_hands(img, hands, **kwargs):
+    """Draw every hand in a sequence of (21, 2) landmark arrays"""
+    for points in hands:
+        draw_hand(img, points, **kwargs)
+    return img
+
+
+def _blit(img, x, y, patch, mask, alpha):
+    """Copy a masked patch onto img at (x, y), clipped to the frame"""
+    h, w = img.shape[:2]
+    ph, pw = mask.shape
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + pw, w), min(y + ph, h)
+    if x0 >= x1 or y0 >= y1:
+        return
+    roi = img[y0:y1, x0:x1]
+    src = patch[y0 - y:y1 - y, x0 - x:x1 - x]
+    where = mask[y0 - y:y1 - y, x0 - x:x1 - x, None].astype(bool)
+    if alpha < 1.0:
+        src = cv2.addWeighted(roi, 1.0 - alpha, src, alpha, 0)
+    np.copyto(roi, src, where=where)
+
+
+def _render_patch(ops, shape):
+    """Rasterise drawing ops into a cropped (x, y, patch, mask) tuple"""
+    canvas = np.zeros(shape[:2] + (3,), dtype=np.uint8)
+    mask = np.zeros(shape[:2], dtype=np.uint8)
+    for fn, args, color, kwargs in ops:
+        fn(canvas, *args, color, **kwargs)
+        fn(mask, *args, 255, **kwargs)
+    ys, xs = np.nonzero(mask)
+    if len(xs) == 0:
+        return None
+    x0, x1, y0, y1 = xs.min(), xs.max() + 1, ys.min(), ys.max() + 1
+    return x0, y0, canvas[y0:y1, x0:x1].copy(), mask[y0:y1, x0:x1].copy()
+
+
+class HudOverlay:
+    """Cached HUD layer: static shapes rendered once, text re-rendered on change"""
+
+    def __init__(self, alpha=1.0):
+        self.alpha = alpha
+        self._static_ops = []
+        self._static = None
+        self._static_shape = None
+        self._texts = {}
+
+    def add_rect(self, pt1, pt2, color, thickness=1):
+        """Add a static rectangle (thickness=cv2.FILLED for a solid box)"""
+        self._static_ops.append((cv2.rectangle, (pt1, pt2), color, {"thickness": thickness}))
+        self._static = None
+
+    def add_line(self, pt1, pt2, color, thickness=1):
+        """Add a static line"""
+        self._static_ops.append((cv2.line, (pt1, pt2), color, {"thickness": thickness}))
+        self._static = None
+
+    def add_text(self, text, org, font=cv2.FONT_HERSHEY_PLAIN, scale=2,
+                 color=(0, 0, 0), thickness=2):
+        """Add a static text label"""
+        self._static_ops.append((cv2.putText, (text, org, font, scale), color,
+                                 {"thickness": thickness}))
+        self._static = None
+
+    def set_text(self, key, text, org, font=cv2.FONT_HERSHEY_PLAIN, scale=2,
+                 color=(0, 0, 0), thickness=2):
+        """
+        Set a dynamic text slot; it is only re-rendered when its arguments change
+        Args:
+            key: Slot name, e.g. "fps"
+            text, org, font, scale, color, thickness: Same as cv2.putText
+        """
+        spec = (text, org, font, scale, color, thickness)
+        cached = self._texts.get(key)
+        if cached is not None and cached[0] == spec:
+            return
+        (tw, th), baseline = cv2.getTextSize(text, font, scale, thickness)
+        pad = thickness
+        size = (th + baseline + 2 * pad, tw + 2 * pad)
+        patch = np.zeros(size + (3,), dtype=np.uint8)
+        mask = np.zeros(size, dtype=np.uint8)
+        local_org = (pad, th + pad)
+        cv2.putText(patch, text, local_org, font, scale, color, thickness)
+        cv2.putText(mask, text, local_org, font, scale, 255, thickness)
+        x, y = org[0] - pad, org[1] - th - pad
+        self._texts[key] = (spec, x, y, patch, mask)
+
+    def clear_text(self, key):
+        """Remove a dynamic text slot"""
+        self._texts.pop(key, None)
+
+    def render(self, img):
+        """Blend the static layer and all dynamic text onto img in place"""
+        if self._static_ops and (self._static is None or self._static_shape != img.shape):
+            self._static = _render_patch(self._static_ops, img.shape)
+            self._static_shape = img.shape
+        if self._static is not None:
+            _blit(img, *self._static, self.alpha)
+        for _, x, y, patch, mask in self._texts.values():
+            _blit(img, x, y, patch, mask, 1.0)
+        return img
@@ -0,0 +1,290 @@
+# scheduling.py
+"""
+CPU affinity and scheduling priority for the pipeline stages
+
+On a shared machine the capture and inference work gets preempted by other
+tenants, which shows up as latency spikes. Each stage can be given its own
+CPUs, a nice value and (where permitted) a real-time priority in
+config.SCHED_STAGES:
+    main       the frame loop (main.py / pipeline.py); MediaPipe's worker
+               threads are created from it and inherit its CPUs
+    capture    camera reader threads (multi_camera.py)
+    inference  DetectorPool graph threads (detector_pool.py)
+    cursor     the inertial scroll timer (inertial_scroll.py)
+    recorder   the session recorder's encoder thread (session_recorder.py);
+               when not configured it moves off the "main" CPUs at nice 10
+               rather than inheriting the frame loop's settings
+
+A stage is applied from inside its own thread with apply_stage(): on Linux
+affinity, nice values and scheduling policies are per thread, so they are
+set on the calling thread's id and other threads keep theirs. Settings the
+OS or the permissions don't allow are reported and skipped (a real-time
+request falls back to the nice value), never fatal. cv2.setNumThreads
+comes from config.OPENCV_THREADS.
+
+    python scheduling.py                 # effective configuration
+    python scheduling.py --benchmark --cpus 3 --realtime 10
+"""
+import argparse
+import multiprocessing
+import os
+import threading
+import time
+
+import numpy as np
+
+import config
+from console_log import console
+
+SUPPORTED = hasattr(os, "sched_setaffinity")
+
+_applied = {}  # stage -> effective settings, for the startup report
+BACKGROUND_STAGES = ("recorder",)  # get background_settings() when not configured
+_lock = threading.Lock()
+
+
+def current_settings():
+    """Affinity, nice value and scheduling policy of the calling thread"""
+    tid = threading.get_native_id()
+    state = {"thread": threading.current_thread().name, "tid": tid}
+    if SUPPORTED:
+        state["cpus"] = sorted(os.sched_getaffinity(tid))
+        state["nice"] = os.getpriority(os.PRIO_PROCESS, tid)
+        policy = os.sched_getscheduler(tid)
+        state["policy"] = {os.SCHED_OTHER: "other", os.SCHED_FIFO: "fifo",
+                           os.SCHED_RR: "rr"}.get(policy, str(policy))
+        state["rt_priority"] = os.sched_getparam(tid).sched_priority
+    return state
+
+
+def apply_stage(stage, settings=None):
+    """
+    Apply a stage's CPU settings to the calling thread
+    Args:
+        stage: Stage name (see config.SCHED_STAGES)
+        settings: {"cpus": [...], "nice": n, "realtime": priority}; defaults to the config
+    Returns: list of problems (empty if everything was applied)
+    """
+    if settings is None:
+        settings = config.SCHED_STAGES.get(stage)
+        if settings is None and stage in BACKGROUND_STAGES:
+            settings = background_settings()
+    if not settings:
+        return []
+    problems = []
+    tid = threading.get_native_id()
+    if not SUPPORTED:
+        problems.append("CPU affinity and priorities are not supported on this OS")
+    else:
+        cpus = settings.get("cpus")
+        if cpus:
+            try:
+                os.sched_setaffinity(tid, cpus)
+            except OSError as e:
+                problems.append(f"affinity {cpus}: {e.strerror}")
+        realtime = settings.get("realtime")
+        if realtime:
+            try:
+                os.sched_setscheduler(tid, os.SCHED_FIFO, os.sched_param(realtime))
+            except OSError as e:
+                problems.append(f"real-time priority {realtime}: {e.strerror}")
+                realtime = None
+        nice = settings.get("nice")
+        if nice is not None and not realtime:
+            try:
+                os.setpriority(os.PRIO_PROCESS, tid, nice)
+            except OSError as e:
+                problems.append(f"nice {nice}: {e.strerror}")
+    state = current_settings()
+    state["problems"] = problems
+    with _lock:
+        _applied[stage] = state
+    for problem in problems:
+        console.warning("Scheduling %s: %s", stage, problem, key="sched_" + stage)
+    return problems
+
+
+def background_settings():
+    """Off the CPUs reserved for the "main" stage (if any), at a lower priority"""
+    reserved = set((config.SCHED_STAGES.get("main") or {}).get("cpus") or ())
+    cpus = sorted(set(range(os.cpu_count() or 1)) - reserved) if reserved else None
+    return {"cpus": cpus, "nice": 10}
+
+
+def set_opencv_threads(n=None):
+    """cv2.setNumThreads from config.OPENCV_THREADS (None leaves OpenCV's default)"""
+    import cv2
+    n = config.OPENCV_THREADS if n is None else n
+    if n is not None:
+        cv2.setNumThreads(n)
+    return cv2.getNumThreads()
+
+
+def configure_process():
+    """
+    Startup: OpenCV threads and the "main" stage for the calling (main) thread
+    Call before creating the Hands graph so MediaPipe's threads inherit the CPUs.
+    """
+    set_opencv_threads()
+    apply_stage("main")
+
+
+def startup_report():
+    """Lines describing the effective configuration"""
+    import cv2
+    lines = []
+    if SUPPORTED:
+        lines.append(f"CPUs available: {len(os.sched_getaffinity(0))} of {os.cpu_count()}, "
+                     f"OpenCV threads: {cv2.getNumThreads()}")
+    else:
+        lines.append(f"OpenCV threads: {cv2.getNumThreads()} (no affinity support)")
+    with _lock:
+        applied = dict(_applied)
+    for stage in sorted(set(config.SCHED_STAGES) | set(applied)):
+        state = applied.get(stage)
+        if state is None:
+            lines.append(f"  {stage:<10} {config.SCHED_STAGES[stage]} (applied when it starts)")
+            continue
+        line = f"  {stage:<10} thread {state['thread']}"
+        if SUPPORTED:
+            line += (f": CPUs {_ranges(state['cpus'])}, nice {state['nice']}, "
+                     f"policy {state['policy']}")
+            if state["rt_priority"]:
+                line += f" {state['rt_priority']}"
+        if state["problems"]:
+            line += " (not applied: " + "; ".join(state["problems"]) + ")"
+        lines.append(line)
+    return lines
+
+
+def print_startup_report():
+    for line in startup_report():
+        print(line)
+
+
+def _ranges(cpus):
+    """[0, 1, 2, 5] -> "0-2,5" """
+    out = []
+    for cpu in cpus:
+        if out and cpu == out[-1][1] + 1:
+            out[-1][1] = cpu
+        else:
+            out.append([cpu, cpu])
+    return ",".join(f"{a}-{b}" if b > a else f"{a}" for a, b in out)
+
+
+def _hog(cpus, stop):
+    """A busy process standing in for another tenant"""
+    if cpus and SUPPORTED:
+        os.sched_setaffinity(0, cpus)
+    x = 0
+    while not stop.is_set():
+        for _ in range(10000):
+            x += 1
+
+
+def _periodic(hz, seconds, work_ms, stage_settings, out):
+    """A cursor-like thread: wake at hz, do work_ms of work, record lateness and work time"""
+    if stage_settings:
+        apply_stage("benchmark", stage_settings)
+    a = np.random.default_rng(0).random((64, 64))
+    interval = 1.0 / hz
+    late, busy = [], []
+    next_tick = time.perf_counter() + interval
+    end = next_tick + seconds
+    while next_tick < end:
+        time.sleep(max(next_tick - time.perf_counter(), 0.0))
+        start = time.perf_counter()
+        late.append(start - next_tick)
+        while time.perf_counter() - start < work_ms / 1000.0:
+            a = a @ a
+            a /= np.abs(a).max()
+        busy.append(time.perf_counter() - start)
+        next_tick += interval
+    out.extend((late, busy))
+
+
+def run_case(seconds, hogs, hog_cpus, stage_settings, hz=120.0, work_ms=1.0):
+    """
+    One benchmark case: the periodic thread with `hogs` busy processes running
+    Returns: (lateness seconds, work seconds) arrays
+    """
+    stop = multiprocessing.Event()
+    procs = [multiprocessing.Process(target=_hog, args=(hog_cpus, stop), daemon=True)
+             for _ in range(hogs)]
+    for p in procs:
+        p.start()
+    time.sleep(0.2)  # let the hogs spin up
+    out = []
+    thread = threading.Thread(target=_periodic,
+                              args=(hz, seconds, work_ms, stage_settings, out))
+    thread.start()
+    thread.join()
+    stop.set()
+    for p in procs:
+        p.join()
+    return np.array(out[0]), np.array(out[1])
+
+
+def benchmark(seconds=5.0, hogs=None, cpus=None, nice=None, realtime=None,
+              hogs_everywhere=False):
+    """
+    Jitter of a 120 Hz thread idle, under CPU hogs, and under hogs with pinning
+    Args:
+        cpus: CPUs reserved for the pinned thread (defaults to the last one)
+        nice / realtime: Priority of the pinned thread
+        hogs_everywhere: Let the hogs run on the reserved CPUs too (no isolation)
+    Returns: [(case name, lateness, work time)]
+    """
+    available = sorted(os.sched_getaffinity(0)) if SUPPORTED else []
+    hogs = hogs or os.cpu_count() or 1
+    cpus = cpus or available[-1:]
+    others = [c for c in available if c not in cpus] or available
+    pinned = {"cpus": cpus, "nice": nice, "realtime": realtime}
+    cases = [
+        ("idle", 0, None, None),
+        ("hogs", hogs, None, None),
+        ("hogs, pinned", hogs, None if hogs_everywhere else others, pinned),
+    ]
+    results = []
+    for name, n, hog_cpus, settings in cases:
+        late, busy = run_case(seconds, n, hog_cpus, settings)
+        results.append((name, late, busy))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CPU affinity and scheduling for the stages")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="compare timer jitter idle, under CPU hogs and pinned")
+    parser.add_argument("--seconds", type=float, default=5.0, help="per benchmark case")
+    parser.add_argument("--hogs", type=int, default=None, help="busy processes (default: CPUs)")
+    parser.add_argument("--cpus", type=int, nargs="+", help="CPUs reserved for the pinned case")
+    parser.add_argument("--nice", type=int, default=None)
+    parser.add_argument("--realtime", type=int, default=None, help="SCHED_FIFO priority")
+    parser.add_argument("--hogs-everywhere", action="store_true",
+                        help="don't keep the hogs off the reserved CPUs")
+    args = parser.parse_args()
+
+    configure_process()
+    print_startup_report()
+    if not args.benchmark:
+        return
+    if not SUPPORTED:
+        print("Affinity is not supported on this OS")
+        return
+    print(f"\n120 Hz thread with 1 ms of work per tick, {args.seconds:.0f}s per case")
+    print(f"{'case':<14} {'late p50':>9} {'p99':>8} {'max':>8} {'work p50':>9} {'p99':>8}")
+    for name, late, busy in benchmark(args.seconds, args.hogs, args.cpus, args.nice,
+                                      args.realtime, args.hogs_everywhere):
+        late, busy = late * 1000, busy * 1000
+        print(f"{name:<14} {np.percentile(late, 50):8.2f}ms {np.percentile(late, 99):7.2f}ms "
+              f"{late.max():7.2f}ms {np.percentile(busy, 50):8.2f}ms "
+              f"{np.percentile(busy, 99):7.2f}ms")
+    problems = _applied.get("benchmark", {}).get("problems")
+    if problems:
+        print("Pinned case ran without: " + "; ".join(problems))
+
+
+if __name__ == "__main__":
+    main()
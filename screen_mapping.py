@@ -0,0 +1,381 @@
+# screen_mapping.py
+"""
+Camera to screen mapping, compiled once into lookup tables
+
+MouseController, AirMouse and section5 each normalized, clamped, dampened
+and scaled the fingertip position with scalar math on every frame, for a
+single pyautogui.size() screen. ScreenMapping does all of that once, at
+construction, for:
+    - the active region: the part of the camera frame the hand actually
+      moves in (set by calibration), stretched to the whole target
+    - edge dampening: lower gain near the region's edges, so the cursor
+      can rest on a screen edge without jitter (continuous at the margin)
+    - the target layout: one monitor, or all monitors spanned as one
+      desktop (positions in the gaps between monitors of different sizes
+      are pulled onto the nearest monitor)
+and stores the result as one table per axis (normalized camera coordinate
+-> desktop pixel). map() is then an index lookup on a batch of points.
+
+PointerAcceleration adds optional speed-dependent gain (slow motion is
+finer, fast motion travels further) from a precomputed gain table.
+
+Calibrate the active region (move your index finger over the area you want
+to use), list monitors, or benchmark:
+    python screen_mapping.py --calibrate --seconds 5
+    python screen_mapping.py --show
+    python screen_mapping.py --benchmark
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import time
+from collections import namedtuple
+
+import numpy as np
+
+import config
+
+Monitor = namedtuple("Monitor", "x y width height")  # desktop pixel coordinates
+
+_XRANDR_MONITOR = re.compile(r"(\d+)/\d+x(\d+)/\d+\+(-?\d+)\+(-?\d+)")
+
+
+def detect_monitors(fallback_size=None):
+    """
+    Monitors of the desktop, left to right
+    Uses the optional screeninfo package, then `xrandr --listmonitors`, and
+    falls back to a single screen of fallback_size (or the backend's size).
+    """
+    monitors = []
+    try:
+        from screeninfo import get_monitors
+        monitors = [Monitor(m.x, m.y, m.width, m.height) for m in get_monitors()]
+    except Exception:
+        pass
+    if not monitors and os.environ.get("DISPLAY"):
+        try:
+            out = subprocess.run(["xrandr", "--listmonitors"], capture_output=True,
+                                 text=True, timeout=2).stdout
+            monitors = [Monitor(int(x), int(y), int(w), int(h))
+                        for w, h, x, y in _XRANDR_MONITOR.findall(out)]
+        except (OSError, subprocess.SubprocessError):
+            pass
+    if not monitors:
+        if fallback_size is None:
+            from input_backend import default_backend
+            fallback_size = default_backend().size()
+        monitors = [Monitor(0, 0, *fallback_size)]
+    return sorted(monitors, key=lambda m: (m.x, m.y))
+
+
+def dampening_curve(values, margin, gain):
+    """
+    Piecewise-linear edge dampening on 0-1 values
+    Within `margin` of either edge the slope is `gain` (< 1 = steadier);
+    the middle is steeper so 0 and 1 still reach the screen edges.
+    """
+    if margin <= 0 or gain >= 1:
+        return values
+    edge = margin * gain
+    return np.interp(values, [0.0, margin, 1.0 - margin, 1.0], [0.0, edge, 1.0 - edge, 1.0])
+
+
+class ScreenMapping:
+    """Precomputed camera -> desktop mapping for batches of points"""
+
+    def __init__(self, region=(0.0, 0.0, 1.0, 1.0), monitors=None, target="all",
+                 edge_margin=0.15, edge_gain=0.5, mirror=False, resolution=4096):
+        """
+        Args:
+            region: Active camera region (x0, y0, x1, y1), normalized 0-1
+            monitors: List of Monitor (defaults to detect_monitors())
+            target: "all" to span every monitor, or the index of one monitor
+            edge_margin: Fraction of the region at each edge with reduced gain
+            edge_gain: Gain inside the edge margins (1 = no dampening)
+            mirror: Flip x (for frames that were not mirrored)
+            resolution: Table entries per axis
+        """
+        self.region = tuple(float(v) for v in region)
+        self.monitors = list(monitors or detect_monitors())
+        self.target = target
+        self.edge_margin = edge_margin
+        self.edge_gain = edge_gain
+        self.mirror = mirror
+        self.resolution = resolution
+
+        if target == "all":
+            screens = self.monitors
+        else:
+            screens = [self.monitors[int(target)]]
+        left = min(m.x for m in screens)
+        top = min(m.y for m in screens)
+        right = max(m.x + m.width for m in screens)
+        bottom = max(m.y + m.height for m in screens)
+        self.bounds = (left, top, right, bottom)
+        self.screens = np.array([(m.x, m.y, m.x + m.width - 1, m.y + m.height - 1)
+                                 for m in screens], dtype=np.float32)
+        # Spanned monitors of different sizes leave holes in the bounding box
+        covered = sum(m.width * m.height for m in screens)
+        self._gaps = covered < (right - left) * (bottom - top)
+
+        grid = np.linspace(0.0, 1.0, resolution + 1)
+        self.lut_x = self._axis(grid, self.region[0], self.region[2], left, right, mirror)
+        self.lut_y = self._axis(grid, self.region[1], self.region[3], top, bottom, False)
+        # Plain lists for map_point(): indexing them is cheaper than NumPy scalars
+        self._list_x = self.lut_x.tolist()
+        self._list_y = self.lut_y.tolist()
+        self._screen_list = self.screens.tolist()
+
+    def _axis(self, grid, lo, hi, out_lo, out_hi, mirror):
+        """Table for one axis: normalized camera coordinate -> desktop pixel"""
+        values = 1.0 - grid if mirror else grid
+        values = np.clip((values - lo) / max(hi - lo, 1e-6), 0.0, 1.0)
+        values = dampening_curve(values, self.edge_margin, self.edge_gain)
+        return (out_lo + values * (out_hi - out_lo - 1)).astype(np.float32)
+
+    @property
+    def size(self):
+        """(width, height) of the target area"""
+        left, top, right, bottom = self.bounds
+        return right - left, bottom - top
+
+    def map(self, points, frame_size):
+        """
+        Map camera pixels to desktop pixels
+        Args:
+            points: (N, 2) array of camera (x, y) pixels (any leading shape)
+            frame_size: (width, height) of the camera frame
+        Returns: float32 array of desktop (x, y), same shape as points
+        """
+        pts = np.asarray(points, dtype=np.float32)
+        scale = np.float32(self.resolution) / np.asarray(frame_size, dtype=np.float32)
+        idx = np.rint(pts * scale).astype(np.intp)
+        np.clip(idx, 0, self.resolution, out=idx)
+        out = np.empty(pts.shape, dtype=np.float32)
+        out[..., 0] = self.lut_x[idx[..., 0]]
+        out[..., 1] = self.lut_y[idx[..., 1]]
+        if self._gaps:
+            out = self._onto_screens(out)
+        return out
+
+    def map_point(self, x, y, frame_width, frame_height):
+        """Map one camera pixel to desktop (x, y) floats"""
+        res = self.resolution
+        ix = min(max(int(x * res / frame_width + 0.5), 0), res)
+        iy = min(max(int(y * res / frame_height + 0.5), 0), res)
+        sx, sy = self._list_x[ix], self._list_y[iy]
+        if self._gaps:
+            best = None
+            for x0, y0, x1, y1 in self._screen_list:
+                cx, cy = min(max(sx, x0), x1), min(max(sy, y0), y1)
+                dist = (cx - sx) ** 2 + (cy - sy) ** 2
+                if best is None or dist < best[0]:
+                    best = (dist, cx, cy)
+            sx, sy = best[1], best[2]
+        return sx, sy
+
+    def _onto_screens(self, pts):
+        """Move points that fall between monitors onto the nearest monitor"""
+        flat = pts.reshape(-1, 2)
+        best = None
+        best_dist = None
+        for x0, y0, x1, y1 in self.screens:
+            clipped = np.stack([np.clip(flat[:, 0], x0, x1), np.clip(flat[:, 1], y0, y1)], axis=1)
+            dist = ((clipped - flat) ** 2).sum(axis=1)
+            if best is None:
+                best, best_dist = clipped, dist
+            else:
+                closer = dist < best_dist
+                best[closer] = clipped[closer]
+                best_dist = np.minimum(dist, best_dist)
+        return best.reshape(pts.shape)
+
+    def calibration(self):
+        """The settings saved by --calibrate (monitors are detected at every start)"""
+        return {"region": list(self.region), "target": self.target}
+
+
+class PointerAcceleration:
+    """Speed-dependent gain on cursor motion, from a precomputed table"""
+
+    def __init__(self, acceleration=1.0, threshold=12.0, recenter=0.05, bounds=None,
+                 bins=256):
+        """
+        Args:
+            acceleration: Extra gain at high speed (0 = off; gain tends to 1 + acceleration)
+            threshold: Speed in desktop pixels per sample where the gain is 1
+            recenter: Fraction of the gap to the absolute position closed per sample,
+                      so the active region keeps covering the whole screen
+            bounds: (left, top, right, bottom) to clamp to
+        """
+        self.threshold = threshold
+        self.recenter = recenter
+        self.bounds = bounds
+        self.max_speed = 8.0 * threshold
+        self.scale = (bins - 1) / self.max_speed
+        speeds = np.linspace(0.0, self.max_speed, bins)
+        self.gain = ((1.0 + acceleration) ** np.tanh((speeds - threshold) / threshold)
+                     ).astype(np.float32)
+        self.prev = None
+        self.out = None
+
+    def apply(self, x, y):
+        """Accelerated position for a new absolute target"""
+        if self.prev is None:
+            self.prev = (x, y)
+            self.out = [x, y]
+            return x, y
+        dx, dy = x - self.prev[0], y - self.prev[1]
+        self.prev = (x, y)
+        speed = (dx * dx + dy * dy) ** 0.5
+        gain = float(self.gain[min(int(speed * self.scale), len(self.gain) - 1)])
+        out = self.out
+        out[0] += dx * gain + (x - out[0]) * self.recenter
+        out[1] += dy * gain + (y - out[1]) * self.recenter
+        if self.bounds is not None:
+            left, top, right, bottom = self.bounds
+            out[0] = min(max(out[0], left), right - 1)
+            out[1] = min(max(out[1], top), bottom - 1)
+        return out[0], out[1]
+
+    def reset(self):
+        self.prev = None
+        self.out = None
+
+
+def load_calibration(path=None):
+    """Saved calibration dict, or None"""
+    path = path or config.SCREEN_CALIBRATION_PATH
+    if not path or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def default_mapping(screen_size=None, **kwargs):
+    """
+    ScreenMapping from config.py and the saved calibration
+    Args:
+        screen_size: Screen used when no monitors are configured or detected
+        kwargs: Override ScreenMapping arguments
+    """
+    settings = {"region": config.SCREEN_REGION, "target": config.SCREEN_TARGET,
+                "edge_margin": config.EDGE_DAMPENING_MARGIN,
+                "edge_gain": config.EDGE_DAMPENING_GAIN}
+    saved = load_calibration()
+    if saved:
+        settings["region"] = saved["region"]
+        settings["target"] = saved.get("target", settings["target"])
+    settings.update(kwargs)
+    if not settings.get("monitors"):
+        settings["monitors"] = detect_monitors(screen_size)
+    return ScreenMapping(**settings)
+
+
+def calibrate(seconds=5.0, source=None, headless=False):
+    """
+    Record the index fingertip while the user sweeps the area they want to use
+    Returns: active region (x0, y0, x1, y1), normalized
+    """
+    import cv2
+    from capture_supervisor import supervised_source
+    from detector_pool import mediapipe_graph, to_hand_result
+
+    cap = supervised_source(config.FRAME_SOURCE if source is None else source)
+    hands = mediapipe_graph()
+    tips = []
+    print(f"Move your index finger over the area you want to use ({seconds:.0f}s)...")
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        success, img = cap.read()
+        if not success:
+            if cap.finished:
+                break
+            continue
+        img = cv2.flip(img, 1)
+        h, w = img.shape[:2]
+        result = to_hand_result(hands.process(cv2.cvtColor(img, cv2.COLOR_BGR2RGB)),
+                                None, None, (w, h))
+        if result.landmarks:
+            tips.append(result.landmarks[0][8])
+        if not headless:
+            if len(tips) > 1:
+                lo, hi = np.min(tips, axis=0), np.max(tips, axis=0)
+                cv2.rectangle(img, tuple((lo * (w, h)).astype(int)),
+                              tuple((hi * (w, h)).astype(int)), (0, 255, 0), 2)
+            cv2.imshow("Calibration", img)
+            cv2.waitKey(1)
+    cap.release()
+    if not headless:
+        cv2.destroyAllWindows()
+    if len(tips) < 10:
+        raise RuntimeError("not enough hand detections to calibrate")
+    # Percentiles ignore the odd stray detection at the edge of the sweep
+    lo = np.clip(np.percentile(tips, 2, axis=0), 0.0, 1.0)
+    hi = np.clip(np.percentile(tips, 98, axis=0), 0.0, 1.0)
+    return float(lo[0]), float(lo[1]), float(hi[0]), float(hi[1])
+
+
+def benchmark(mapping, n=100000, frame_size=(640, 480)):
+    """Seconds per point: batched map(), map_point() and the old scalar math"""
+    rng = np.random.default_rng(0)
+    pts = rng.uniform(0, 1, (n, 2)) * frame_size
+    start = time.perf_counter()
+    mapping.map(pts, frame_size)
+    batched = (time.perf_counter() - start) / n
+
+    sample = pts[:10000].tolist()
+    start = time.perf_counter()
+    for x, y in sample:
+        mapping.map_point(x, y, *frame_size)
+    single = (time.perf_counter() - start) / len(sample)
+
+    sw, sh = mapping.size
+    start = time.perf_counter()
+    for x, y in sample:
+        np.interp(x, (100, frame_size[0] - 100), (0, sw))
+        np.interp(y, (100, frame_size[1] - 100), (0, sh))
+    scalar = (time.perf_counter() - start) / len(sample)
+    return batched, single, scalar
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Camera to screen mapping")
+    parser.add_argument("--calibrate", action="store_true",
+                        help="record the active hand region and save it")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--source", help="frame source for calibration")
+    parser.add_argument("--target", default=None, help='"all" or a monitor index')
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--show", action="store_true", help="print monitors and the mapping")
+    parser.add_argument("--benchmark", action="store_true")
+    args = parser.parse_args()
+
+    kwargs = {}
+    if args.target is not None:
+        kwargs["target"] = args.target if args.target == "all" else int(args.target)
+    if args.calibrate:
+        kwargs["region"] = calibrate(args.seconds, args.source, args.headless)
+    mapping = default_mapping(**kwargs)
+    if args.calibrate:
+        with open(config.SCREEN_CALIBRATION_PATH, "w") as f:
+            json.dump(mapping.calibration(), f, indent=2)
+        print(f"Saved calibration to {config.SCREEN_CALIBRATION_PATH}")
+
+    if args.show or args.calibrate or not args.benchmark:
+        for i, m in enumerate(mapping.monitors):
+            print(f"Monitor {i}: {m.width}x{m.height} at ({m.x}, {m.y})")
+        x0, y0, x1, y1 = mapping.region
+        print(f"Active region: x {x0:.2f}-{x1:.2f}, y {y0:.2f}-{y1:.2f} of the frame")
+        print(f"Target: {mapping.target} -> desktop {mapping.bounds}")
+    if args.benchmark:
+        batched, single, scalar = benchmark(mapping)
+        print(f"map() batch: {batched * 1e9:8.1f} ns/point")
+        print(f"map_point(): {single * 1e9:8.1f} ns/point")
+        print(f"np.interp x2: {scalar * 1e9:8.1f} ns/point (previous per-frame mapping)")
+
+
+if __name__ == "__main__":
+    main()
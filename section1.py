@@ -13,6 +13,8 @@ Learning Objectives:
 import cv2 # imports openCV
 import mediapipe as mp # import mediapipe
 
+from capture_supervisor import CaptureSupervisor # reopens the camera with backoff if it drops out
+
 def main():
     print("=" * 50)
     print("SECTION 1: Basic Hand Detection")
@@ -24,7 +26,7 @@ def main():
     print("\nPress ESC to exit\n")
     
     # Initialize camera (0 is usually the default webcam, if it doesnt work, try 1)
-    cap = cv2.VideoCapture(0) 
+    cap = CaptureSupervisor(lambda: cv2.VideoCapture(0)) # cv2.VideoCapture(0), reconnected if unplugged
     
     mpHands = mp.solutions.hands # get the hands module from MediaPipe (does all the heavy lifting!)
     hands = mpHands.Hands(
@@ -40,8 +42,9 @@ def main():
         # Read frame from camera
         success, img = cap.read()
         if not success: # if camera fails
-            print("Failed to read from camera")
-            continue
+            if cv2.waitKey(1) & 0xFF == 27: # keep the window responsive; ESC still exits
+                break
+            continue # the supervisor logs the failure and waits before retrying
         
         # Flip image horizontally for mirror effect
         img = cv2.flip(img, 1)
@@ -13,6 +13,8 @@ Learning Objectives:
 import cv2 # import OpenCV
 import mediapipe as mp # import MediaPipe
 
+from capture_supervisor import CaptureSupervisor
+
 # Hand landmark indices -- See image for better reference!
 LANDMARK_NAMES = {
     0: "WRIST",
@@ -36,7 +38,7 @@ def main():
     print("- 17-20: Pinky finger")
     print("\nPress ESC to exit\n")
     
-    cap = cv2.VideoCapture(0) # turn on camera
+    cap = CaptureSupervisor(lambda: cv2.VideoCapture(0)) # turn on camera (reconnects with backoff if it drops out)
     
     mpHands = mp.solutions.hands # initialize MediaPipe (same as section 1)
     hands = mpHands.Hands(
@@ -53,6 +55,8 @@ def main():
     while True: # start camera loop
         success, img = cap.read() # read frame from webcam
         if not success: # if frame not captured, continue
+            if cv2.waitKey(1) & 0xFF == 27: # keep the window responsive; ESC still exits
+                break
             continue
         
         img = cv2.flip(img, 1) # mirror image
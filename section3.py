@@ -13,6 +13,9 @@ Learning Objectives:
 import cv2
 import mediapipe as mp
 
+from capture_supervisor import CaptureSupervisor
+from console_log import console
+
 def fingers_up(lmList): 
     """
     Detect which fingers are raised
@@ -42,6 +45,15 @@ def fingers_up(lmList):
     return fingers
 
 
+def format_finger_states(fingers):
+    """Console block for the finger states (built on the logging thread)"""
+    names = ["Thumb: ", "Index: ", "Middle:", "Ring:  ", "Pinky: "]
+    lines = [f"\nFinger States: {fingers}"]
+    lines += [f"  {name} {'UP ' if state else 'DOWN '}" for name, state in zip(names, fingers)]
+    lines.append(f"Total fingers up: {fingers.count(1)}")
+    return "\n".join(lines)
+
+
 def main():
     print("=" * 50)
     print("SECTION 3: Finger Detection")
@@ -57,7 +69,7 @@ def main():
     print("-  Peace sign (index + middle up)")
     print("\nPress ESC to exit\n")
     
-    cap = cv2.VideoCapture(0) # turn on camera
+    cap = CaptureSupervisor(lambda: cv2.VideoCapture(0)) # turn on camera (reconnects with backoff if it drops out)
     
     mpHands = mp.solutions.hands # same as previos sections
     hands = mpHands.Hands(
@@ -67,11 +79,11 @@ def main():
     )
     mpDraw = mp.solutions.drawing_utils
     
-    frame_count = 0
-    
     while True:
         success, img = cap.read()
         if not success:
+            if cv2.waitKey(1) & 0xFF == 27: # keep the window responsive; ESC still exits
+                break
             continue
         
         img = cv2.flip(img, 1)
@@ -94,16 +106,8 @@ def main():
             fingers = fingers_up(lmList)
             total_fingers = fingers.count(1)
             
-            # Print to console every 30 frames
-            frame_count += 1
-            if frame_count % 30 == 0:
-                print(f"\nFinger States: {fingers}")
-                print(f"  Thumb:  {'UP ' if fingers[0] else 'DOWN '}")
-                print(f"  Index:  {'UP ' if fingers[1] else 'DOWN '}")
-                print(f"  Middle: {'UP ' if fingers[2] else 'DOWN '}")
-                print(f"  Ring:   {'UP ' if fingers[3] else 'DOWN '}")
-                print(f"  Pinky:  {'UP ' if fingers[4] else 'DOWN '}")
-                print(f"Total fingers up: {total_fingers}")
+            # Print to console about once a second (queued, written in the background)
+            console.info(format_finger_states, fingers, key="finger_states", every=1.0)
             
             # Display finger count
             cv2.putText(img, f"Fingers Up: {total_fingers}", (10, 50), 
@@ -14,6 +14,10 @@ import cv2
 import mediapipe as mp
 import math
 
+from renderer import HudOverlay
+from console_log import console
+from capture_supervisor import CaptureSupervisor
+
 def calculate_distance(point1, point2):
     """
     Calculate Euclidean distance between two points
@@ -25,6 +29,26 @@ def calculate_distance(point1, point2):
     return distance
 
 
+def format_calculation(thumb_tip, index_tip):
+    """Console block walking through the distance calculation (built on the logging thread)"""
+    x_diff = index_tip[0] - thumb_tip[0]
+    y_diff = index_tip[1] - thumb_tip[1]
+    return "\n".join([
+        "\n" + "="*50,
+        "DETAILED DISTANCE CALCULATION:",
+        "="*50,
+        f"Thumb tip (landmark 4): x={thumb_tip[0]}, y={thumb_tip[1]}",
+        f"Index tip (landmark 8): x={index_tip[0]}, y={index_tip[1]}",
+        f"\nCalculation:",
+        f"  x_diff = {index_tip[0]} - {thumb_tip[0]} = {x_diff}",
+        f"  y_diff = {index_tip[1]} - {thumb_tip[1]} = {y_diff}",
+        f"  distance = squareroot(x_diff^2 + y_diff^2)",
+        f"  distance = squareroot({x_diff**2} + {y_diff**2})",
+        f"  distance = {calculate_distance(thumb_tip, index_tip):.2f} pixels",
+        "="*50,
+    ])
+
+
 def main():
     print("=" * 50)
     print("SECTION 4: Distance Calculation")
@@ -39,7 +63,7 @@ def main():
     print("- Watch the distance value change")
     print("\nPress ESC to exit\n")
     
-    cap = cv2.VideoCapture(0)
+    cap = CaptureSupervisor(lambda: cv2.VideoCapture(0)) # reconnects with backoff if it drops out
     
     mpHands = mp.solutions.hands # same as prev
     hands = mpHands.Hands(
@@ -53,16 +77,45 @@ def main():
     PINCH_THRESHOLD = 50 # in pixels
     CLOSE_THRESHOLD = 100
     
-    frame_count = 0
+    # HUD layers are built on the first frame (they need the frame height)
+    # and then reused, so the static bar and markers are not redrawn every frame
+    bar_hud = None  # background bar, drawn under the distance indicator
+    hud = None      # threshold markers and labels, drawn on top
     
     while True:
         success, img = cap.read()
         if not success:
+            if cv2.waitKey(1) & 0xFF == 27: # keep the window responsive; ESC still exits
+                break
             continue
         
         img = cv2.flip(img, 1)
         h, w, c = img.shape
         
+        # Visual indicator bar geometry
+        bar_length = 300
+        bar_thickness = 30
+        bar_x, bar_y = 10, h - 80
+        
+        if hud is None:
+            bar_hud = HudOverlay()
+            bar_hud.add_rect((bar_x, bar_y), (bar_x + bar_length, bar_y + bar_thickness), 
+                             (50, 50, 50), cv2.FILLED)
+            
+            hud = HudOverlay()
+            # Threshold markers
+            pinch_marker = int((PINCH_THRESHOLD / 300) * bar_length)
+            close_marker = int((CLOSE_THRESHOLD / 300) * bar_length)
+            hud.add_line((bar_x + pinch_marker, bar_y), 
+                         (bar_x + pinch_marker, bar_y + bar_thickness), (0, 255, 0), 2)
+            hud.add_line((bar_x + close_marker, bar_y), 
+                         (bar_x + close_marker, bar_y + bar_thickness), (0, 255, 255), 2)
+            # Display thresholds
+            hud.add_text(f"Pinch Threshold: < {PINCH_THRESHOLD}", (10, 130), 
+                         cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 1)
+            hud.add_text(f"Close Threshold: < {CLOSE_THRESHOLD}", (10, 160), 
+                         cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 1)
+        
         imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
         results = hands.process(imgRGB)
         
@@ -83,19 +136,15 @@ def main():
             # Calculate distance
             distance = calculate_distance(thumb_tip, index_tip)
             
-            # Print to console every 15 frames
-            frame_count += 1
-            if frame_count % 15 == 0:
-                print(f"\nThumb position: {thumb_tip}")
-                print(f"Index position: {index_tip}")
-                print(f"Distance: {distance:.2f} pixels")
-                
-                if distance < PINCH_THRESHOLD: 
-                    print("-> Status: PINCHED!")
-                elif distance < CLOSE_THRESHOLD:
-                    print("-> Status: CLOSE")
-                else:
-                    print("-> Status: FAR APART")
+            # Print to console about twice a second (queued, written in the background)
+            if distance < PINCH_THRESHOLD: 
+                console_status = "PINCHED!"
+            elif distance < CLOSE_THRESHOLD:
+                console_status = "CLOSE"
+            else:
+                console_status = "FAR APART"
+            console.info("\nThumb position: %s\nIndex position: %s\nDistance: %.2f pixels\n-> Status: %s",
+                         thumb_tip, index_tip, distance, console_status, key="distance", every=0.5)
             
             # Determine status and color
             if distance < PINCH_THRESHOLD:
@@ -120,55 +169,27 @@ def main():
             mid_y = (thumb_tip[1] + index_tip[1]) // 2 # mid y is thumb tip1 + index tip1 // 2
             cv2.circle(img, (mid_x, mid_y), 8, (255, 0, 255), cv2.FILLED)
             
-            # Display distance and status
-            cv2.putText(img, f"Distance: {int(distance)} px", (10, 50), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 1, color, 2)
-            cv2.putText(img, f"Status: {status}", (10, 90), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 1, color, 2)
-            
-            # Display thresholds
-            cv2.putText(img, f"Pinch Threshold: < {PINCH_THRESHOLD}", (10, 130), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 1)
-            cv2.putText(img, f"Close Threshold: < {CLOSE_THRESHOLD}", (10, 160), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 1)
-            
-            # Visual indicator bar
-            bar_length = 300
-            bar_thickness = 30
-            bar_x, bar_y = 10, h - 80
+            # Display distance and status (only re-rendered when the text changes)
+            hud.set_text("distance", f"Distance: {int(distance)} px", (10, 50), 
+                         cv2.FONT_HERSHEY_SIMPLEX, 1, color, 2)
+            hud.set_text("status", f"Status: {status}", (10, 90), 
+                         cv2.FONT_HERSHEY_SIMPLEX, 1, color, 2)
             
-            # Background bar
-            cv2.rectangle(img, (bar_x, bar_y), (bar_x + bar_length, bar_y + bar_thickness), 
-                         (50, 50, 50), cv2.FILLED)
+            # Background bar (cached)
+            bar_hud.render(img)
             
             # Distance indicator (capped at 300 for visualization)
             indicator_width = int(min(distance, 300))
             cv2.rectangle(img, (bar_x, bar_y), (bar_x + indicator_width, bar_y + bar_thickness), 
                          color, cv2.FILLED)
             
-            # Threshold markers
-            pinch_marker = int((PINCH_THRESHOLD / 300) * bar_length)
-            close_marker = int((CLOSE_THRESHOLD / 300) * bar_length)
-            cv2.line(img, (bar_x + pinch_marker, bar_y), 
-                    (bar_x + pinch_marker, bar_y + bar_thickness), (0, 255, 0), 2)
-            cv2.line(img, (bar_x + close_marker, bar_y), 
-                    (bar_x + close_marker, bar_y + bar_thickness), (0, 255, 255), 2)
+            # Threshold markers, threshold labels and status text (cached)
+            hud.render(img)
             
             # TEST CASE: Print detailed calculation
             key = cv2.waitKey(1) & 0xFF
             if key == ord('d'):
-                print("\n" + "="*50)
-                print("DETAILED DISTANCE CALCULATION:")
-                print("="*50)
-                print(f"Thumb tip (landmark 4): x={thumb_tip[0]}, y={thumb_tip[1]}")
-                print(f"Index tip (landmark 8): x={index_tip[0]}, y={index_tip[1]}")
-                print(f"\nCalculation:")
-                print(f"  x_diff = {index_tip[0]} - {thumb_tip[0]} = {index_tip[0] - thumb_tip[0]}")
-                print(f"  y_diff = {index_tip[1]} - {thumb_tip[1]} = {index_tip[1] - thumb_tip[1]}")
-                print(f"  distance = squareroot(x_diff^2 + y_diff^2)")
-                print(f"  distance = squareroot({(index_tip[0] - thumb_tip[0])**2} + {(index_tip[1] - thumb_tip[1])**2})")
-                print(f"  distance = {distance:.2f} pixels")
-                print("="*50)
+                console.info(format_calculation, thumb_tip, index_tip)
             
             if key == 27:  # ESC
                 break
@@ -12,13 +12,39 @@ Learning Objectives:
 
 import cv2
 import mediapipe as mp
-import numpy as np
 import pyautogui
 
+from capture_supervisor import CaptureSupervisor
+from screen_mapping import ScreenMapping, detect_monitors
+from console_log import console
+
 # Disable failsafe (allows cursor to go to corners)
 pyautogui.FAILSAFE = False
 
 
+def format_mapping(w, h, screen_w, screen_h, index_x, index_y, screen_x, screen_y):
+    """Console block explaining the coordinate mapping (built on the logging thread)"""
+    return "\n".join([
+        "\n" + "="*60,
+        "COORDINATE MAPPING DETAILS:",
+        "="*60,
+        f"Camera frame size: {w} x {h}",
+        f"Screen size: {screen_w} x {screen_h}",
+        f"\nIndex finger position in camera: ({index_x}, {index_y})",
+        f"\nX-axis mapping:",
+        f"  Input range: [0, {w}]",
+        f"  Output range: [0, {screen_w}]",
+        f"  Formula: screen_x = (index_x / {w}) * {screen_w}",
+        f"  Result: screen_x = ({index_x} / {w}) * {screen_w} = {screen_x:.1f}",
+        f"\nY-axis mapping:",
+        f"  Input range: [0, {h}]",
+        f"  Output range: [0, {screen_h}]",
+        f"  Formula: screen_y = (index_y / {h}) * {screen_h}",
+        f"  Result: screen_y = ({index_y} / {h}) * {screen_h} = {screen_y:.1f}",
+        "="*60,
+    ])
+
+
 def main():
     print("=" * 50)
     print("SECTION 5: Mouse Control")
@@ -33,7 +59,7 @@ def main():
     print("\nMove your INDEX FINGER to control the cursor!")
     print("\nPress ESC to exit\n")
     
-    cap = cv2.VideoCapture(0)
+    cap = CaptureSupervisor(lambda: cv2.VideoCapture(0)) # reconnects with backoff if it drops out
     
     mpHands = mp.solutions.hands
     hands = mpHands.Hands(
@@ -47,11 +73,16 @@ def main():
     screen_w, screen_h = pyautogui.size()
     print(f"Screen size: {screen_w} x {screen_h}")
     
-    frame_count = 0
+    # The camera -> screen mapping is computed once into lookup tables;
+    # with several monitors the cursor spans all of them
+    mapping = ScreenMapping(monitors=detect_monitors((screen_w, screen_h)), edge_margin=0)
+    screen_w, screen_h = mapping.size
     
     while True:
         success, img = cap.read()
         if not success:
+            if cv2.waitKey(1) & 0xFF == 27: # keep the window responsive; ESC still exits
+                break
             continue
         
         img = cv2.flip(img, 1)
@@ -75,22 +106,19 @@ def main():
             index_y = lmList[8][2]
             
             # Map camera coordinates to screen coordinates
-            # np.interp(value, [input_min, input_max], [output_min, output_max])
-            screen_x = np.interp(index_x, [0, w], [0, screen_w])
-            screen_y = np.interp(index_y, [0, h], [0, screen_h])
+            # Same as np.interp(value, [0, w], [0, screen_w]), looked up in a precomputed table
+            screen_x, screen_y = mapping.map_point(index_x, index_y, w, h)
             
-            # Print coordinates every 20 frames
-            frame_count += 1
-            if frame_count % 20 == 0:
-                print(f"\nCamera coords: ({index_x}, {index_y})")
-                print(f"Screen coords: ({int(screen_x)}, {int(screen_y)})")
-                print(f"Mapping: ({index_x}/{w}) -> ({int(screen_x)}/{screen_w})")
+            # Print coordinates about every 2/3 s (queued, written in the background)
+            console.info("\nCamera coords: (%d, %d)\nScreen coords: (%d, %d)\nMapping: (%d/%d) -> (%d/%d)",
+                         index_x, index_y, screen_x, screen_y, index_x, w, screen_x, screen_w,
+                         key="coords", every=0.66)
             
             # Move the mouse cursor
             try:
                 pyautogui.moveTo(screen_x, screen_y, duration=0)
             except Exception as e:
-                print(f"Mouse error: {e}")
+                console.error("Mouse error: %s", e, key="mouse_error")
             
             # Highlight index finger tip
             cv2.circle(img, (index_x, index_y), 15, (255, 0, 255), cv2.FILLED)
@@ -128,23 +156,8 @@ def main():
             # TEST CASE: Print detailed mapping
             key = cv2.waitKey(1) & 0xFF
             if key == ord('m'):
-                print("\n" + "="*60)
-                print("COORDINATE MAPPING DETAILS:")
-                print("="*60)
-                print(f"Camera frame size: {w} x {h}")
-                print(f"Screen size: {screen_w} x {screen_h}")
-                print(f"\nIndex finger position in camera: ({index_x}, {index_y})")
-                print(f"\nX-axis mapping:")
-                print(f"  Input range: [0, {w}]")
-                print(f"  Output range: [0, {screen_w}]")
-                print(f"  Formula: screen_x = (index_x / {w}) * {screen_w}")
-                print(f"  Result: screen_x = ({index_x} / {w}) * {screen_w} = {screen_x:.1f}")
-                print(f"\nY-axis mapping:")
-                print(f"  Input range: [0, {h}]")
-                print(f"  Output range: [0, {screen_h}]")
-                print(f"  Formula: screen_y = (index_y / {h}) * {screen_h}")
-                print(f"  Result: screen_y = ({index_y} / {h}) * {screen_h} = {screen_y:.1f}")
-                print("="*60)
+                console.info(format_mapping, w, h, screen_w, screen_h,
+                             index_x, index_y, screen_x, screen_y)
             
             if key == 27:  # ESC
                 break
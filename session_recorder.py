@@ -0,0 +1,345 @@
+# session_recorder.py
+"""
+Asynchronous session recording: video plus a time-aligned landmark sidecar
+
+Encoding with cv2.VideoWriter inline in the frame loop costs several
+milliseconds per frame. SessionRecorder only copies the frame into one of a
+fixed pool of preallocated buffers; a writer thread encodes the buffers in
+order and hands them back to the pool. When the encoder falls behind and
+the pool is empty, frames are dropped by policy:
+    "oldest"   reuse the oldest frame still waiting (the video stays current)
+    "newest"   skip the incoming frame (what was queued is kept)
+Either way the drop is counted, warned about, and written to the sidecar,
+so the timeline stays exact.
+
+Each session is <RECORD_DIR>/session-<date>-<time>.mp4 plus a .jsonl sidecar:
+    {"video": ..., "fps": ..., "size": [w, h], "annotated": ...}   header
+    {"frame": 0, "t": 1792..., "gesture": "ROCK ON", "hands": [[[x, y], ...]]}
+    {"dropped": 2, "t": 1792...}
+    {"event": "ROCK ON", "action": "spotify", "hand": 1, "t": 1792..., "duration": 0.0}
+"frame" is the frame's index in the video and "t" its capture time.
+
+Raw frames are copied before anything is drawn on them (begin_frame), the
+annotated view after the HUD is rendered (end_frame). Toggle with the 'r'
+key in main.py, or start with RECORD_AT_START.
+
+Frame-loop cost against inline VideoWriter.write:
+    python session_recorder.py --frames 300 --size 1280x720
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+import config
+from console_log import console
+from scheduling import apply_stage
+
+DROP_POLICIES = ("oldest", "newest")
+
+
+class SessionRecorder:
+    """Bounded buffer pool, writer thread and sidecar for one session at a time"""
+
+    def __init__(self, directory=None, fps=30.0, pool=None, drop=None, annotated=None,
+                 codec=None):
+        """
+        Args:
+            directory: Where sessions are written (defaults to config.RECORD_DIR)
+            fps: Frame rate written in the video header
+            pool: Frame buffers (the most frames waiting for the encoder)
+            drop: "oldest" or "newest", which frame goes when the pool is empty
+            annotated: Record the frame as displayed (True) or as captured
+            codec: FourCC of the video codec
+        """
+        self.directory = config.RECORD_DIR if directory is None else directory
+        self.fps = fps
+        self.pool_size = config.RECORD_POOL if pool is None else pool
+        self.drop = config.RECORD_DROP if drop is None else drop
+        if self.drop not in DROP_POLICIES:
+            raise ValueError(f"drop must be one of {DROP_POLICIES}, got {self.drop!r}")
+        self.annotated = config.RECORD_ANNOTATED if annotated is None else annotated
+        self.codec = config.RECORD_CODEC if codec is None else codec
+
+        self._cond = threading.Condition()
+        self._free = []        # buffers ready for a frame
+        self._queue = deque()  # ("frame", buffer, meta) / ("drop", None, meta) / ("event", ...)
+        self._shape = None
+        self._pending = None   # (buffer or None, frame_time) between begin_ and end_frame
+        self._thread = None
+        self._stopping = False
+        self.path = None
+        self.sessions = 0
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.max_queued = 0
+        self.encode_time = 0.0
+
+    @property
+    def recording(self):
+        return self._thread is not None
+
+    def start(self):
+        """Start a new session (the video opens with the first frame)"""
+        if self.recording:
+            return self.path
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, "session-" + time.strftime("%Y%m%d-%H%M%S"))
+        suffix = ""
+        while os.path.exists(base + suffix + ".mp4") or os.path.exists(base + suffix + ".jsonl"):
+            suffix = f"-{int(suffix[1:] or 0) + 1}" if suffix else "-1"
+        self.path = base + suffix + ".mp4"
+        self._reset_stats()
+        self._stopping = False
+        self._queue.clear()
+        self._thread = threading.Thread(target=self._run, args=(self.path,),
+                                        name="session-recorder", daemon=True)
+        self._thread.start()
+        self.sessions += 1
+        console.info("Recording to %s", self.path)
+        return self.path
+
+    def stop(self):
+        """Finish the session: encode what is queued, close the files and report"""
+        if not self.recording:
+            return None
+        if self._pending is not None:
+            self.end_frame(None)
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        self._thread.join()
+        self._thread = None
+        stats = self.stats()
+        console.info("Recorded %d frames to %s (%d dropped by backpressure)",
+                     stats["written"], self.path, stats["dropped"])
+        return stats
+
+    def toggle(self):
+        """Start or stop recording; returns True if now recording"""
+        if self.recording:
+            self.stop()
+        else:
+            self.start()
+        return self.recording
+
+    def _buffer(self, img):
+        """A free pool buffer for img, or None when the frame is dropped"""
+        with self._cond:
+            if self._shape != img.shape:
+                # New frame size: a fresh pool (buffers still queued are written and discarded)
+                self._shape = img.shape
+                self._free = [np.empty(img.shape, img.dtype) for _ in range(self.pool_size)]
+            if self._free:
+                return self._free.pop()
+            if self.drop == "newest":
+                return None
+            # Reuse the oldest waiting frame; its slot in the timeline becomes a drop
+            for i, (kind, buf, meta) in enumerate(self._queue):
+                if kind == "frame" and buf.shape == img.shape:
+                    self._queue[i] = ("drop", None, meta)
+                    self._count_drop()
+                    return buf
+            return None
+
+    def _count_drop(self):
+        self.dropped += 1
+        console.warning("Recorder fell behind: %d frames dropped", self.dropped,
+                        key="recorder_drop", every=5.0)
+
+    def begin_frame(self, img, frame_time):
+        """Call with the captured frame; copies it now when recording raw frames"""
+        if not self.recording:
+            return
+        buf = None
+        if not self.annotated:
+            buf = self._buffer(img)
+            if buf is not None:
+                np.copyto(buf, img)
+        self._pending = (buf, frame_time)
+
+    def end_frame(self, img, hands=(), gesture=None):
+        """
+        Call with the frame as displayed; copies it now when recording annotated frames
+        Args:
+            img: Frame after drawing (None to drop it)
+            hands: (21, 2) pixel landmark arrays for the sidecar
+            gesture: Gesture label for the sidecar
+        """
+        if not self.recording or self._pending is None:
+            return
+        buf, frame_time = self._pending
+        self._pending = None
+        if self.annotated and img is not None:
+            buf = self._buffer(img)
+            if buf is not None:
+                np.copyto(buf, img)
+        self.submitted += 1
+        meta = {"t": frame_time}
+        if buf is None:
+            if img is not None:
+                self._count_drop()
+            item = ("drop", None, meta)
+        else:
+            if gesture is not None:
+                meta["gesture"] = gesture
+            meta["hands"] = [np.asarray(points).tolist() for points in hands]
+            item = ("frame", buf, meta)
+        with self._cond:
+            self._queue.append(item)
+            self.max_queued = max(self.max_queued, len(self._queue))
+            self._cond.notify()
+
+    def event(self, gesture, action, hand=0, timestamp=None, duration=0.0):
+        """Gesture event for the sidecar (GestureController.event_sinks signature)"""
+        if not self.recording:
+            return
+        meta = {"event": gesture, "action": action, "hand": hand,
+                "t": time.time() if timestamp is None else timestamp, "duration": duration}
+        with self._cond:
+            self._queue.append(("event", None, meta))
+            self._cond.notify()
+
+    def _run(self, path):
+        """Writer thread: encode queued frames in order until stopped and drained"""
+        apply_stage("recorder")  # off the frame loop's CPUs
+        sidecar = open(os.path.splitext(path)[0] + ".jsonl", "w")
+        writer = None
+        drops = 0  # consecutive drops, written as one line
+        drop_time = None
+        try:
+            while True:
+                with self._cond:
+                    while not self._queue and not self._stopping:
+                        self._cond.wait()
+                    if not self._queue:
+                        break
+                    kind, buf, meta = self._queue.popleft()
+                if kind == "drop":
+                    drops += 1
+                    drop_time = drop_time or meta["t"]
+                    continue
+                if drops:
+                    sidecar.write(json.dumps({"dropped": drops, "t": drop_time}) + "\n")
+                    drops, drop_time = 0, None
+                if kind == "event":
+                    sidecar.write(json.dumps(meta) + "\n")
+                    continue
+                if writer is None:
+                    h, w = buf.shape[:2]
+                    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*self.codec),
+                                             self.fps, (w, h))
+                    sidecar.write(json.dumps({"video": os.path.basename(path), "fps": self.fps,
+                                              "size": [w, h], "annotated": self.annotated,
+                                              "pool": self.pool_size, "drop": self.drop}) + "\n")
+                start = time.perf_counter()
+                writer.write(buf)
+                self.encode_time += time.perf_counter() - start
+                sidecar.write(json.dumps(dict(frame=self.written, **meta)) + "\n")
+                self.written += 1
+                with self._cond:
+                    if buf.shape == self._shape:
+                        self._free.append(buf)
+            if drops:
+                sidecar.write(json.dumps({"dropped": drops, "t": drop_time}) + "\n")
+        finally:
+            if writer is not None:
+                writer.release()
+            sidecar.close()
+
+    def stats(self):
+        return {"submitted": self.submitted, "written": self.written, "dropped": self.dropped,
+                "max_queued": self.max_queued,
+                "encode_ms": self.encode_time / self.written * 1000 if self.written else 0.0}
+
+    def close(self):
+        self.stop()
+
+
+def load_sidecar(path):
+    """
+    Read a session sidecar
+    Returns: (header, frames, drops, events) with frames/drops/events as lists of dicts
+    """
+    header, frames, drops, events = None, [], [], []
+    with open(path) as f:
+        for line in f:
+            entry = json.loads(line)
+            if "video" in entry:
+                header = entry
+            elif "frame" in entry:
+                frames.append(entry)
+            elif "dropped" in entry:
+                drops.append(entry)
+            else:
+                events.append(entry)
+    return header, frames, drops, events
+
+
+def benchmark(frames=300, size=(640, 480), fps=30.0, directory=None):
+    """
+    Frame-loop cost of inline cv2.VideoWriter.write versus the recorder, at `fps`
+    Returns: (inline ms/frame, recorder ms/frame, recorder stats)
+    """
+    import tempfile
+    from frame_source import SyntheticSource
+    directory = directory or tempfile.mkdtemp(prefix="recorder-")
+    os.makedirs(directory, exist_ok=True)
+    source = SyntheticSource(size=size, frames=frames, fps=fps)
+    images = []
+    while True:
+        success, img = source.read()
+        if not success:
+            break
+        images.append(img)
+
+    writer = cv2.VideoWriter(os.path.join(directory, "inline.mp4"),
+                             cv2.VideoWriter_fourcc(*config.RECORD_CODEC), fps, size)
+    start = time.perf_counter()
+    for img in images:
+        writer.write(img)
+    inline = (time.perf_counter() - start) / len(images)
+    writer.release()
+
+    recorder = SessionRecorder(directory, fps=fps)
+    recorder.start()
+    spent = 0.0
+    next_frame = time.perf_counter()
+    for i, img in enumerate(images):
+        time.sleep(max(next_frame - time.perf_counter(), 0.0))  # camera pacing
+        next_frame += 1.0 / fps
+        start = time.perf_counter()
+        recorder.begin_frame(img, i / fps)
+        recorder.end_frame(img, source.hands if i == len(images) - 1 else (), "NONE")
+        spent += time.perf_counter() - start
+    stats = recorder.stop()
+    return inline * 1000, spent / len(images) * 1000, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Session recorder frame-loop cost")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--size", default="640x480")
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--out", help="directory for the test recordings (default: temp)")
+    args = parser.parse_args()
+    size = tuple(int(v) for v in args.size.split("x"))
+    inline, recorder, stats = benchmark(args.frames, size, args.fps, args.out)
+    print(f"Inline VideoWriter.write: {inline:.2f} ms/frame in the loop")
+    print(f"SessionRecorder:          {recorder:.2f} ms/frame in the loop, "
+          f"encode {stats['encode_ms']:.2f} ms/frame on the writer thread")
+    print(f"{stats['written']} written, {stats['dropped']} dropped, "
+          f"most queued {stats['max_queued']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,455 @@
+# synthetic_landmarks.py
+"""
+Synthetic hand landmarks for testing and benchmarking the gesture layer
+
+A parametric hand model (palm size 60 px at scale 1, fingers pointing up
+in the mirrored camera view) turns per-finger extension (0 = curled,
+1 = extended), a pinch amount, position, scale and rotation into (21, 2)
+pixel landmarks, for one hand or a whole batch at once with NumPy.
+LandmarkGenerator strings that into trajectories: poses held for a while
+with smooth transitions between them, drift across the frame, hand-size
+changes (distance to the camera), rotation, per-landmark jitter, fingers
+occluded for a few frames and frames without a hand, each with its ground
+truth (finger states, gesture label, masks).
+
+The generated trajectories drive property checks of gestures.py,
+handDetector.fingersUp, HandFeatures, MouseSmoothing and the pinch drag
+state machine in GestureController, and throughput benchmarks that give
+hands per second for each layer in isolation:
+    python synthetic_landmarks.py --check --frames 20000
+    python synthetic_landmarks.py --benchmark --hands 50000
+
+pose_points() (the scripted poses of latency_harness.py) and drifting_hand()
+(SyntheticSource, the memory soak) are built on the same model.
+"""
+import argparse
+import math
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from landmarks import array_to_lmlist
+
+# Finger states of the named poses
+POSES = {
+    "POINT": [0, 1, 0, 0, 0],
+    "ROCK ON": [0, 1, 0, 0, 1],
+    "PICKS UP!": [1, 0, 0, 0, 1],
+    "VOLUME UP": [1, 1, 1, 1, 1],
+    "VOLUME DOWN": [0, 0, 0, 0, 0],
+}
+PINCH_OFFSET = (5, 5)  # thumb tip from the index tip in a pinch, at scale 1
+
+
+def _hand_model():
+    """Anchor, curled and extended offsets (21, 2) and the finger driving each landmark"""
+    anchor = np.zeros((21, 2))
+    curled = np.zeros((21, 2))
+    extended = np.zeros((21, 2))
+    finger = np.zeros(21, dtype=np.intp)
+    # Thumb on the +x side of the palm; only its tip moves
+    anchor[1:4] = [(20, -15), (35, -30), (45, -45)]
+    curled[4], extended[4] = (30, -50), (60, -55)
+    for k, dx in enumerate((18, 6, -6, -18)):
+        mcp = 5 + 4 * k
+        anchor[mcp:mcp + 4] = (dx, -60)
+        extended[mcp + 1:mcp + 4] = [(0, -25), (0, -45), (0, -60)]
+        curled[mcp + 1:mcp + 4] = [(0, -20), (0, -10), (0, 5)]
+        finger[mcp + 1:mcp + 4] = k + 1
+    return anchor, curled, extended, finger
+
+
+_ANCHOR, _CURLED, _EXTENDED, _FINGER = _hand_model()
+_STRETCH = _EXTENDED - _CURLED
+
+
+def _rotate(v, cos, sin):
+    x, y = v[..., 0], v[..., 1]
+    return np.stack((x * cos - y * sin, x * sin + y * cos), axis=-1)
+
+
+def hands_batch(extension, center, scale=1.0, angle=0.0, pinch=None):
+    """
+    Landmarks for a batch of hands
+    Args:
+        extension: (n, 5) finger extension, 0 = curled, 1 = extended
+        center: (n, 2) wrist positions in pixels
+        scale: (n,) or scalar hand size (1 = palm size of 60 px)
+        angle: (n,) or scalar rotation about the wrist in radians
+        pinch: Optional (n,) amount the thumb tip moves onto the index tip
+    Returns: (n, 21, 2) float64 pixel landmarks
+    """
+    extension = np.asarray(extension, dtype=np.float64)
+    n = len(extension)
+    center = np.broadcast_to(np.asarray(center, dtype=np.float64), (n, 2))
+    scale = np.broadcast_to(np.asarray(scale, dtype=np.float64), (n,))[:, None, None]
+    angle = np.broadcast_to(np.asarray(angle, dtype=np.float64), (n,))[:, None]
+    cos, sin = np.cos(angle), np.sin(angle)
+    offsets = _CURLED + extension[:, _FINGER, None] * _STRETCH
+    # Anchors and finger offsets are added separately so scale-1, unrotated
+    # hands come out exactly on the integer grid of the scripted poses
+    pts = center[:, None, :] + _rotate(_ANCHOR * scale, cos, sin)
+    pts = pts + _rotate(offsets * scale, cos, sin)
+    if pinch is not None:
+        pinch = np.asarray(pinch, dtype=np.float64)[:, None]
+        target = pts[:, 8:9] + _rotate(np.array(PINCH_OFFSET) * scale, cos, sin)
+        pts[:, 4] += pinch * (target[:, 0] - pts[:, 4])
+    return pts
+
+
+def pose_points(fingers, center=(320, 330), scale=1.0, thumb_offset=None, angle=0.0):
+    """
+    Build a (21, 2) hand whose finger states match `fingers`
+    Args:
+        fingers: [thumb, index, middle, ring, pinky], 1 = up
+        center: Wrist position in pixels
+        scale: Hand size (1.0 = palm size of 60px)
+        thumb_offset: Place the thumb tip at index tip + offset (pinch poses)
+        angle: Rotation about the wrist in radians
+    """
+    pts = hands_batch([fingers], [center], scale, angle)[0].astype(np.float32)
+    if thumb_offset is not None:
+        pts[4] = pts[8] + thumb_offset
+    return pts.astype(np.int32)
+
+
+def drifting_hand(rng, t, w, h, jitter=1.5):
+    """A plausible hand drifting around a w x h frame at time t, curling its fingers"""
+    center = (w * (0.5 + 0.3 * math.sin(t * 0.7)), h * (0.6 + 0.2 * math.cos(t * 0.5)))
+    extension = [[0.5 + 0.5 * math.sin(t * (1 + 0.3 * k)) for k in range(5)]]
+    pts = hands_batch(extension, [center], 0.8, 0.3 * math.sin(t * 0.4))[0]
+    pts += rng.normal(0, jitter, pts.shape)
+    return pts.astype(np.int32)
+
+
+class Trajectory(namedtuple("Trajectory", "time points fingers label names present occluded "
+                                          "scale angle pinch center extension")):
+    """
+    Generated frames with their ground truth
+    points: (n, 21, 2) float32 pixels (NaN where no hand is present)
+    center, extension, scale, angle, pinch: the hands_batch() inputs of each frame
+    fingers: (n, 5) int8 true finger states, -1 during transitions (and for a pinched thumb)
+    label: (n,) index into names of the held pose, -1 during transitions
+    present: (n,) hand in view; occluded: (n, 21) landmarks displaced by an occluder
+    """
+    __slots__ = ()
+
+    @property
+    def clean(self):
+        """Frames with a held pose, a hand in view and nothing occluded"""
+        return self.present & (self.label >= 0) & ~self.occluded.any(axis=1)
+
+
+class LandmarkGenerator:
+    """Seeded source of hand landmark trajectories"""
+
+    def __init__(self, seed=0, frame_size=(640, 480)):
+        self.rng = np.random.default_rng(seed)
+        self.frame_size = frame_size
+
+    def _smooth(self, t, amplitude, speed=1.0, terms=3):
+        """Smooth random signal in [-amplitude, amplitude]: a few random sinusoids"""
+        freqs = self.rng.uniform(0.05, 0.4, terms) * speed
+        phases = self.rng.uniform(0, 2 * np.pi, terms)
+        wave = np.sin(2 * np.pi * freqs[None] * t[:, None] + phases[None]).sum(axis=1)
+        return amplitude * wave / terms
+
+    def trajectory(self, n, fps=30.0, poses=None, hold=(0.4, 1.2), transition=0.15,
+                   rotation=20.0, jitter=1.0, occlusion=0.01, dropout=0.005,
+                   scale=(0.6, 1.5), speed=1.0):
+        """
+        Generate n frames of one hand
+        Args:
+            poses: Pose names to pick from (POSES keys and "PINCH"; defaults to all)
+            hold: Range of seconds a pose is held
+            transition: Seconds to move from one pose to the next
+            rotation: Most rotation about the wrist, in degrees
+            jitter: Landmark noise in pixels at scale 1
+            occlusion: Chance per frame that a finger gets occluded for 3-15 frames
+            dropout: Chance per frame that the hand is lost for 2-10 frames
+            scale: Range of hand sizes (1 = palm size of 60 px)
+            speed: Multiplier on how fast the hand drifts, scales and rotates
+        Returns: Trajectory
+        """
+        rng = self.rng
+        names = list(poses or list(POSES) + ["PINCH"])
+        targets = np.array([POSES.get(name, POSES["POINT"]) for name in names], dtype=np.float64)
+        pinches = np.array([name == "PINCH" for name in names], dtype=np.float64)
+
+        # Pose schedule: holds joined by linear transitions
+        extension = np.empty((n, 5))
+        pinch = np.empty(n)
+        label = np.empty(n, dtype=np.int16)
+        ramp_len = max(int(round(transition * fps)), 1)
+        i, current = 0, rng.integers(len(names))
+        while i < n:
+            held = max(int(rng.uniform(*hold) * fps), 1)
+            end = min(i + held, n)
+            extension[i:end] = targets[current]
+            pinch[i:end] = pinches[current]
+            label[i:end] = current
+            i = end
+            if i >= n:
+                break
+            following = rng.integers(len(names))
+            end = min(i + ramp_len, n)
+            ramp = (np.arange(1, end - i + 1) / (ramp_len + 1))[:, None]
+            extension[i:end] = targets[current] + ramp * (targets[following] - targets[current])
+            pinch[i:end] = pinches[current] + ramp[:, 0] * (pinches[following] - pinches[current])
+            label[i:end] = -1
+            i, current = end, following
+
+        t = np.arange(n) / fps
+        w, h = self.frame_size
+        sizes = (scale[0] + scale[1]) / 2 + self._smooth(t, (scale[1] - scale[0]) / 2, speed)
+        # Keep the whole hand (about 2.2 palms tall) inside the frame
+        cx = w / 2 + self._smooth(t, w * 0.3, speed)
+        cy = h * 0.55 + self._smooth(t, h * 0.15, speed) + 40 * sizes
+        angle = self._smooth(t, np.radians(rotation), speed)
+        center = np.stack((cx, cy), axis=1)
+        points = hands_batch(extension, center, sizes, angle, pinch)
+        points += rng.normal(0, jitter, points.shape) * sizes[:, None, None]
+
+        occluded = np.zeros((n, 21), dtype=bool)
+        for start in np.flatnonzero(rng.random(n) < occlusion):
+            end = min(start + rng.integers(3, 16), n)
+            mcp = 5 + 4 * rng.integers(4)
+            occluded[start:end, mcp + 1:mcp + 4] = True
+        # hands_batch's result isn't contiguous, so index it directly (a reshape would copy)
+        hidden_scale = np.broadcast_to(sizes[:, None], occluded.shape)[occluded][:, None]
+        points[occluded] += rng.normal(0, 18, (len(hidden_scale), 2)) * hidden_scale
+
+        present = np.ones(n, dtype=bool)
+        for start in np.flatnonzero(rng.random(n) < dropout):
+            present[start:start + rng.integers(2, 11)] = False
+        points[~present] = np.nan
+
+        fingers = np.where(label[:, None] >= 0, targets[label].astype(np.int8), -1).astype(np.int8)
+        # A pinched thumb tip sits on the index tip: its up/down state is undefined
+        fingers[(label >= 0) & (pinches[label] > 0), 0] = -1
+        return Trajectory(t, points.astype(np.float32), fingers, label, names, present, occluded,
+                          sizes, angle, pinch, center, extension)
+
+
+def _hands(traj, frames):
+    """Integer pixel landmarks of the given frames, as the detector would give them"""
+    return np.floor(traj.points[frames]).astype(np.int32)
+
+
+def check_properties(frames=20000, seed=0):
+    """
+    Property checks of the gesture layer on generated trajectories
+    Returns: list of (name, passed, detail)
+    """
+    from features import HandFeatures
+    from gestures import classify_gesture, fingers_up
+    from handgesturePicksUp import handDetector
+    from mouse_smoother import MouseSmoothing
+
+    results = []
+    detector = handDetector()  # as latency_harness.py does for the picks_up app
+    traj = LandmarkGenerator(seed).trajectory(frames)
+    clean = np.flatnonzero(traj.clean)
+    present = np.flatnonzero(traj.present)
+    hands = _hands(traj, present)
+    row = {f: i for i, f in enumerate(present)}
+
+    def matches(f):
+        truth = traj.fingers[f]
+        got = np.array(fingers_up(array_to_lmlist(hands[row[f]])))
+        return np.array_equal(got[truth >= 0], truth[truth >= 0])
+
+    # 1. The finger rules recover the held pose on clean frames
+    wrong = [f for f in clean if not matches(f)]
+    results.append(("fingers_up matches held poses", not wrong,
+                    f"{len(clean) - len(wrong)}/{len(clean)} clean frames"))
+
+    # 2. Every implementation of the rules agrees, noisy frames included
+    mismatch = 0
+    for pts in hands:
+        lmList = array_to_lmlist(pts)
+        a = fingers_up(lmList)
+        if a != HandFeatures(pts).fingers or a != detector.fingersUp(lmList):
+            mismatch += 1
+    results.append(("fingers_up == HandFeatures.fingers == handDetector.fingersUp",
+                    mismatch == 0, f"{len(hands) - mismatch}/{len(hands)} frames"))
+
+    # 3. Gesture labels of clean frames match the held pose
+    expected = {name: classify_gesture(POSES.get(name, POSES["POINT"])) for name in traj.names}
+    wrong = sum(classify_gesture(fingers_up(array_to_lmlist(hands[row[f]])))
+                != expected[traj.names[traj.label[f]]] for f in clean)
+    results.append(("classify_gesture matches held poses", wrong == 0,
+                    f"{len(clean) - wrong}/{len(clean)} clean frames"))
+
+    # 4. Invariance: moving or resizing the hand (about the wrist) keeps the finger states
+    changed = 0
+    for f in clean[:2000]:
+        pts = hands[row[f]]
+        base = fingers_up(array_to_lmlist(pts))
+        moved = pts + np.array([37, -21])
+        bigger = (pts[0] + (pts - pts[0]) * 1.7).astype(np.int32)
+        if fingers_up(array_to_lmlist(moved)) != base or \
+                fingers_up(array_to_lmlist(bigger)) != base:
+            changed += 1
+    results.append(("finger states invariant to translation and scale", changed == 0,
+                    f"{changed} changed of {min(len(clean), 2000)}"))
+
+    # 5. Occluders really displace their landmarks, and nothing else moves (no jitter)
+    still = LandmarkGenerator(seed + 2).trajectory(min(frames, 5000), jitter=0.0, occlusion=0.05)
+    model = hands_batch(still.extension, still.center, still.scale, still.angle, still.pinch)
+    moved = np.hypot(*(still.points - model).transpose(2, 0, 1)) / still.scale[:, None]
+    shown = still.present[:, None] & still.occluded
+    hidden_moved = float(np.median(moved[shown])) if shown.any() else 0.0
+    other_moved = float(np.nanmax(moved[still.present[:, None] & ~still.occluded]))
+    results.append(("occluded landmarks are displaced, others are not",
+                    hidden_moved > 5.0 and other_moved < 0.01,
+                    f"median {hidden_moved:.1f} px (at scale 1) on {int(shown.sum())} occluded, "
+                    f"max {other_moved:.4f} elsewhere"))
+
+    # Robustness (informational): agreement outside the clean frames
+    noisy = np.flatnonzero(traj.present & (traj.label >= 0) & traj.occluded.any(axis=1))
+    if len(noisy):
+        ok = sum(matches(f) for f in noisy)
+        results.append(("occluded frames still classified right (info)", True,
+                        f"{ok}/{len(noisy)} = {ok / len(noisy):.0%}"))
+
+    # 5. MouseSmoothing stays inside the range of its inputs and settles on a still hand
+    smoother = MouseSmoothing(7, 0.25)
+    lo = hi = None
+    escaped = 0
+    for pts in hands[:5000]:
+        x, y = pts[8]
+        lo = np.minimum(lo, (x, y)) if lo is not None else np.array((x, y))
+        hi = np.maximum(hi, (x, y)) if hi is not None else np.array((x, y))
+        smoother.add_position(x, y)
+        sx, sy = smoother.get_smoothed_position()
+        if not (lo[0] - 1e-6 <= sx <= hi[0] + 1e-6 and lo[1] - 1e-6 <= sy <= hi[1] + 1e-6):
+            escaped += 1
+    for _ in range(60):
+        smoother.add_position(100, 100)
+        sx, sy = smoother.get_smoothed_position()
+    settled = math.hypot(sx - 100, sy - 100)
+    results.append(("MouseSmoothing stays in range and settles", escaped == 0 and settled < 0.5,
+                    f"{escaped} escaped, {settled:.3f} px off after 60 still frames"))
+
+    # 6. Pinch drag state machine: downs and ups alternate, nothing is left held
+    results.append(_check_drag(seed))
+    return results
+
+
+def _check_drag(seed, frames=6000):
+    from clock import SimulatedClock
+    from gesture_controller import GestureController
+    from latency_harness import RecordingBackend
+    from screen_mapping import Monitor, ScreenMapping
+
+    traj = LandmarkGenerator(seed + 1).trajectory(frames, poses=["POINT", "PINCH"],
+                                                  dropout=0.01)
+    clock = SimulatedClock(0.0)
+    backend = RecordingBackend(clock)
+    mapping = ScreenMapping(monitors=[Monitor(0, 0, 1920, 1080)], target=0)
+    controller = GestureController((1920, 1080), backend=backend, clock=clock, mapping=mapping)
+    frame_size = LandmarkGenerator().frame_size
+    pinches = 0
+    for f in range(frames):
+        clock.advance(1 / 30.0)
+        hands = [_hands(traj, f)] if traj.present[f] else []
+        controller.process(hands, frame_size, clock())
+        pinches += f > 0 and traj.label[f] >= 0 and traj.names[traj.label[f]] == "PINCH" and \
+            traj.label[f - 1] != traj.label[f]
+    for _ in range(30):  # hand leaves: its track expires and releases any drag
+        clock.advance(1 / 30.0)
+        controller.process([], frame_size, clock())
+
+    buttons = [action for _, action, _ in backend.calls if action in ("mouse_down", "mouse_up")]
+    alternates = all(a != b for a, b in zip(buttons, buttons[1:])) and \
+        (not buttons or buttons[0] == "mouse_down")
+    released = not buttons or buttons[-1] == "mouse_up"
+    downs = buttons.count("mouse_down")
+    return ("pinch drag: downs/ups alternate and end released", alternates and released,
+            f"{downs} drags over {pinches} pinch holds")
+
+
+def benchmark(hands=50000, seed=0):
+    """
+    Hands per second through each layer, on generated landmarks
+    Returns: list of (name, hands per second)
+    """
+    from features import HandFeatures
+    from gestures import classify_gesture, fingers_up
+    from handgesturePicksUp import handDetector
+    from mouse_smoother import MouseSmoothing, MouseController
+    from screen_mapping import Monitor, ScreenMapping
+
+    rates = []
+    start = time.perf_counter()
+    traj = LandmarkGenerator(seed).trajectory(hands, dropout=0.0)
+    rates.append(("generate trajectory", hands / (time.perf_counter() - start)))
+
+    pts = np.floor(traj.points).astype(np.int32)
+    lmLists = [array_to_lmlist(p) for p in pts]
+    fingers = [fingers_up(lm) for lm in lmLists]
+
+    def rate(name, fn, items):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        rates.append((name, len(items) / (time.perf_counter() - start)))
+
+    rate("array_to_lmlist", array_to_lmlist, pts)
+    rate("gestures.fingers_up", fingers_up, lmLists)
+    rate("handDetector.fingersUp", handDetector().fingersUp, lmLists)
+    rate("HandFeatures(...).fingers", lambda p: HandFeatures(p).fingers, pts)
+    rate("classify_gesture", classify_gesture, fingers)
+
+    smoother = MouseSmoothing(7, 0.25)
+
+    def smooth(p):
+        smoother.add_position(p[8, 0], p[8, 1])
+        smoother.get_smoothed_position()
+    rate("MouseSmoothing add + get", smooth, pts)
+
+    mapping = ScreenMapping(monitors=[Monitor(0, 0, 1920, 1080)], target=0)
+    mouse = MouseController(1920, 1080, move_to=lambda x, y: None, mapping=mapping)
+    w, h = LandmarkGenerator().frame_size
+    rate("MouseController.process_movement",
+         lambda p: mouse.process_movement(p[8, 0], p[8, 1], w, h), pts)
+
+    from clock import SimulatedClock
+    from gesture_controller import GestureController
+    from latency_harness import RecordingBackend
+    clock = SimulatedClock(0.0)
+    controller = GestureController((1920, 1080), backend=RecordingBackend(clock), clock=clock,
+                                   mapping=mapping)
+
+    def process(p):
+        clock.advance(1 / 30.0)
+        controller.process([p], (w, h), clock())
+    rate("GestureController.process (1 hand)", process, pts[:min(hands, 20000)])
+    return rates
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic landmark checks and benchmarks")
+    parser.add_argument("--check", action="store_true", help="run the property checks")
+    parser.add_argument("--benchmark", action="store_true", help="hands/s per layer")
+    parser.add_argument("--frames", type=int, default=20000, help="frames for the checks")
+    parser.add_argument("--hands", type=int, default=50000, help="hands for the benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    failed = False
+    if args.check or not args.benchmark:
+        for name, passed, detail in check_properties(args.frames, args.seed):
+            failed |= not passed
+            print(f"{'PASS' if passed else 'FAIL'}  {name}: {detail}")
+    if args.benchmark:
+        print(f"{'layer':<36} {'hands/s':>12} {'us/hand':>9}")
+        for name, per_second in benchmark(args.hands, args.seed):
+            print(f"{name:<36} {per_second:>12,.0f} {1e6 / per_second:>9.2f}")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
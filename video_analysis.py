@@ -0,0 +1,272 @@
+# video_analysis.py
+"""
+Offline gesture analysis for recorded videos
+
+Splits each video into chunks at keyframes and runs every chunk in its own
+process with its own handDetector. Per-frame landmarks and gesture labels are
+written as columns to <video>.landmarks.npz.
+
+Usage:
+    python video_analysis.py sessions/ --workers 8
+    python video_analysis.py a.mp4 b.mp4 --out results/ --verify
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+
+import config
+from gestures import GESTURE_LABELS, classify_gesture, fingers_up
+from landmarks import NUM_LANDMARKS
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv", ".webm", ".m4v")
+
+# Frames after a chunk boundary in which MediaPipe is still re-acquiring
+# the hand (it runs palm detection until tracking locks on)
+WARMUP_FRAMES = 5
+
+
+def find_videos(paths):
+    """Expand files and directories into a sorted list of video files"""
+    videos = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                videos.extend(os.path.join(root, f) for f in files
+                              if f.lower().endswith(VIDEO_EXTENSIONS))
+        else:
+            videos.append(path)
+    return sorted(videos)
+
+
+def keyframe_indices(path, frame_count):
+    """
+    Frame indices of keyframes, read with ffprobe when it is installed
+    Returns: sorted list, always starting with 0
+    """
+    if shutil.which("ffprobe") is None:
+        return [0]
+    try:
+        out = subprocess.run(
+            ["ffprobe", "-v", "error", "-select_streams", "v:0",
+             "-show_entries", "packet=flags", "-of", "csv=p=0", path],
+            capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return [0]
+    keys = [i for i, flags in enumerate(out.split()) if flags.startswith("K")]
+    return sorted(set([0] + [k for k in keys if k < frame_count]))
+
+
+def plan_chunks(frame_count, keyframes, n_chunks):
+    """
+    Split [0, frame_count) into about n_chunks ranges starting on keyframes
+    Without keyframe info the split points are evenly spaced.
+    """
+    if n_chunks <= 1 or frame_count <= 1:
+        return [(0, frame_count)]
+    targets = [frame_count * i // n_chunks for i in range(1, n_chunks)]
+    if len(keyframes) > 1:
+        keys = np.asarray(keyframes)
+        targets = [int(keys[np.abs(keys - t).argmin()]) for t in targets]
+    starts = sorted(set([0] + [t for t in targets if 0 < t < frame_count]))
+    return list(zip(starts, starts[1:] + [frame_count]))
+
+
+def analyze_chunk(path, start, end, flip=True, overlap=0):
+    """
+    Run hand detection over frames [start, end) of one video
+    Runs in a worker process; builds its own handDetector.
+
+    Args:
+        overlap: Frames before start that are processed and discarded so
+                 tracking is already warm at the chunk boundary
+    Returns: dict of per-frame columns plus timing
+    """
+    from HandTrackingModule import handDetector
+
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    detector = handDetector(maxHands=config.MAX_HANDS,
+                            detectionCon=config.MIN_DETECTION_CONFIDENCE,
+                            trackCon=config.MIN_TRACKING_CONFIDENCE)
+    n = end - start
+    coords = np.full((n, config.MAX_HANDS, NUM_LANDMARKS, 3), np.nan, dtype=np.float32)
+    hand_count = np.zeros(n, dtype=np.int8)
+    gesture = np.zeros(n, dtype=np.int8)
+    timestamps = np.zeros(n, dtype=np.float64)
+
+    first = max(start - overlap, 0)
+    cap = cv2.VideoCapture(path)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, first)
+    processed = 0
+    for index in range(first, end):
+        success, img = cap.read()
+        if not success:
+            break
+        processed += 1
+        if flip:
+            img = cv2.flip(img, 1)
+        detector.findHands(img, draw=False)
+        if index < start:
+            continue
+        row = index - start
+        timestamps[row] = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+        hands = detector.results.multi_hand_landmarks or []
+        hand_count[row] = len(hands)
+        for hand_no, handLms in enumerate(hands[:config.MAX_HANDS]):
+            coords[row, hand_no] = [(lm.x, lm.y, lm.z) for lm in handLms.landmark]
+        if hands:
+            lmList = detector.findPosition(img, draw=False)
+            gesture[row] = GESTURE_LABELS.index(classify_gesture(fingers_up(lmList)))
+    cap.release()
+
+    return {
+        "start": start, "end": end, "processed": processed,
+        "landmarks": coords, "hand_count": hand_count,
+        "gesture": gesture, "time_s": timestamps,
+        "wall": time.perf_counter() - wall_start,
+        "cpu": time.process_time() - cpu_start,
+    }
+
+
+def boundary_report(chunks, hand_count, warmup=WARMUP_FRAMES):
+    """Detection rate inside the warm-up window after each chunk boundary vs elsewhere"""
+    window = np.zeros(len(hand_count), dtype=bool)
+    for start, _ in chunks[1:]:
+        window[start:start + warmup] = True
+    detected = hand_count > 0
+    return {
+        "boundaries": len(chunks) - 1,
+        "warmup_frames": int(window.sum()),
+        "warmup_detection_rate": float(detected[window].mean()) if window.any() else None,
+        "steady_detection_rate": float(detected[~window].mean()) if (~window).any() else None,
+    }
+
+
+def compare_runs(chunked, reference, chunks, tolerance=0.01):
+    """
+    Frames where the chunked run differs from a single-process run
+    Returns: list of (frame, frames_since_boundary)
+    """
+    a, b = chunked["landmarks"], reference["landmarks"]
+    same_count = chunked["hand_count"] == reference["hand_count"]
+    delta = np.nan_to_num(np.abs(a - b), nan=0.0).reshape(len(a), -1).max(axis=1)
+    differ = np.nonzero(~same_count | (delta > tolerance)
+                        | (chunked["gesture"] != reference["gesture"]))[0]
+    starts = np.array([s for s, _ in chunks])
+    since = differ - starts[np.searchsorted(starts, differ, side="right") - 1]
+    return list(zip(differ.tolist(), since.tolist()))
+
+
+def submit_video(path, pool, workers, flip=True, overlap=0):
+    """
+    Queue every chunk of one video on the process pool
+    Returns: (path, frame_count, chunks, futures) or None if unreadable
+    """
+    cap = cv2.VideoCapture(path)
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    if frame_count <= 0:
+        print(f"Skipping {path}: cannot read frame count")
+        return None
+
+    chunks = plan_chunks(frame_count, keyframe_indices(path, frame_count), workers)
+    futures = [pool.submit(analyze_chunk, path, s, e, flip, overlap) for s, e in chunks]
+    return path, frame_count, chunks, futures
+
+
+def finish_video(job, out_dir, flip=True, verify=False):
+    """Merge the chunk results of one video and write its column file"""
+    path, frame_count, chunks, futures = job
+    parts = [f.result() for f in futures]
+
+    merged = {key: np.concatenate([p[key] for p in parts])
+              for key in ("landmarks", "hand_count", "gesture", "time_s")}
+    chunk_ids = np.concatenate([np.full(p["end"] - p["start"], i, dtype=np.int16)
+                                for i, p in enumerate(parts)])
+
+    os.makedirs(out_dir, exist_ok=True)
+    out_path = os.path.join(out_dir, os.path.basename(path) + ".landmarks.npz")
+    np.savez(out_path, frame=np.arange(frame_count, dtype=np.int32), chunk=chunk_ids,
+             gesture_names=np.array(GESTURE_LABELS), **merged)
+
+    stats = {
+        "path": path, "out": out_path, "frames": frame_count, "chunks": len(chunks),
+        "processed": sum(p["processed"] for p in parts),
+        "worker_wall": sum(p["wall"] for p in parts),
+        "worker_cpu": sum(p["cpu"] for p in parts),
+        "boundary": boundary_report(chunks, merged["hand_count"]),
+    }
+    if verify:
+        reference = analyze_chunk(path, 0, frame_count, flip)
+        stats["mismatches"] = compare_runs(merged, reference, chunks)
+    return stats
+
+
+def print_report(results, elapsed, workers):
+    """Print per-video and overall throughput plus the chunk boundary effect"""
+    total_frames = sum(r["frames"] for r in results)
+    total_processed = sum(r["processed"] for r in results)
+    worker_wall = sum(r["worker_wall"] for r in results)
+    for r in results:
+        b = r["boundary"]
+        print(f"\n{r['path']} -> {r['out']}")
+        print(f"  frames: {r['frames']}  chunks: {r['chunks']}  "
+              f"worker time: {r['worker_wall']:.1f}s (cpu {r['worker_cpu']:.1f}s)")
+        if b["boundaries"]:
+            warm = b["warmup_detection_rate"]
+            steady = b["steady_detection_rate"]
+            print(f"  boundary effect: {b['boundaries']} boundaries, "
+                  f"{b['warmup_frames']} frames in warm-up windows")
+            print(f"    detection rate warm-up: {warm if warm is None else f'{warm:.1%}'}"
+                  f"  steady: {steady if steady is None else f'{steady:.1%}'}")
+        if "mismatches" in r:
+            mism = r["mismatches"]
+            near = sum(1 for _, since in mism if since < WARMUP_FRAMES)
+            print(f"  verify: {len(mism)} frames differ from a single-process run, "
+                  f"{near} of them within {WARMUP_FRAMES} frames of a boundary")
+
+    print("\n" + "=" * 50)
+    print(f"Videos: {len(results)}  Frames: {total_frames}  Wall time: {elapsed:.1f}s")
+    if elapsed > 0:
+        print(f"Throughput: {total_frames / elapsed:.1f} frames/sec overall")
+    if worker_wall > 0:
+        print(f"Throughput: {total_processed / worker_wall:.1f} frames/sec per core "
+              f"({workers} workers)")
+    print("=" * 50)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline hand gesture analysis of video files")
+    parser.add_argument("inputs", nargs="+", help="video files or directories")
+    parser.add_argument("--out", default="analysis", help="output directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--overlap", type=int, default=0,
+                        help="frames decoded before each chunk to warm up tracking")
+    parser.add_argument("--no-flip", action="store_true",
+                        help="do not mirror frames (main.py mirrors the webcam)")
+    parser.add_argument("--verify", action="store_true",
+                        help="also run each video single-process and report differences")
+    args = parser.parse_args()
+
+    videos = find_videos(args.inputs)
+    if not videos:
+        print("No videos found")
+        return
+
+    start = time.perf_counter()
+    flip = not args.no_flip
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        # Queue chunks of all videos up front so short videos don't leave cores idle
+        jobs = [submit_video(path, pool, args.workers, flip, args.overlap) for path in videos]
+        results = [finish_video(job, args.out, flip, args.verify)
+                   for job in jobs if job is not None]
+    print_report(results, time.perf_counter() - start, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+# zoom.py
+"""
+Two-hand continuous zoom
+
+Show both hands and move them apart to zoom in, together to zoom out.
+ZoomController measures the distance between the two palm centers in palm
+sizes (so it doesn't change with the distance to the camera), smooths it,
+and turns its change since the hands appeared into zoom steps on a log
+scale: every ZOOM_STEP of relative spread is one step, whatever the
+starting distance.
+
+Steps are accumulated as fractions and dispatched at most once per display
+refresh through the input layer (input_backend.py) rather than as a
+pyautogui call per frame:
+    - scroll mode: ctrl is held while zooming and the wheel clicks go
+      through InputBackend.scroll(), which carries fractional clicks over
+      until they add up to a whole one (less than one left over when the
+      gesture ends is dropped, not added to the next page scroll)
+    - keys mode: one ctrl + "=" / ctrl + "-" per refresh, the rest waits
+Nothing is dropped on the way: the sum of the dispatched steps follows the
+hand spread.
+
+Benchmark with synthetic hands or landmarks replayed from video_analysis.py:
+    python zoom.py
+    python zoom.py --replay clip.mp4.landmarks.npz --mode keys
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+import config
+from clock import SystemClock, SimulatedClock
+from features import HandFeatures
+from landmarks import PALM_IDS
+
+MODES = ("scroll", "keys")
+
+
+def hand_spread(hands):
+    """Distance between the palm centers of two hands, in mean palm sizes"""
+    a, b = (hand if isinstance(hand, HandFeatures) else HandFeatures(hand) for hand in hands)
+    dx, dy = a.points[PALM_IDS].mean(axis=0) - b.points[PALM_IDS].mean(axis=0)
+    return math.hypot(dx, dy) / ((a.palm_size + b.palm_size) / 2)
+
+
+class ZoomController:
+    """Turns the spread of two hands into coalesced zoom events"""
+
+    def __init__(self, inputs, mode=None, clock=None, step=None, refresh_hz=None,
+                 smoothing=None, engage_frames=None, clicks_per_step=None):
+        """
+        Args:
+            inputs: InputBackend the events are sent through
+            mode: "scroll" or "keys" (defaults to config.ZOOM_MODE)
+            clock: Time source for the refresh limit (defaults to the system clock)
+            step: Relative spread change per zoom step
+            refresh_hz: Most dispatches per second
+            smoothing: EMA weight of the newest spread (1 = none)
+            engage_frames: Frames with two hands before zooming starts, and
+                without them before it stops
+            clicks_per_step: Wheel clicks per step in scroll mode
+        """
+        self.mode = config.ZOOM_MODE if mode is None else mode
+        if self.mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {self.mode!r}")
+        self.inputs = inputs
+        self.clock = clock or SystemClock()
+        step = config.ZOOM_STEP if step is None else step
+        self.log_step = math.log(1 + step)
+        refresh_hz = config.ZOOM_REFRESH_HZ if refresh_hz is None else refresh_hz
+        self.interval = 1.0 / refresh_hz
+        self.smoothing = config.ZOOM_SMOOTHING if smoothing is None else smoothing
+        self.engage_frames = config.ZOOM_ENGAGE_FRAMES if engage_frames is None \
+            else engage_frames
+        self.clicks_per_step = config.ZOOM_CLICKS_PER_STEP if clicks_per_step is None \
+            else clicks_per_step
+
+        self.engaged = False
+        self.seen = 0       # consecutive frames with two hands
+        self.missed = 0     # consecutive frames without, while engaged
+        self.spread = None  # smoothed spread
+        self.reference = None
+        self.level = 0.0    # steps since engaging
+        self.pending = 0.0  # steps not dispatched yet
+        self.last_dispatch = -math.inf
+        self.updates = 0
+        self.dispatches = 0
+        self.steps_sent = 0.0
+        self.gestures = 0
+
+    def update(self, hands):
+        """
+        Feed one frame's hands
+        Args:
+            hands: (21, 2) landmark arrays or HandFeatures of the detected hands
+        Returns: zoom level in steps since the hands appeared, or None when not zooming
+        """
+        self.updates += 1
+        if len(hands) != 2:
+            self.seen = 0
+            if self.engaged:
+                self.missed += 1
+                if self.missed >= self.engage_frames:
+                    self.release()
+            return self.level if self.engaged else None
+
+        self.missed = 0
+        spread = hand_spread(hands)
+        if not self.engaged:
+            self.seen += 1
+            if self.seen < self.engage_frames:
+                return None
+            self._engage(spread)
+            return self.level
+
+        self.spread += (spread - self.spread) * self.smoothing
+        level = math.log(self.spread / self.reference) / self.log_step
+        self.pending += level - self.level
+        self.level = level
+        now = self.clock()
+        if now - self.last_dispatch >= self.interval:
+            self._dispatch(now)
+        return self.level
+
+    def _engage(self, spread):
+        self.engaged = True
+        self.gestures += 1
+        self.spread = self.reference = spread
+        self.level = self.pending = 0.0
+        if self.mode == "scroll":
+            self.inputs.key_down("ctrl")
+            self.inputs.clear_scroll()  # a page-scroll remainder must not zoom
+
+    def _dispatch(self, now):
+        if self.mode == "scroll":
+            if not self.pending:
+                return
+            self.inputs.scroll(self.pending * self.clicks_per_step)
+            self.inputs.flush()
+            sent = self.pending
+        else:
+            if abs(self.pending) < 1.0:
+                return
+            sent = 1.0 if self.pending > 0 else -1.0
+            self.inputs.hotkey("ctrl", "=" if sent > 0 else "-")
+        self.pending -= sent
+        self.steps_sent += sent
+        self.dispatches += 1
+        self.last_dispatch = now
+
+    def release(self):
+        """Stop zooming: send what is pending and let go of ctrl"""
+        if not self.engaged:
+            return
+        self._dispatch(self.clock())
+        if self.mode == "scroll":
+            self.inputs.clear_scroll()  # under a wheel unit left; don't scroll with it later
+            self.inputs.key_up("ctrl")
+        self.engaged = False
+        self.seen = self.missed = 0
+        self.pending = 0.0  # keys mode: less than a step left
+
+    def stats(self):
+        return {"updates": self.updates, "gestures": self.gestures,
+                "dispatches": self.dispatches, "steps_sent": self.steps_sent}
+
+
+def synthetic_sequence(frames=600, fps=30.0, seed=0):
+    """
+    Two hands moving apart and together, with detection noise and dropouts
+    Returns: list of (time, hands)
+    """
+    from synthetic_landmarks import pose_points
+    rng = np.random.default_rng(seed)
+    open_palm = [1, 1, 1, 1, 1]
+    sequence = []
+    for i in range(frames):
+        t = i / fps
+        if int(t) % 5 == 4:  # hands down for a second every five
+            sequence.append((t, []))
+            continue
+        half = 120 + 80 * math.sin(t * 1.3)
+        hands = [pose_points(open_palm, center=(320 + side * half, 360)) for side in (-1, 1)]
+        hands = [h + rng.normal(0, 1.0, h.shape) for h in hands]
+        sequence.append((t, hands))
+    return sequence
+
+
+def load_replay(path, frame_size=(640, 480)):
+    """
+    Landmarks written by video_analysis.py as a (time, hands) sequence
+    Args:
+        path: <video>.landmarks.npz
+        frame_size: Size the normalized landmarks are scaled to
+    """
+    data = np.load(path)
+    landmarks = data["landmarks"][..., :2] * frame_size
+    sequence = []
+    for t, frame in zip(data["time_s"], landmarks):
+        hands = [hand for hand in frame if not np.isnan(hand).any()]
+        sequence.append((float(t), hands))
+    return sequence
+
+
+def benchmark(sequence, mode="scroll", **kwargs):
+    """
+    Replay a sequence into a ZoomController with a recording backend
+    Returns: (controller, recorded events, seconds per update)
+    """
+    from input_backend import RecordingBackend
+    clock = SimulatedClock(0.0)
+    inputs = RecordingBackend(clock=clock)
+    zoom = ZoomController(inputs, mode=mode, clock=clock, **kwargs)
+    elapsed = 0.0
+    for t, hands in sequence:
+        clock.advance(t - clock())
+        start = time.perf_counter()
+        zoom.update(hands)
+        elapsed += time.perf_counter() - start
+    zoom.release()
+    return zoom, inputs.events, elapsed / max(len(sequence), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the two-hand zoom controller")
+    parser.add_argument("--replay", help="landmarks .npz written by video_analysis.py")
+    parser.add_argument("--mode", default=config.ZOOM_MODE, choices=MODES)
+    parser.add_argument("--frames", type=int, default=3000, help="synthetic frames")
+    parser.add_argument("--refresh-hz", type=float, default=config.ZOOM_REFRESH_HZ)
+    args = parser.parse_args()
+
+    sequence = load_replay(args.replay) if args.replay else synthetic_sequence(args.frames)
+    zoom, events, per_update = benchmark(sequence, args.mode, refresh_hz=args.refresh_hz)
+    duration = max(sequence[-1][0] - sequence[0][0], 1e-9) if sequence else 1e-9
+    kinds = {}
+    clicks = 0
+    for _, kind, event_args in events:
+        kinds[kind] = kinds.get(kind, 0) + 1
+        if kind == "scroll":
+            clicks += event_args[0]
+    s = zoom.stats()
+    print(f"{len(sequence)} frames over {duration:.1f}s, mode {args.mode}")
+    print(f"update(): {per_update * 1e6:.1f} us")
+    print(f"Zoom gestures: {s['gestures']}, dispatches: {s['dispatches']} "
+          f"({s['dispatches'] / duration:.1f}/s), steps sent: {s['steps_sent']:+.2f}")
+    print("Events: " + (", ".join(f"{k} {n}" for k, n in sorted(kinds.items())) or "none")
+          + f" ({len(events) / duration:.1f}/s vs {len(sequence) / duration:.1f} frames/s)")
+    if args.mode == "scroll":
+        print(f"Wheel clicks: {clicks:+d} (the rest, under one click, is dropped at release)")
+
+
+if __name__ == "__main__":
+    main()